@@ -0,0 +1,131 @@
+"""Response compression: gzip/brotli negotiation and static precompression.
+
+Dynamic responses are compressed on the fly by ``CompressionMiddleware``.
+Static assets are compressed once at build time with ``python -m
+app.compression`` and served as-is by ``FingerprintedStaticFiles``; responses
+that already carry a Content-Encoding pass through the middleware untouched.
+"""
+
+import gzip
+import logging
+from pathlib import Path
+
+import brotli
+from starlette.datastructures import Headers
+from starlette.middleware.gzip import GZipResponder, IdentityResponder
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+# Responses smaller than this aren't worth the CPU or the extra headers.
+COMPRESSION_MIN_BYTES = 500
+
+# On-the-fly levels favour speed; build-time precompression uses the maximum.
+_DYNAMIC_GZIP_LEVEL = 6
+_DYNAMIC_BROTLI_QUALITY = 5
+
+# Preferred first when the client accepts several with equal weight.
+_ENCODINGS = ("br", "gzip")
+PRECOMPRESSED_SUFFIXES = {"br": ".br", "gzip": ".gz"}
+_PRECOMPRESS_TYPES = {".css", ".js", ".html", ".svg", ".json", ".txt"}
+
+
+def negotiate_encoding(accept_encoding: str, available=_ENCODINGS) -> str | None:
+    """Pick the best encoding from an Accept-Encoding header, or None."""
+    weights: dict[str, float] = {}
+    for part in accept_encoding.lower().split(","):
+        coding, _, params = part.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        if coding:
+            weights[coding.strip()] = quality
+
+    best, best_quality = None, 0.0
+    for coding in available:
+        quality = weights.get(coding, weights.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = coding, quality
+    return best
+
+
+class BrotliResponder(IdentityResponder):
+    content_encoding = "br"
+
+    def __init__(self, app: ASGIApp, minimum_size: int, quality: int) -> None:
+        super().__init__(app, minimum_size)
+        self.compressor = brotli.Compressor(quality=quality)
+
+    async def apply_compression(self, body: bytes, *, more_body: bool) -> bytes:
+        if more_body:
+            return self.compressor.process(body) + self.compressor.flush()
+        return self.compressor.process(body) + self.compressor.finish()
+
+
+class CompressionMiddleware:
+    """Compress responses with brotli or gzip, whichever the client prefers."""
+
+    def __init__(self, app: ASGIApp, minimum_size: int = COMPRESSION_MIN_BYTES):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        responder: ASGIApp
+        if encoding == "br":
+            responder = BrotliResponder(
+                self.app, self.minimum_size, _DYNAMIC_BROTLI_QUALITY
+            )
+        elif encoding == "gzip":
+            responder = GZipResponder(
+                self.app, self.minimum_size, compresslevel=_DYNAMIC_GZIP_LEVEL
+            )
+        else:
+            responder = IdentityResponder(self.app, self.minimum_size)
+        await responder(scope, receive, send)
+
+
+def precompress_static(
+    directory: Path, minimum_size: int = COMPRESSION_MIN_BYTES
+) -> list[Path]:
+    """Write .br and .gz variants next to each compressible file in `directory`.
+
+    Variants that don't save any bytes are skipped (and removed if left over
+    from a previous build), so the server falls back to the original.
+    """
+    written = []
+    for path in sorted(directory.rglob("*")):
+        if not path.is_file() or path.suffix not in _PRECOMPRESS_TYPES:
+            continue
+        data = path.read_bytes()
+        variants = {
+            ".br": brotli.compress(data, quality=11),
+            ".gz": gzip.compress(data, compresslevel=9, mtime=0),
+        }
+        for suffix, compressed in variants.items():
+            target = path.with_name(path.name + suffix)
+            if len(data) < minimum_size or len(compressed) >= len(data):
+                target.unlink(missing_ok=True)
+                continue
+            target.write_bytes(compressed)
+            written.append(target)
+            logger.info(
+                "Precompressed %s (%d -> %d bytes)",
+                target.name,
+                len(data),
+                len(compressed),
+            )
+    return written
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    precompress_static(Path(__file__).resolve().parent / "static")
@@ -1,35 +1,152 @@
 """FastAPI application for Just Show Me the Recipe."""
 
+import asyncio
+import hashlib
 import json
 import logging
+import os
+import secrets
+from collections import Counter
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from email.utils import formatdate, parsedate_to_datetime
 from pathlib import Path
+from typing import NamedTuple
+from urllib.parse import urlencode
 
+from cachetools import TTLCache
 from fastapi import FastAPI, Request
-from fastapi.responses import HTMLResponse
-from fastapi.staticfiles import StaticFiles
+from fastapi.responses import HTMLResponse, JSONResponse, Response
 from fastapi.templating import Jinja2Templates
 from slowapi import Limiter
 from slowapi.errors import RateLimitExceeded
 from slowapi.util import get_remote_address
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
-from app.models import ParseError
-from app.parser.pipeline import parse_recipe
-
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s %(levelname)-8s %(name)s — %(message)s",
-    datefmt="%Y-%m-%d %H:%M:%S",
+from app.compression import CompressionMiddleware
+from app.models import ParseError, Recipe
+from app.parser import archive, pipeline, profiling, reparse
+from app.parser.deadline import Deadline
+from app.parser.pipeline import enriched_recipe, parse_recipe, warm_up
+from app.request_log import RequestLogMiddleware, annotate, configure_logging
+from app.scaling import (
+    MAX_SCALE,
+    SCALE_OPTIONS,
+    normalize_scale,
+    scale_key,
+    scale_recipe,
 )
+from app.static_files import FingerprintedStaticFiles
+
+configure_logging()
 logger = logging.getLogger(__name__)
 
 BASE_DIR = Path(__file__).resolve().parent
 
+
+async def _warm_up_parser() -> None:
+    try:
+        await asyncio.to_thread(warm_up)
+    except Exception:
+        # The first request retries the imports and reports the error properly.
+        logger.exception("Parser warm-up failed")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    # Import the heavy parser tiers in the background so the server starts
+    # listening (and passing health checks) without waiting for them.
+    warm_up_task = asyncio.create_task(_warm_up_parser())
+    yield
+    warm_up_task.cancel()
+
+
 limiter = Limiter(key_func=get_remote_address)
-app = FastAPI(title="Just Show Me the Recipe!")
+app = FastAPI(title="Just Show Me the Recipe!", lifespan=lifespan)
 app.state.limiter = limiter
-app.mount("/static", StaticFiles(directory=BASE_DIR / "static"), name="static")
+static_files = FingerprintedStaticFiles(directory=BASE_DIR / "static")
+app.mount("/static", static_files, name="static")
 templates = Jinja2Templates(directory=BASE_DIR / "templates")
+templates.env.globals["static_url"] = static_files.url_for
+
+
+def _template_version() -> str:
+    """Hash the template sources so cached pages are dropped when they change.
+
+    Static fingerprints are included because rendered pages embed them.
+    """
+    digest = hashlib.sha256()
+    for path in sorted((BASE_DIR / "templates").glob("*.html")):
+        digest.update(path.name.encode())
+        digest.update(path.read_bytes())
+    for name, version in sorted(static_files.fingerprints.items()):
+        digest.update(f"{name}={version}".encode())
+    return digest.hexdigest()[:12]
+
+
+TEMPLATE_VERSION = _template_version()
+
+# Recipe pages can be cached by browsers and the CDN for as long as we cache the
+# Recipe itself.
+RECIPE_CACHE_CONTROL = "public, max-age=1800"
+
+
+class CachedPage(NamedTuple):
+    body: bytes
+    etag: str
+    last_modified: str
+
+    @property
+    def headers(self) -> dict[str, str]:
+        return _page_headers(self.etag, self.last_modified)
+
+
+def _page_headers(etag: str, last_modified: str) -> dict[str, str]:
+    return {
+        "ETag": etag,
+        "Last-Modified": last_modified,
+        "Cache-Control": RECIPE_CACHE_CONTROL,
+    }
+
+
+# Rendered recipe pages, keyed by (url, template version, scale, index). Same
+# size and TTL as the recipe cache so a page never outlives the Recipe it was
+# built from by more than one TTL.
+_page_cache: TTLCache[tuple[str, str, float, int], CachedPage] = TTLCache(
+    maxsize=128, ttl=30 * 60
+)
+
+
+def _page_key(
+    url: str, scale: float = 1.0, index: int = 0
+) -> tuple[str, str, float, int]:
+    return (url, TEMPLATE_VERSION, scale, index)
+
+
+def _recipe_etag(recipe: Recipe, scale: float = 1.0) -> str:
+    """Strong ETag for a recipe page, derived from the data it is rendered from."""
+    digest = hashlib.sha256(recipe.model_dump_json().encode())
+    digest.update(f"|{TEMPLATE_VERSION}|{scale}".encode())
+    return f'"{digest.hexdigest()[:32]}"'
+
+
+def _is_not_modified(request: Request, etag: str, last_modified: str) -> bool:
+    """Evaluate If-None-Match (preferred) or If-Modified-Since for a page."""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return "*" in tags or etag in tags
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is None:
+        return False
+    try:
+        return parsedate_to_datetime(last_modified) <= parsedate_to_datetime(
+            if_modified_since
+        )
+    except (TypeError, ValueError):
+        return False
 
 
 @app.exception_handler(RateLimitExceeded)
@@ -46,16 +163,129 @@ async def rate_limit_handler(request: Request, exc: RateLimitExceeded):
     )
 
 
-class SecurityHeadersMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request, call_next):
-        response = await call_next(request)
-        response.headers["X-Content-Type-Options"] = "nosniff"
-        response.headers["X-Frame-Options"] = "DENY"
-        response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
-        return response
+SECURITY_HEADERS = {
+    "X-Content-Type-Options": "nosniff",
+    "X-Frame-Options": "DENY",
+    "Referrer-Policy": "strict-origin-when-cross-origin",
+}
+
+
+class SecurityHeadersMiddleware:
+    """Add security headers to every HTTP response.
+
+    A pure ASGI middleware: it edits the ``http.response.start`` message in place
+    and passes body messages straight through, so streaming responses are not
+    buffered and no extra task is spawned per request.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                for name, value in SECURITY_HEADERS.items():
+                    headers[name] = value
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
 
 
 app.add_middleware(SecurityHeadersMiddleware)
+app.add_middleware(CompressionMiddleware)
+# Outermost, so the logged byte counts and durations include compression
+app.add_middleware(RequestLogMiddleware)
+
+
+# HTTP status for each ParseError.error_type, for the JSON API.
+_ERROR_STATUS = {
+    "validation": 400,
+    "parse": 422,
+    "too_large": 422,
+    "http": 502,
+    "network": 502,
+    "timeout": 504,
+}
+# Overall time budget per request, from URL validation to parsed ingredients.
+# People are waiting on the page; API clients can retry sooner.
+_RECIPE_DEADLINE = 20.0
+_API_DEADLINE = 10.0
+
+# Opt-in: render /recipe as soon as a tier finds the recipe. The parsed
+# ingredients the scaler and linker need follow from /api/recipe/enrichment.
+DEFER_ENRICHMENT = os.environ.get("RECIPE_DEFER_ENRICHMENT", "").lower() in (
+    "1",
+    "true",
+    "yes",
+)
+# Bearer token for the /admin routes, which return 404 while it is unset.
+ADMIN_TOKEN = os.environ.get("RECIPE_ADMIN_TOKEN", "")
+# Held while /admin/reparse runs; a second request is turned away meanwhile
+_reparse_lock = asyncio.Lock()
+_INVALID_SCALE_MESSAGE = f"Scale must be greater than 0 and at most {MAX_SCALE:g}."
+
+
+def _normalize_url(url: str) -> str:
+    # The fragment never reaches the site, so links to different recipes on
+    # one page share its fetch; `index` picks the recipe instead.
+    url = url.strip().split("#", 1)[0]
+    if url and not url.startswith(("http://", "https://")):
+        url = "https://" + url
+    return url
+
+
+def _recipe_url(url: str, index: int = 0, **params) -> str:
+    """Link to the /recipe page for the `index`-th recipe at `url`."""
+    query = {"url": url, **({"index": index} if index else {}), **params}
+    return app.url_path_for("recipe") + "?" + urlencode(query)
+
+
+def _recipe_data(recipe: Recipe, scale: float) -> dict:
+    """Parsed ingredients, step links and scaled views for the page's scripts."""
+    return {
+        "parsedIngredients": [ing.model_dump() for ing in recipe.parsed_ingredients],
+        "links": recipe.step_links,
+        "scaled": _scaled_views(recipe, scale),
+        "scalable": any(ing.amount is not None for ing in recipe.parsed_ingredients),
+    }
+
+
+def _scaled_views(recipe: Recipe, scale: float) -> dict[str, list[dict]]:
+    """Scaled ingredient text for the page's scale buttons and the current scale."""
+    views = {}
+    for factor in dict.fromkeys((*SCALE_OPTIONS, scale)):
+        scaled = scale_recipe(recipe, factor) or []
+        views[scale_key(factor)] = [s.model_dump(exclude_none=True) for s in scaled]
+    return views
+
+
+@app.get("/healthz")
+async def healthz():
+    """Liveness: the process is up and serving requests."""
+    return {"status": "ok"}
+
+
+@app.get("/readyz")
+async def readyz():
+    """Readiness: parser warmed up and not saturated, plus load and cache stats."""
+    stats = pipeline.stats()
+    stats["page_cache"] = {"size": len(_page_cache), "maxsize": _page_cache.maxsize}
+    if not stats["tiers_loaded"]:
+        status = "warming_up"
+    elif stats["in_flight"] >= stats["max_in_flight"]:
+        status = "saturated"
+    else:
+        status = "ready"
+    return JSONResponse(
+        {"status": status, **stats},
+        status_code=200 if status == "ready" else 503,
+        headers={"Cache-Control": "no-store"},
+    )
 
 
 @app.get("/", response_class=HTMLResponse)
@@ -65,8 +295,8 @@ async def index(request: Request):
 
 @app.get("/recipe", response_class=HTMLResponse)
 @limiter.limit("30/minute")
-async def recipe(request: Request, url: str = ""):
-    url = url.strip()
+async def recipe(request: Request, url: str = "", scale: float = 1.0, index: int = 0):
+    url = _normalize_url(url)
     if not url:
         return templates.TemplateResponse(
             request,
@@ -77,26 +307,261 @@ async def recipe(request: Request, url: str = ""):
             },
             status_code=400,
         )
-    if not url.startswith(("http://", "https://")):
-        url = "https://" + url
+    factor = normalize_scale(scale)
+    if factor is None:
+        return templates.TemplateResponse(
+            request,
+            "error.html",
+            {"error_message": _INVALID_SCALE_MESSAGE, "url": url},
+            status_code=400,
+        )
+
+    annotate(url=url)
+    page_key = _page_key(url, factor, index)
+    cached_page = _page_cache.get(page_key)
+    if cached_page is not None:
+        annotate(cache="page")
+        if _is_not_modified(request, cached_page.etag, cached_page.last_modified):
+            return Response(status_code=304, headers=cached_page.headers)
+        return HTMLResponse(cached_page.body, headers=cached_page.headers)
+
     try:
-        result = await parse_recipe(url, request_host=request.url.hostname)
+        result = await parse_recipe(
+            url,
+            request_host=request.url.hostname,
+            deadline=Deadline(_RECIPE_DEADLINE),
+            enrich=not DEFER_ENRICHMENT,
+            index=index,
+        )
     except ParseError as e:
-        logger.warning("ParseError [%s] for %s: %s", e.error_type, url, e.message)
+        annotate(error_type=e.error_type)
         return templates.TemplateResponse(
             request, "error.html", {"error_message": e.message, "url": url}
         )
-    logger.info("Served recipe %r from %s", result.title, url)
-    parsed_ingredients_json = ""
-    if result.parsed_ingredients:
-        parsed_ingredients_json = json.dumps({
-            "parsedIngredients": [
-                ing.model_dump() for ing in result.parsed_ingredients
-            ],
-            "steps": result.steps,
-        })
-    return templates.TemplateResponse(
+    # Ingredients not parsed, either still under way (the page fetches them once
+    # they're ready) or skipped for lack of time
+    unparsed = result.parsed_ingredients is None and bool(result.ingredients)
+    deferred = DEFER_ENRICHMENT and unparsed
+    if not unparsed:
+        # Neither needs the rendered page, so a 304 is answered without it. The
+        # page changes when the Recipe does, so it's as new as the cached Recipe
+        # (or new now, if the Recipe wasn't cached).
+        etag = _recipe_etag(result, factor)
+        last_modified = formatdate(pipeline.cached_at(url, index), usegmt=True)
+        if _is_not_modified(request, etag, last_modified):
+            return Response(status_code=304, headers=_page_headers(etag, last_modified))
+    data = _recipe_data(result, factor) if result.parsed_ingredients else None
+    response = templates.TemplateResponse(
         request,
         "recipe.html",
-        {"recipe": result, "parsed_ingredients_json": parsed_ingredients_json},
+        {
+            "recipe": result,
+            "parsed_ingredients_json": json.dumps(data) if data else "",
+            "scaled_ingredients": scale_recipe(result, factor),
+            "scalable": data["scalable"] if data else False,
+            "scale": factor,
+            "scale_options": [(scale_key(f), f == factor) for f in SCALE_OPTIONS],
+            "enrichment_url": (
+                app.url_path_for("recipe_enrichment") + "?" + urlencode({
+                    "url": url,
+                    "scale": scale_key(factor),
+                    **({"index": index} if index else {}),
+                })
+                if deferred
+                else None
+            ),
+            "page_recipe_urls": [
+                _recipe_url(url, i) for i in range(len(result.page_recipes or []))
+            ],
+        },
+    )
+    if unparsed:
+        # Not cached anywhere: the complete page is served once parsing is done
+        response.headers["Cache-Control"] = "no-store"
+        return response
+    page = CachedPage(response.body, etag, last_modified)
+    _page_cache[page_key] = page
+    response.headers.update(page.headers)
+    return response
+
+
+@app.get("/api/recipe")
+@limiter.limit("30/minute")
+async def recipe_api(
+    request: Request, url: str = "", scale: float = 1.0, index: int = 0
+):
+    """Return a recipe as JSON, with ingredient text scaled by `scale`.
+
+    On pages with several recipes, `index` picks one; the recipe's
+    ``page_recipes`` lists the titles of all of them.
+    """
+    url = _normalize_url(url)
+    if not url:
+        return JSONResponse(
+            {"error_type": "validation", "message": "Missing url parameter."},
+            status_code=400,
+        )
+    factor = normalize_scale(scale)
+    if factor is None:
+        return JSONResponse(
+            {"error_type": "validation", "message": _INVALID_SCALE_MESSAGE},
+            status_code=400,
+        )
+
+    annotate(url=url)
+    try:
+        result = await parse_recipe(
+            url,
+            request_host=request.url.hostname,
+            deadline=Deadline(_API_DEADLINE),
+            index=index,
+        )
+    except ParseError as e:
+        annotate(error_type=e.error_type)
+        return JSONResponse(
+            {"error_type": e.error_type, "message": e.message},
+            status_code=_ERROR_STATUS.get(e.error_type, 500),
+        )
+
+    scaled = scale_recipe(result, factor)
+    unparsed = result.parsed_ingredients is None and result.ingredients
+    return JSONResponse(
+        {
+            "recipe": result.model_dump(exclude_none=True),
+            "scale": factor,
+            "scaled_ingredients": (
+                [s.model_dump(exclude_none=True) for s in scaled]
+                if scaled is not None
+                else None
+            ),
+        },
+        # Ingredients skipped for lack of time are parsed on the next request
+        headers={"Cache-Control": "no-store" if unparsed else RECIPE_CACHE_CONTROL},
+    )
+
+
+@app.get("/api/recipe/enrichment")
+@limiter.limit("60/minute")
+async def recipe_enrichment(
+    request: Request, url: str = "", scale: float = 1.0, index: int = 0
+):
+    """Parsed ingredient data for a recipe page rendered before it was ready.
+
+    Waits for the background parsing started by /recipe; if the recipe has
+    since dropped out of the cache, it is fetched and parsed again.
+    """
+    url = _normalize_url(url)
+    factor = normalize_scale(scale)
+    if not url or factor is None:
+        return JSONResponse(
+            {"error_type": "validation", "message": "Invalid url or scale."},
+            status_code=400,
+        )
+
+    annotate(url=url)
+    deadline = Deadline(_API_DEADLINE)
+    try:
+        result = await enriched_recipe(url, deadline, index)
+        if result is None:
+            result = await parse_recipe(
+                url, request_host=request.url.hostname, deadline=deadline, index=index
+            )
+    except ParseError as e:
+        annotate(error_type=e.error_type)
+        return JSONResponse(
+            {"error_type": e.error_type, "message": e.message},
+            status_code=_ERROR_STATUS.get(e.error_type, 500),
+        )
+    if result.parsed_ingredients is None:
+        return JSONResponse(
+            {"error_type": "timeout", "message": "Ingredients aren't ready."},
+            status_code=504,
+        )
+    return JSONResponse(
+        _recipe_data(result, factor),
+        headers={"Cache-Control": RECIPE_CACHE_CONTROL},
+    )
+
+
+def _admin_denied(request: Request) -> JSONResponse | None:
+    """The response for a request without the admin token, or None if it has it."""
+    if not ADMIN_TOKEN:
+        return JSONResponse({"detail": "Not Found"}, status_code=404)
+    given = request.headers.get("Authorization", "").encode()
+    if not secrets.compare_digest(given, f"Bearer {ADMIN_TOKEN}".encode()):
+        return JSONResponse(
+            {"detail": "Unauthorized"},
+            status_code=401,
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return None
+
+
+@app.get("/admin/profiles")
+async def admin_profiles(request: Request):
+    """Profiles captured from slow or sampled parses (see parser/profiling.py)."""
+    denied = _admin_denied(request)
+    if denied is not None:
+        return denied
+    return JSONResponse(
+        {
+            "threshold": profiling.PROFILE_THRESHOLD,
+            "sample_rate": profiling.PROFILE_SAMPLE_RATE,
+            "captures": [c.model_dump(mode="json") for c in profiling.captures()],
+        },
+        headers={"Cache-Control": "no-store"},
+    )
+
+
+@app.get("/admin/profiles/{capture_id}")
+async def admin_profile(request: Request, capture_id: str, format: str = "pstats"):
+    """Download a capture's profile, or ``?format=text`` for the top functions."""
+    denied = _admin_denied(request)
+    if denied is not None:
+        return denied
+    if format == "text":
+        summary = profiling.profile_summary(capture_id)
+        if summary is not None:
+            return Response(
+                summary,
+                media_type="text/plain",
+                headers={"Cache-Control": "no-store"},
+            )
+    else:
+        data = profiling.profile_data(capture_id)
+        if data is not None:
+            return Response(
+                data,
+                media_type="application/octet-stream",
+                headers={
+                    "Content-Disposition": f'attachment; filename="{capture_id}.prof"',
+                    "Cache-Control": "no-store",
+                },
+            )
+    return JSONResponse({"detail": "Not Found"}, status_code=404)
+
+
+@app.post("/admin/reparse")
+async def admin_reparse(request: Request):
+    """Reparse the page archive with the current parser and refresh the caches."""
+    denied = _admin_denied(request)
+    if denied is not None:
+        return denied
+    if archive.ARCHIVE_DIR is None:
+        return JSONResponse({"detail": "No page archive configured"}, status_code=404)
+    if _reparse_lock.locked():
+        return JSONResponse({"detail": "A reparse is already running"}, status_code=409)
+    async with _reparse_lock:
+        report = await asyncio.to_thread(reparse.reparse_archive, archive.ARCHIVE_DIR)
+    # Cache writes stay on the event loop, like every other one
+    reparse.refresh_cache(report)
+    # Rendered pages were built from the old recipes
+    _page_cache.clear()
+    return JSONResponse(
+        {
+            "recipes": len(report.recipes),
+            "tiers": dict(Counter(report.tiers.values())),
+            "failures": report.failures,
+        },
+        headers={"Cache-Control": "no-store"},
     )
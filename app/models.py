@@ -1,6 +1,6 @@
 import html
 
-from pydantic import BaseModel, model_validator
+from pydantic import BaseModel, ValidationInfo, model_validator
 
 
 class ParsedIngredient(BaseModel):
@@ -15,6 +15,19 @@ class ParsedIngredient(BaseModel):
     comment: str | None = None
 
 
+class ScaledIngredient(BaseModel):
+    """Display text for an ingredient at a given scale.
+
+    ``amount_text`` and ``rest_text`` split ``text`` so the amount can carry a
+    ``conversion`` tip; both are None when the ingredient isn't scaled.
+    """
+
+    text: str
+    amount_text: str | None = None
+    rest_text: str | None = None
+    conversion: str | None = None
+
+
 class Recipe(BaseModel):
     title: str
     source_url: str
@@ -25,10 +38,21 @@ class Recipe(BaseModel):
     ingredients: list[str]
     parsed_ingredients: list[ParsedIngredient] | None = None
     steps: list[str]
+    # Per step, (ingredient index, start, end) spans of ingredient mentions
+    step_links: list[list[tuple[int, int, int]]] | None = None
+    # On pages with several recipes: the title of each, and this one's position
+    page_recipes: list[str] | None = None
+    page_index: int | None = None
 
     @model_validator(mode="after")
-    def clean_text(self) -> "Recipe":
-        """Decode HTML entities and strip whitespace from text fields."""
+    def clean_text(self, info: ValidationInfo) -> "Recipe":
+        """Decode HTML entities and strip whitespace from text fields.
+
+        Skipped when validating with ``context={"trusted": True}``, which is
+        used for data that was already cleaned (e.g. deserialized from cache).
+        """
+        if info.context and info.context.get("trusted"):
+            return self
         self.title = html.unescape(self.title).strip()
         self.ingredients = [html.unescape(s).strip() for s in self.ingredients]
         self.steps = [html.unescape(s).strip() for s in self.steps]
@@ -40,3 +64,14 @@ class ParseError(Exception):
         self.error_type = error_type
         self.message = message
         super().__init__(message)
+
+
+class DeadlineExceeded(ParseError):
+    """The request's time budget ran out; ``stage`` is what it ran out in."""
+
+    def __init__(self, stage: str):
+        self.stage = stage
+        super().__init__(
+            "timeout",
+            "That page took too long to process. Try again in a moment.",
+        )
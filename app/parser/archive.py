@@ -0,0 +1,99 @@
+"""Optional on-disk archive of fetched pages, for reparsing without refetching.
+
+Enabled by setting ``RECIPE_ARCHIVE_DIR``. Layout::
+
+    bodies/<sha256 of body>.html.gz   gzip-compressed HTML, shared between URLs
+    pages/<sha256 of url>.json        url, status, headers, fetch time, body hash
+
+Bodies are content-addressed, so syndicated copies of a page are stored once.
+The page record for a URL is replaced each time it is fetched. Files are
+written to a temporary name and renamed, so readers never see partial files.
+"""
+
+import gzip
+import hashlib
+import logging
+import os
+from collections.abc import Iterator
+from datetime import UTC, datetime
+from pathlib import Path
+
+import httpx
+from pydantic import BaseModel
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_DIR = (
+    Path(os.environ["RECIPE_ARCHIVE_DIR"])
+    if os.environ.get("RECIPE_ARCHIVE_DIR")
+    else None
+)
+
+
+class ArchivedPage(BaseModel):
+    """Metadata for one fetched URL; the body is stored separately by hash."""
+
+    url: str
+    fetched_at: datetime
+    status_code: int
+    headers: list[tuple[str, str]]
+    body_sha256: str
+
+
+def archive_response(
+    directory: Path, url: str, response: httpx.Response, body: bytes | None = None
+) -> Path:
+    """Store a fetched response's body and metadata. Returns the page record path.
+
+    Pass ``body`` for a streamed response, whose content was read by the caller.
+    """
+    if body is None:
+        body = response.content
+    digest = hashlib.sha256(body).hexdigest()
+    body_path = _body_path(directory, digest)
+    if not body_path.exists():
+        _write_atomic(body_path, gzip.compress(body, compresslevel=6, mtime=0))
+
+    page = ArchivedPage(
+        url=url,
+        fetched_at=datetime.now(UTC),
+        status_code=response.status_code,
+        headers=list(response.headers.multi_items()),
+        body_sha256=digest,
+    )
+    page_path = directory / "pages" / f"{_url_key(url)}.json"
+    _write_atomic(page_path, page.model_dump_json().encode())
+    return page_path
+
+
+def iter_pages(directory: Path) -> Iterator[ArchivedPage]:
+    """Yield every archived page record, skipping unreadable ones."""
+    for path in sorted((directory / "pages").glob("*.json")):
+        try:
+            yield ArchivedPage.model_validate_json(path.read_bytes())
+        except (OSError, ValueError):
+            logger.warning("Skipping unreadable archive record %s", path)
+
+
+def read_body(directory: Path, page: ArchivedPage) -> str:
+    """Load and decode the HTML body for an archived page."""
+    data = gzip.decompress(_body_path(directory, page.body_sha256).read_bytes())
+    # Decode with the original charset, the way httpx did when it was fetched.
+    # Only Content-Type is passed on: the stored body is already decompressed.
+    content_type = [(k, v) for k, v in page.headers if k.lower() == "content-type"]
+    return httpx.Response(page.status_code, headers=content_type, content=data).text
+
+
+def _body_path(directory: Path, digest: str) -> Path:
+    return directory / "bodies" / f"{digest}.html.gz"
+
+
+def _url_key(url: str) -> str:
+    return hashlib.sha256(url.encode()).hexdigest()
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp.write_bytes(data)
+    tmp.replace(path)
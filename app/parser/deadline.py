@@ -0,0 +1,25 @@
+"""Per-request time budget, shared by the fetch, the tiers and enrichment."""
+
+import time
+
+from app.models import DeadlineExceeded
+
+
+class Deadline:
+    """A point in time (monotonic clock) by which a request must finish."""
+
+    def __init__(self, seconds: float) -> None:
+        self.budget = seconds
+        self.expires_at = time.monotonic() + seconds
+
+    def remaining(self) -> float:
+        """Seconds left in the budget, never negative."""
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def check(self, stage: str) -> None:
+        """Raise DeadlineExceeded if the budget has run out before `stage`."""
+        if self.expired():
+            raise DeadlineExceeded(stage)
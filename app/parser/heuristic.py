@@ -1,11 +1,17 @@
 """Tier 3: Heuristic extraction from unstructured HTML."""
 
+import bisect
 import logging
 import re
+from typing import TYPE_CHECKING
 
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, Tag
 
 from app.models import Recipe
+from app.parser.soup import parse_html
+
+if TYPE_CHECKING:
+    from app.parser.tiers import Page
 
 logger = logging.getLogger(__name__)
 
@@ -13,16 +19,82 @@ _INGREDIENT_RE = re.compile(r"ingredients\s*:?", re.IGNORECASE)
 _INSTRUCTION_RE = re.compile(
     r"(?:instructions|directions|steps|method)\s*:?", re.IGNORECASE
 )
-_HEADING_TAGS = ["h1", "h2", "h3", "h4", "h5", "h6"]
-_LABEL_TAGS = [*_HEADING_TAGS, "strong", "b"]
+_HEADING_TAGS = {"h1", "h2", "h3", "h4", "h5", "h6"}
+_LABEL_TAGS = {*_HEADING_TAGS, "strong", "b"}
+_LIST_TAGS = {"ul", "ol"}
+_TITLE_SUFFIX_RE = re.compile(r"\s*[—|–\-]\s*(?!.*[—|–\-])")
+
+
+def extract_page(page: "Page") -> Recipe | None:
+    """Tier 3 for the registry, from the streaming scan if the page has one."""
+    if page.scan is not None:
+        return page.scan.heuristic_recipe(page.url)
+    return heuristic_recipe(_scan(page.tree), page.url)
 
 
 def extract_heuristic(html: str, url: str) -> Recipe | None:
     """Try to extract a recipe by finding ingredient/instruction patterns in HTML."""
-    soup = BeautifulSoup(html, "html.parser")
+    return heuristic_recipe(_scan(parse_html(html)), url)
+
+
+class PageScan:
+    """Label, list and title candidates from one pass over a document.
+
+    Lists are found by position: an element's index in document order, so the
+    first list after a label is a binary search instead of a ``find_next`` walk.
+    """
+
+    def __init__(self) -> None:
+        # (label text, index to search from), in document order
+        self.labels: list[tuple[str, int]] = []
+        self.list_positions: list[int] = []
+        # List elements, replaced by their item texts once read
+        self.lists: list[Tag | list[str]] = []
+        self.og_title: str | None = None
+        self.title_text: str | None = None
+        self.h1_text: str | None = None
+
+    def list_after_label(self, pattern: re.Pattern) -> list[str]:
+        """Items of the first non-empty list following a label matching pattern."""
+        for text, search_from in self.labels:
+            if not pattern.search(text):
+                continue
+            i = bisect.bisect_right(self.list_positions, search_from)
+            if i == len(self.lists):
+                continue
+            items = self.lists[i]
+            if isinstance(items, Tag):
+                items = [li.get_text(strip=True) for li in items.find_all("li")]
+                self.lists[i] = items
+            if items:
+                return items
+        return []
+
+    def title(self) -> str:
+        """
+        Extract a recipe title from the page, falling back through og:title, <title>
+        (with site name suffix stripped), and <h1>.
+        """
+        if self.og_title and self.og_title.strip():
+            return self.og_title.strip()
+
+        if self.title_text is not None:
+            text = self.title_text
+            # Strip common suffixes like " — Site Name" or " | Site Name"
+            text = _TITLE_SUFFIX_RE.split(text)[0].strip()
+            if text:
+                return text
 
-    ingredients = _find_list_after_label(soup, _INGREDIENT_RE)
-    steps = _find_list_after_label(soup, _INSTRUCTION_RE)
+        if self.h1_text is not None:
+            return self.h1_text
+
+        return "Untitled Recipe"
+
+
+def heuristic_recipe(scan: PageScan, url: str) -> Recipe | None:
+    """Build a recipe from the label, list and title candidates of a page."""
+    ingredients = scan.list_after_label(_INGREDIENT_RE)
+    steps = scan.list_after_label(_INSTRUCTION_RE)
 
     logger.debug(
         "Heuristic found %d ingredients, %d steps", len(ingredients), len(steps)
@@ -31,52 +103,35 @@ def extract_heuristic(html: str, url: str) -> Recipe | None:
     if not ingredients and not steps:
         return None
 
-    title = _extract_title(soup)
-
     return Recipe(
-        title=title,
+        title=scan.title(),
         source_url=url,
         ingredients=ingredients,
         steps=steps,
     )
 
 
-def _find_list_after_label(soup: BeautifulSoup, pattern: re.Pattern) -> list[str]:
-    """Find a <ul>/<ol> that follows a label matching the pattern."""
-    for tag in soup.find_all(_LABEL_TAGS):
-        if not pattern.search(tag.get_text(strip=True)):
-            continue
-
-        # The label might be inside a <p> wrapper — look from the parent
-        search_from = tag.parent if tag.parent.name == "p" else tag
-        ul = search_from.find_next(["ul", "ol"])
-        if ul:
-            items = [li.get_text(strip=True) for li in ul.find_all("li")]
-            if items:
-                return items
-
-    return []
-
-
-def _extract_title(soup: BeautifulSoup) -> str:
-    """
-    Extract a recipe title from the page, falling back through og:title, <title> (with
-    site name suffix stripped), and <h1>.
-    """
-    og = soup.find("meta", property="og:title")
-    if og and og.get("content", "").strip():
-        return og["content"].strip()
-
-    title_tag = soup.find("title")
-    if title_tag:
-        text = title_tag.get_text(strip=True)
-        # Strip common suffixes like " — Site Name" or " | Site Name"
-        text = re.split(r"\s*[—|–\-]\s*(?!.*[—|–\-])", text)[0].strip()
-        if text:
-            return text
-
-    h1 = soup.find("h1")
-    if h1:
-        return h1.get_text(strip=True)
-
-    return "Untitled Recipe"
+def _scan(soup: BeautifulSoup) -> PageScan:
+    """Collect labels, lists and title candidates in a single document walk."""
+    scan = PageScan()
+    positions: dict[int, int] = {}
+    for pos, tag in enumerate(soup.find_all(True)):
+        positions[id(tag)] = pos
+        name = tag.name
+        if name in _LABEL_TAGS:
+            # The label might be inside a <p> wrapper — look from the parent
+            parent = tag.parent
+            search_from = positions[id(parent)] if parent.name == "p" else pos
+            text = tag.get_text(strip=True)
+            scan.labels.append((text, search_from))
+            if name == "h1" and scan.h1_text is None:
+                scan.h1_text = text
+        elif name in _LIST_TAGS:
+            scan.list_positions.append(pos)
+            scan.lists.append(tag)
+        elif name == "meta":
+            if scan.og_title is None and tag.get("property") == "og:title":
+                scan.og_title = tag.get("content", "")
+        elif name == "title" and scan.title_text is None:
+            scan.title_text = tag.get_text(strip=True)
+    return scan
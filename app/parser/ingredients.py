@@ -1,21 +1,41 @@
 """Ingredient string parsing using ingredient-parser-nlp."""
 
 import logging
+import sys
 from fractions import Fraction
 
 from ingredient_parser import parse_ingredient
 
+from app import units
 from app.models import ParsedIngredient, Recipe
+from app.parser.deadline import Deadline
+from app.parser.linking import link_ingredients
 
 logger = logging.getLogger(__name__)
 
 
-def enrich_recipe(recipe: Recipe) -> Recipe:
-    """Parse raw ingredient strings into structured data."""
-    recipe.parsed_ingredients = [_parse_single(raw) for raw in recipe.ingredients]
+def enrich_recipe(recipe: Recipe, deadline: Deadline | None = None) -> Recipe:
+    """Parse raw ingredient strings into structured data and link them to steps.
+
+    If `deadline` passes partway through, the recipe is left un-enriched
+    (``parsed_ingredients`` stays None) rather than partly parsed.
+    """
+    parsed = []
+    for raw in recipe.ingredients:
+        if deadline is not None and deadline.expired():
+            logger.info("Deadline passed while parsing ingredients")
+            return recipe
+        parsed.append(_parse_single(raw))
+    recipe.parsed_ingredients = parsed
+    recipe.step_links = link_ingredients(recipe.parsed_ingredients, recipe.steps)
     return recipe
 
 
+def load_model() -> None:
+    """Parse a sample ingredient so ingredient-parser loads its models now."""
+    _parse_single("1 cup flour, sifted")
+
+
 def _parse_single(raw: str) -> ParsedIngredient:
     """Parse a single ingredient string, falling back to raw on failure."""
     try:
@@ -64,28 +84,23 @@ def _extract_amount_max(amt) -> float | None:
     return _fraction_to_float(amt.quantity_max)
 
 
-_UNIT_NORMALIZE = {
-    "tbsps": "tbsp",
-    "tsps": "tsp",
-}
-
-
 def _extract_unit(amt) -> str | None:
-    """Extract unit as a plain string, normalizing common abbreviations."""
+    """Extract unit as its canonical name (see app/units.py)."""
     if amt is None:
         return None
     unit = amt.unit
     if not unit or unit == "":
         return None
-    unit = str(unit)
-    return _UNIT_NORMALIZE.get(unit.lower(), unit)
+    return units.normalize(str(unit))
 
 
 def _extract_name(result) -> str:
     """Join ingredient name parts (handles 'salt and pepper')."""
     if not result.name:
         return ""
-    return " and ".join(part.text for part in result.name)
+    # Interned: the same few names ("salt", "butter") recur across every
+    # cached recipe.
+    return sys.intern(" and ".join(part.text for part in result.name))
 
 
 def _extract_text(field) -> str | None:
@@ -0,0 +1,269 @@
+"""Link ingredients to the steps that mention them.
+
+Each ingredient name is expanded into match variants (modifiers stripped,
+head/tail words, plurals, alternate spellings). All variants for a recipe go
+into a single Aho-Corasick automaton, so every step is scanned once no matter
+how many ingredients the recipe has. The result is a list of match spans per
+step, which the browser uses directly for highlighting.
+"""
+
+import re
+from collections import deque
+from functools import lru_cache
+
+from app.models import ParsedIngredient
+
+# A match span: (ingredient index, start, end), offsets into the step text.
+Span = tuple[int, int, int]
+
+_MIN_LENGTH = 3
+
+_MODIFIERS = sorted(
+    [
+        "salted", "unsalted", "dried", "fresh", "freshly", "cracked",
+        "crushed", "ground", "light", "dark", "all purpose", "all-purpose",
+        "granulated", "powdered", "confectioners", "packed", "large",
+        "medium", "small", "extra virgin", "extra-virgin", "pure", "raw",
+        "organic", "whole", "boneless", "skinless", "frozen", "canned",
+        "toasted", "roasted", "smoked", "sharp", "mild", "sweet", "plain",
+        "heavy", "white", "low-fat", "nonfat", "reduced-fat",
+    ],
+    key=len,
+    reverse=True,
+)  # fmt: skip
+_MODIFIER_RE = re.compile(
+    r"\b(?:" + "|".join(re.escape(m) for m in _MODIFIERS) + r")\b\s*", re.ASCII
+)
+
+# Alternate spellings: each word maps to its known variants
+_SPELLING_VARIANTS = {
+    "chili": ["chilli", "chile"],
+    "chilli": ["chili", "chile"],
+    "chile": ["chili", "chilli"],
+    "yogurt": ["yoghurt"],
+    "yoghurt": ["yogurt"],
+}
+
+# Words that name a different ingredient when preceded by one of these words,
+# e.g. "pepper" should not match "bell pepper" for an ingredient "black pepper".
+_AMBIGUOUS_COMPOUNDS = {
+    "pepper": ["bell", "cayenne", "chili", "chile", "jalape", "salt and"],
+    "powder": [
+        "cocoa", "baking", "garlic", "onion", "curry", "mustard", "ginger",
+        "turmeric", "cayenne", "paprika", "cumin", "cinnamon", "chili",
+        "chilli", "chile", "chipotle",
+    ],
+    "cream": ["ice"],
+    "sauce": ["hot"],
+    "oil": ["essential"],
+}  # fmt: skip
+_PLURAL_SUFFIX_RE = re.compile(r"e?s$")
+_AMBIGUOUS_PREFIX_RES = {
+    word: [re.compile(rf"\b{re.escape(p)}\s+$", re.ASCII) for p in prefixes]
+    for word, prefixes in _AMBIGUOUS_COMPOUNDS.items()
+}
+
+
+def link_ingredients(
+    ingredients: list[ParsedIngredient], steps: list[str]
+) -> list[list[Span]]:
+    """Find where each ingredient is mentioned in each step.
+
+    Returns one list of ``(ingredient, start, end)`` spans per step. Spans for a
+    single ingredient never overlap (longer matches win); spans for different
+    ingredients may, and the browser resolves those when highlighting several
+    ingredients at once. Offsets are in UTF-16 code units, as JavaScript
+    strings index them.
+    """
+    variant_owners: dict[str, list[int]] = {}
+    for idx, ing in enumerate(ingredients):
+        name = (ing.name or "").lower().strip()
+        if len(name) < _MIN_LENGTH:
+            continue
+        for variant in build_variants(name):
+            variant_owners.setdefault(variant, []).append(idx)
+
+    if not variant_owners:
+        return [[] for _ in steps]
+
+    automaton = _Automaton(variant_owners)
+    return [_link_step(step, automaton) for step in steps]
+
+
+def _link_step(step: str, automaton: "_Automaton") -> list[Span]:
+    text = _lower(step)
+    candidates: dict[int, list[tuple[int, int]]] = {}
+    for start, variant, owners in automaton.iter_matches(text):
+        end = start + len(variant)
+        if not (_is_boundary(text, start) and _is_boundary(text, end)):
+            continue
+        if _is_ambiguous_match(text, variant, start):
+            continue
+        for idx in owners:
+            candidates.setdefault(idx, []).append((start, end))
+
+    spans: list[Span] = []
+    for idx in sorted(candidates):
+        spans.extend((idx, s, e) for s, e in _non_overlapping(candidates[idx]))
+    spans.sort(key=lambda span: (span[1], span[0]))
+    return _to_utf16_offsets(step, spans)
+
+
+@lru_cache(maxsize=4096)
+def build_variants(name: str) -> tuple[str, ...]:
+    """Expand a lowercase ingredient name into the strings that may refer to it."""
+    candidates = [name]
+
+    core_name = _MODIFIER_RE.sub("", name).strip()
+    if core_name != name and len(core_name) >= _MIN_LENGTH:
+        candidates.append(core_name)
+
+    words = core_name.split()
+    if len(words) >= 2:
+        tail = " ".join(words[1:])
+        if len(tail) >= _MIN_LENGTH:
+            candidates.append(tail)
+        head = " ".join(words[:-1])
+        if len(head) >= _MIN_LENGTH:
+            candidates.append(head)
+    if len(words) >= 3:
+        if len(words[-1]) >= _MIN_LENGTH:
+            candidates.append(words[-1])
+        if len(words[0]) >= _MIN_LENGTH:
+            candidates.append(words[0])
+
+    expanded = list(candidates)
+    for candidate in candidates:
+        expanded.extend(_spelling_variants(candidate))
+
+    variants: dict[str, None] = {}
+    for candidate in expanded:
+        for variant in _plural_variants(candidate):
+            if len(variant) >= _MIN_LENGTH:
+                variants.setdefault(variant)
+    return tuple(variants)
+
+
+def _plural_variants(word: str) -> list[str]:
+    variants = [word]
+    if word.endswith("s"):
+        variants.append(word[:-1])
+    if word.endswith("es"):
+        variants.append(word[:-2])
+    if word.endswith("ies"):
+        variants.append(word[:-3] + "y")
+    if not word.endswith("s"):
+        variants.append(word + "s")
+        variants.append(word + "es")
+    if word.endswith("y") and not word.endswith("ey"):
+        variants.append(word[:-1] + "ies")
+    return variants
+
+
+def _spelling_variants(phrase: str) -> list[str]:
+    words = phrase.split()
+    results = []
+    for i, word in enumerate(words):
+        for alt in _SPELLING_VARIANTS.get(word, ()):
+            results.append(" ".join([*words[:i], alt, *words[i + 1 :]]))
+    return results
+
+
+def _lower(text: str) -> str:
+    """text.lower(), with the same length, so offsets into it are offsets into text.
+
+    Characters whose lowercase is longer (e.g. "İ" becomes "i̇") are left as they
+    are.
+    """
+    lowered = text.lower()
+    if len(lowered) == len(text):
+        return lowered
+    return "".join(low if len(low := ch.lower()) == 1 else ch for ch in text)
+
+
+def _is_word_char(ch: str) -> bool:
+    # Matches JavaScript's (non-Unicode) \b, which the highlighter used to rely on.
+    return ch.isascii() and (ch.isalnum() or ch == "_")
+
+
+def _is_boundary(text: str, pos: int) -> bool:
+    before = pos > 0 and _is_word_char(text[pos - 1])
+    after = pos < len(text) and _is_word_char(text[pos])
+    return before != after
+
+
+def _is_ambiguous_match(text: str, variant: str, start: int) -> bool:
+    base = _PLURAL_SUFFIX_RE.sub("", variant)
+    prefix_res = _AMBIGUOUS_PREFIX_RES.get(variant) or _AMBIGUOUS_PREFIX_RES.get(base)
+    if not prefix_res:
+        return False
+    before = text[:start]
+    return any(r.search(before) for r in prefix_res)
+
+
+def _non_overlapping(matches: list[tuple[int, int]]) -> list[tuple[int, int]]:
+    """Greedily keep the longest matches, then earliest, that don't overlap."""
+    taken: list[tuple[int, int]] = []
+    for start, end in sorted(set(matches), key=lambda m: (m[0] - m[1], m[0])):
+        if all(start >= t_end or end <= t_start for t_start, t_end in taken):
+            taken.append((start, end))
+    return sorted(taken)
+
+
+def _to_utf16_offsets(text: str, spans: list[Span]) -> list[Span]:
+    if text.isascii() or all(ord(ch) <= 0xFFFF for ch in text):
+        return spans
+    # Characters outside the BMP take two UTF-16 code units in the browser.
+    offsets = [0]
+    for ch in text:
+        offsets.append(offsets[-1] + (2 if ord(ch) > 0xFFFF else 1))
+    return [(idx, offsets[start], offsets[end]) for idx, start, end in spans]
+
+
+class _Automaton:
+    """Aho-Corasick automaton over a fixed set of patterns."""
+
+    def __init__(self, patterns: dict[str, list[int]]):
+        self.goto: list[dict[str, int]] = [{}]
+        self.fail: list[int] = [0]
+        self.outputs: list[list[str]] = [[]]
+        self.owners = patterns
+
+        for pattern in patterns:
+            node = 0
+            for ch in pattern:
+                nxt = self.goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(self.goto)
+                    self.goto[node][ch] = nxt
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.outputs.append([])
+                node = nxt
+            self.outputs[node].append(pattern)
+
+        queue = deque(self.goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in self.goto[node].items():
+                queue.append(child)
+                fallback = self.fail[node]
+                while fallback and ch not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[child] = self.goto[fallback].get(ch, 0)
+                if self.fail[child] == child:
+                    self.fail[child] = 0
+                self.outputs[child] = (
+                    self.outputs[child] + self.outputs[self.fail[child]]
+                )
+
+    def iter_matches(self, text: str):
+        """Yield ``(start, pattern, owners)`` for every occurrence in text."""
+        node = 0
+        goto, fail, outputs, owners = self.goto, self.fail, self.outputs, self.owners
+        for pos, ch in enumerate(text):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            for pattern in outputs[node]:
+                yield pos - len(pattern) + 1, pattern, owners[pattern]
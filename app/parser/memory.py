@@ -0,0 +1,145 @@
+"""Memory limits for fetching and parsing pages.
+
+Pages over ``MAX_HTML_BYTES`` (``RECIPE_MAX_HTML_BYTES``, default 5 MB) are
+refused before any tier parses them: parse trees run to several times the
+page's size, and each tier may build its own.
+
+Set ``RECIPE_MEMORY_BUDGET_MB`` to also cap what fetches and parses in flight
+may hold at once. Each one reserves an estimate from the budget before its
+download (``_DEFAULT_PAGE_BYTES`` worth of parsing) and resizes the
+reservation to the page's actual size once it has it; requests that don't fit
+wait their turn, within their deadline. Fetches waiting to grow a reservation
+go before new ones, which would otherwise start downloading while downloaded
+pages wait. A page bigger than the whole budget runs on its own.
+
+When tracemalloc is tracing (``PYTHONTRACEMALLOC=1``), the peak allocation of
+each tier's run goes on the request's log record (``memory_peak_kb``), next to
+the process's peak resident memory (``max_rss_mb``).
+"""
+
+import asyncio
+import os
+import tracemalloc
+from collections import deque
+from collections.abc import AsyncIterator, Iterator
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+
+from app import request_log
+from app.models import DeadlineExceeded
+from app.parser.deadline import Deadline
+
+MAX_HTML_BYTES = int(os.environ.get("RECIPE_MAX_HTML_BYTES") or 5_000_000)
+MEMORY_BUDGET = (
+    int(float(os.environ["RECIPE_MEMORY_BUDGET_MB"]) * 1_000_000)
+    if os.environ.get("RECIPE_MEMORY_BUDGET_MB")
+    else None
+)
+# Peak memory of extracting a recipe, per byte of HTML: about 40 (tracemalloc)
+# for a page that goes through both recipe-scrapers' and Tier 3's trees
+PARSE_BYTES_PER_HTML_BYTE = 40
+# Reserved before a download, when the page's size isn't known yet
+_DEFAULT_PAGE_BYTES = 300_000
+
+_reserved = 0
+# Reservations waiting to grow; new ones wait until there are none
+_growing = 0
+_waiters: deque[asyncio.Future] = deque()
+# Bytes held by the fetch running in the current context
+_current: ContextVar[list[int] | None] = ContextVar("memory_reservation", default=None)
+
+
+def estimate(html_bytes: int) -> int:
+    """Bytes to reserve for parsing a page of `html_bytes`."""
+    return html_bytes * PARSE_BYTES_PER_HTML_BYTE
+
+
+@asynccontextmanager
+async def reservation(deadline: Deadline) -> AsyncIterator[None]:
+    """Hold a share of the memory budget (if there is one) for this block."""
+    if MEMORY_BUDGET is None:
+        yield
+        return
+    held = [await _acquire(estimate(_DEFAULT_PAGE_BYTES), deadline)]
+    token = _current.set(held)
+    try:
+        yield
+    finally:
+        _current.reset(token)
+        _release(held[0])
+
+
+async def resize(html_bytes: int, deadline: Deadline) -> None:
+    """Resize the current reservation for a page of `html_bytes`."""
+    held = _current.get()
+    if held is None:
+        return
+    wanted = min(estimate(html_bytes), MEMORY_BUDGET)
+    if wanted <= held[0]:
+        _release(held[0] - wanted)
+        held[0] = wanted
+        return
+    # Give back what's held before waiting for more, so two growing
+    # reservations can't each hold what the other needs.
+    _release(held[0])
+    held[0] = 0
+    held[0] = await _acquire(wanted, deadline, growing=True)
+
+
+def stats() -> dict | None:
+    if MEMORY_BUDGET is None:
+        return None
+    return {"budget": MEMORY_BUDGET, "reserved": _reserved, "waiting": len(_waiters)}
+
+
+@contextmanager
+def traced(stage: str) -> Iterator[None]:
+    """Log the peak memory traced while `stage` runs, if tracemalloc is on."""
+    if not tracemalloc.is_tracing():
+        yield
+        return
+    start, _ = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    try:
+        yield
+    finally:
+        _, peak = tracemalloc.get_traced_memory()
+        request_log.add_memory_peak(stage, max(0, peak - start))
+
+
+async def _acquire(nbytes: int, deadline: Deadline, growing: bool = False) -> int:
+    global _reserved, _growing
+    nbytes = min(nbytes, MEMORY_BUDGET)
+    _growing += growing
+    try:
+        async with asyncio.timeout(deadline.remaining()):
+            while _reserved + nbytes > MEMORY_BUDGET or (_growing and not growing):
+                waiter = asyncio.get_running_loop().create_future()
+                _waiters.append(waiter)
+                try:
+                    await waiter
+                finally:
+                    if waiter in _waiters:
+                        _waiters.remove(waiter)
+    except TimeoutError:
+        raise DeadlineExceeded("memory budget") from None
+    finally:
+        _growing -= growing
+        if growing:
+            _wake()
+    _reserved += nbytes
+    return nbytes
+
+
+def _release(nbytes: int) -> None:
+    global _reserved
+    _reserved -= nbytes
+    _wake()
+
+
+def _wake() -> None:
+    # Everyone rechecks; whoever now fits goes ahead
+    while _waiters:
+        waiter = _waiters.popleft()
+        if not waiter.done():
+            waiter.set_result(None)
@@ -1,23 +1,88 @@
 """Orchestrator: fetch URL and run parsing tiers."""
 
+import asyncio
+import hashlib
+import importlib
 import ipaddress
 import logging
+import os
 import socket
+import time
+from collections.abc import AsyncIterator, Callable
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING, NamedTuple
 from urllib.parse import urlparse
 
 import httpx
 from cachetools import TTLCache
 
-from app.models import ParseError, Recipe
-from app.parser.heuristic import extract_heuristic
-from app.parser.ingredients import enrich_recipe
-from app.parser.scrapers import extract_with_scraper
-from app.parser.structured import extract_from_html
+from app import request_log
+from app.models import DeadlineExceeded, ParseError, Recipe
+from app.parser import archive, memory, profiling, tiers
+from app.parser.deadline import Deadline
+from app.parser.tiers import Page
+
+if TYPE_CHECKING:
+    from app.parser.streaming import StreamingScan
 
 logger = logging.getLogger(__name__)
 
-# In-memory cache: up to 128 recipes, 30-minute TTL
+# The tier modules pull in heavy dependencies (extruct and rdflib, hundreds of
+# recipe-scrapers site modules, ingredient-parser's model), so they are imported
+# by warm_up() after the server starts rather than when the app is imported.
+# The tiers themselves are registered in tiers.py.
+_tiers_loaded = False
+
+# Opt-in: parse pages while they download instead of after (see streaming.py).
+STREAMING_PARSE = os.environ.get("RECIPE_STREAMING_PARSE", "").lower() in (
+    "1",
+    "true",
+    "yes",
+)
+
+# Overall time budget for a request when the caller doesn't set one: DNS,
+# connect and download, the tiers and ingredient parsing.
+DEFAULT_DEADLINE = 20.0
+# Rough costs used to decide what still fits in the remaining budget:
+# html.parser builds a BeautifulSoup tree at about 1 MB/s (bench_heuristic),
+# and ingredient-parser takes a few milliseconds per ingredient.
+_SOUP_BYTES_PER_SECOND = 1_000_000
+_ENRICH_SECONDS_PER_INGREDIENT = 0.005
+
+# Recipe fetches this instance is expected to handle at once. /readyz reports
+# the instance as saturated (not ready) beyond this.
+MAX_IN_FLIGHT = 32
+_in_flight = 0
+
+# In-memory cache: up to 128 recipes, 30-minute TTL. Keyed by _cache_key(),
+# which is the URL for the first (or only) recipe on a page.
 _recipe_cache: TTLCache[str, Recipe] = TTLCache(maxsize=128, ttl=30 * 60)
+# _cache_key() -> when the recipe under that key was cached (Unix time), for
+# the Last-Modified of pages rendered from it
+_cached_at: TTLCache[str, float] = TTLCache(maxsize=128, ttl=30 * 60)
+
+# URL -> every recipe on a page that has several, before ingredient parsing.
+# Only the recipe being viewed is enriched; another one asked for later is
+# enriched from here, without fetching the page again.
+_page_recipes: TTLCache[str, list[Recipe]] = TTLCache(maxsize=64, ttl=30 * 60)
+
+# Content hash -> Recipe, so syndicated copies, AMP pages and print views of an
+# already-parsed recipe skip extraction and ingredient parsing. Keyed by the
+# hash of the fetched HTML and of the JSON-LD Recipe block; holds up to two
+# keys per recipe.
+_content_index: TTLCache[str, Recipe] = TTLCache(maxsize=256, ttl=30 * 60)
+
+
+class _PendingEnrichment(NamedTuple):
+    """A recipe returned before its ingredients were parsed, and the task parsing them."""
+
+    recipe: Recipe
+    task: asyncio.Task[Recipe]
+
+
+# _cache_key() -> recipe whose ingredients are being parsed in the background
+# (parse_recipe with enrich=False). Removed once the enriched recipe is cached.
+_pending: dict[str, _PendingEnrichment] = {}
 
 USER_AGENT = (
     "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
@@ -36,6 +101,15 @@ _BLOCKED_NETWORKS = [
     ipaddress.ip_network("fc00::/7"),
 ]
 
+# Hostnames exempt from the private-address check, for pointing the app at a
+# local mock origin in load tests (benchmarks/mock_origin.py). Comma-separated.
+# Never set this in production: it re-opens those hosts to SSRF.
+ALLOWED_PRIVATE_HOSTS = frozenset(
+    host.strip().lower()
+    for host in os.environ.get("RECIPE_ALLOWED_PRIVATE_HOSTS", "").split(",")
+    if host.strip()
+)
+
 
 def validate_url(url: str, request_host: str | None = None) -> None:
     """Validate URL scheme and block requests to private/reserved IPs."""
@@ -64,6 +138,10 @@ def validate_url(url: str, request_host: str | None = None) -> None:
             "network", "Couldn't find that website. Check the URL for typos."
         )
 
+    if hostname.lower() in ALLOWED_PRIVATE_HOSTS:
+        logger.debug("Allowing %s, listed in RECIPE_ALLOWED_PRIVATE_HOSTS", hostname)
+        return
+
     for _, _, _, _, sockaddr in addrinfos:
         ip = ipaddress.ip_address(sockaddr[0])
         for network in _BLOCKED_NETWORKS:
@@ -75,23 +153,166 @@ def validate_url(url: str, request_host: str | None = None) -> None:
                 )
 
 
-async def parse_recipe(url: str, request_host: str | None = None) -> Recipe:
-    """Fetch a URL and extract a recipe from it."""
-    cached = _recipe_cache.get(url)
+def warm_up() -> None:
+    """Import the parser tiers. Blocking; run it in a worker thread."""
+    global _tiers_loaded
+    if _tiers_loaded:
+        return
+    start = time.perf_counter()
+    for tier in tiers.registered():
+        tiers.resolve(tier)
+    importlib.import_module("app.parser.ingredients").load_model()
+    _tiers_loaded = True
+    logger.info("Loaded parser tiers in %.2fs", time.perf_counter() - start)
+
+
+def tiers_loaded() -> bool:
+    return _tiers_loaded
+
+
+def stats() -> dict:
+    """Warm-up state, load and cache usage, for health checks."""
+    return {
+        "tiers_loaded": _tiers_loaded,
+        "in_flight": _in_flight,
+        "max_in_flight": MAX_IN_FLIGHT,
+        "saturation": round(_in_flight / MAX_IN_FLIGHT, 3),
+        "recipe_cache": {
+            "size": len(_recipe_cache),
+            "maxsize": _recipe_cache.maxsize,
+        },
+        "content_index": {
+            "size": len(_content_index),
+            "maxsize": _content_index.maxsize,
+        },
+        "pending_enrichment": len(_pending),
+        "multi_recipe_pages": len(_page_recipes),
+        "tiers": tiers.stats(),
+        "memory_budget": memory.stats(),
+    }
+
+
+def _cache_key(url: str, index: int) -> str:
+    """_recipe_cache key for the `index`-th recipe on a page."""
+    # A newline can't appear in a validated URL
+    return url if index == 0 else f"{url}\n{index}"
+
+
+async def parse_recipe(
+    url: str,
+    request_host: str | None = None,
+    deadline: Deadline | None = None,
+    enrich: bool = True,
+    index: int = 0,
+) -> Recipe:
+    """Fetch a URL and extract a recipe from it.
+
+    `index` picks a recipe on pages with several (see Recipe.page_recipes).
+    All of them are extracted and kept from one fetch; ingredients are parsed
+    only for the one asked for. An index past the last recipe raises
+    ParseError("validation").
+
+    Raises DeadlineExceeded if `deadline` (DEFAULT_DEADLINE from now if not
+    given) runs out first. When little time is left after extraction, the
+    recipe is returned without parsed ingredients and isn't cached.
+
+    Pages over memory.MAX_HTML_BYTES raise ParseError("too_large"). With a
+    memory budget set, the fetch and parse first wait for their share of it
+    (see memory.py).
+
+    With ``enrich=False`` the recipe is returned as soon as a tier finds it,
+    without parsed ingredients, and ingredient parsing continues in the
+    background; enriched_recipe() waits for it. The enriched recipe is cached
+    as usual once ready.
+    """
+    global _in_flight
+    key = _cache_key(url, index)
+    cached = _recipe_cache.get(key)
+    if cached is not None:
+        request_log.annotate(cache="recipe")
+        return cached
+
+    if deadline is None:
+        deadline = Deadline(DEFAULT_DEADLINE)
+    pending = _pending.get(key)
+    if pending is not None:
+        request_log.annotate(cache="pending")
+        if not enrich:
+            return pending.recipe
+        return await enriched_recipe(url, deadline, index)
+
+    page = _page_recipes.get(url)
+    if page is not None:
+        request_log.annotate(cache="page_recipes")
+        return _select_recipe(page, index, url, deadline, enrich, [])
+
+    request_log.annotate(cache="miss")
+    async with profiling.capture(url):
+        # getaddrinfo blocks; run it off the event loop so the deadline can bound it
+        with profiling.stage("DNS lookup"):
+            async with _within(deadline, "DNS lookup"):
+                await asyncio.to_thread(validate_url, url, request_host)
+        _in_flight += 1
+        try:
+            async with memory.reservation(deadline):
+                return await _fetch_and_parse(url, deadline, enrich, index)
+        finally:
+            _in_flight -= 1
+
+
+async def enriched_recipe(
+    url: str, deadline: Deadline | None = None, index: int = 0
+) -> Recipe | None:
+    """The recipe for `url` with parsed ingredients, if it's cached or pending.
+
+    Waits for background ingredient parsing started by parse_recipe(...,
+    enrich=False). Returns None if the URL is neither cached nor pending. If
+    parsing ran out of time, the recipe comes back without parsed ingredients.
+    """
+    key = _cache_key(url, index)
+    cached = _recipe_cache.get(key)
     if cached is not None:
-        logger.info("Cache hit for %s", url)
+        request_log.annotate(cache="recipe")
         return cached
+    pending = _pending.get(key)
+    if pending is None:
+        return None
+    request_log.annotate(cache="pending")
+    async with _within(deadline or Deadline(DEFAULT_DEADLINE), "ingredient parsing"):
+        # Shielded: a caller giving up mustn't cancel parsing for everyone else
+        return await asyncio.shield(pending.task)
+
 
-    logger.info("Parsing recipe from %s", url)
-    validate_url(url, request_host)
+@asynccontextmanager
+async def _within(deadline: Deadline, stage: str) -> AsyncIterator[None]:
+    """Cancel the block and raise DeadlineExceeded when the deadline passes."""
+    timeout = asyncio.timeout(deadline.remaining())
     try:
-        async with httpx.AsyncClient(
-            timeout=10.0,
-            follow_redirects=True,
-            headers={"User-Agent": USER_AGENT},
-        ) as client:
-            response = await client.get(url)
-            response.raise_for_status()
+        async with timeout:
+            yield
+    except TimeoutError:
+        if not timeout.expired():
+            raise
+        logger.warning("Deadline of %.1fs exceeded during %s", deadline.budget, stage)
+        raise DeadlineExceeded(stage) from None
+
+
+async def _fetch_and_parse(
+    url: str, deadline: Deadline, enrich: bool, index: int
+) -> Recipe:
+    try:
+        with profiling.stage("download"):
+            async with (
+                _within(deadline, "download"),
+                httpx.AsyncClient(
+                    timeout=10.0,
+                    follow_redirects=True,
+                    headers={"User-Agent": USER_AGENT},
+                ) as client,
+            ):
+                response, body, html, scan = await _stream_page(
+                    client, url, parse=STREAMING_PARSE
+                )
     except httpx.TimeoutException:
         logger.warning("Timeout fetching %s", url)
         raise ParseError("network", "Request timed out. The site may be slow or down.")
@@ -120,30 +341,332 @@ async def parse_recipe(url: str, request_host: str | None = None) -> Recipe:
             "Something went wrong fetching that page. Check the URL and try again.",
         )
 
-    logger.info(
-        "Fetched %s (HTTP %d, %d bytes)", url, response.status_code, len(response.text)
-    )
-    html = response.text
-
-    # Try extraction tiers in order
-    tiers = [
-        ("Tier 1 (structured data)", lambda: extract_from_html(html, url)),
-        ("Tier 2 (recipe-scrapers)", lambda: extract_with_scraper(url, html)),
-        ("Tier 3 (heuristic)", lambda: extract_heuristic(html, url)),
-    ]
-
-    recipe = None
-    for name, extract in tiers:
-        recipe = extract()
-        if recipe is not None:
-            logger.info("%s succeeded for %s", name, url)
-            break
-        logger.debug("%s found nothing for %s", name, url)
-
-    if recipe is None:
-        logger.warning("All tiers failed for %s", url)
+    logger.debug("Fetched %s (HTTP %d, %d bytes)", url, response.status_code, len(html))
+    profiling.annotate(html_bytes=len(body))
+    await memory.resize(len(body), deadline)
+
+    if archive.ARCHIVE_DIR is not None:
+        await _archive_response(url, response, body)
+
+    html_key = "html:" + hashlib.sha256(body).hexdigest()
+    # The content index holds a page's first recipe only
+    known = _content_index.get(html_key) if index == 0 else None
+    if known is not None:
+        return _reuse_recipe(known, url)
+
+    if not _tiers_loaded:
+        # Don't block the event loop importing tiers if warm-up hasn't finished.
+        with profiling.stage("parser warm-up"):
+            async with _within(deadline, "parser warm-up"):
+                await asyncio.to_thread(warm_up)
+    from app.parser.structured import jsonld_blocks_hash
+
+    # The JSON-LD blocks found here are what Tier 1 reads, too
+    page = Page(html, url, scan)
+    jsonld_hash = jsonld_blocks_hash(page.jsonld)
+    jsonld_key = f"jsonld:{jsonld_hash}" if jsonld_hash else None
+    if jsonld_key and index == 0:
+        known = _content_index.get(jsonld_key)
+        if known is not None:
+            _content_index[html_key] = known
+            return _reuse_recipe(known, url)
+
+    recipes, tier = await _extract_recipes(page, deadline)
+    profiling.annotate(tier=tier.name)
+    if len(recipes) > 1:
+        _page_recipes[url] = recipes
+    # Other tiers read more of the page than the JSON-LD block, so only their
+    # results are known to follow from the block alone.
+    content_keys = [html_key]
+    if jsonld_key and tier.jsonld_only:
+        content_keys.append(jsonld_key)
+    return _select_recipe(recipes, index, url, deadline, enrich, content_keys)
+
+
+def _select_recipe(
+    recipes: list[Recipe],
+    index: int,
+    url: str,
+    deadline: Deadline,
+    enrich: bool,
+    content_keys: list[str],
+) -> Recipe:
+    """Enrich and cache the `index`-th of a page's recipes.
+
+    The page's content hashes (`content_keys`) only ever point at its first
+    recipe, which the content index returns for matching pages.
+    """
+    if not 0 <= index < len(recipes):
+        raise ParseError(
+            "validation",
+            f"That page has {len(recipes)} recipe{'s' if len(recipes) > 1 else ''}"
+            f"; there's no recipe at index {index}.",
+        )
+    # A copy: the page's list keeps its recipes without parsed ingredients
+    recipe = recipes[index].model_copy()
+    key = _cache_key(url, index)
+    if index != 0:
+        content_keys = []
+    if not enrich:
+        task = asyncio.create_task(_enrich_in_background(recipe, key, content_keys))
+        _pending[key] = _PendingEnrichment(recipe, task)
+        return recipe
+    with profiling.profiled():
+        _enrich_within(recipe, url, deadline)
+    if recipe.parsed_ingredients is None:
+        # Out of time for ingredient parsing; let the next request try again.
+        return recipe
+    _remember(recipe, key, content_keys)
+    return recipe
+
+
+def cached_at(url: str, index: int = 0) -> float | None:
+    """When the recipe for `url` was cached (Unix time), or None if it isn't."""
+    return _cached_at.get(_cache_key(url, index))
+
+
+def forget(url: str) -> None:
+    """Drop every recipe cached from the page at `url`, and its content hashes."""
+    _page_recipes.pop(url, None)
+    for key in [k for k in _recipe_cache if k == url or k.startswith(f"{url}\n")]:
+        _recipe_cache.pop(key, None)
+        _cached_at.pop(key, None)
+    for key in [k for k, r in _content_index.items() if r.source_url == url]:
+        _content_index.pop(key, None)
+
+
+def _remember(recipe: Recipe, key: str, content_keys: list[str]) -> None:
+    """Cache an enriched recipe by _cache_key() and by the hashes of its content."""
+    _cache_recipe(key, recipe)
+    for content_key in content_keys:
+        _content_index[content_key] = recipe
+
+
+async def _enrich_in_background(
+    recipe: Recipe, key: str, content_keys: list[str]
+) -> Recipe:
+    from app.parser.ingredients import enrich_recipe
+
+    # A copy, so the un-enriched recipe being rendered isn't changed under it
+    enriched = recipe.model_copy()
+    try:
+        await asyncio.to_thread(enrich_recipe, enriched, Deadline(DEFAULT_DEADLINE))
+    except Exception:
+        logger.exception(
+            "Background ingredient parsing failed for %s", recipe.source_url
+        )
+        enriched = recipe
+    else:
+        if enriched.parsed_ingredients is not None:
+            _remember(enriched, key, content_keys)
+    finally:
+        _pending.pop(key, None)
+    return enriched
+
+
+def extract_recipe(
+    html: str,
+    url: str,
+    scan: "StreamingScan | None" = None,
+    deadline: Deadline | None = None,
+    enrich: bool = True,
+) -> tuple[Recipe, str]:
+    """Run the extraction tiers over fetched HTML and enrich the result.
+
+    For callers outside the event loop (reparse workers); it runs one to await
+    any async tiers. Returns the first recipe on the page and the name of the
+    tier that found it. With a finished StreamingScan of the page, tiers that
+    can read it do so instead of parsing the HTML again. Call warm_up() first;
+    otherwise the tier imports happen here, on the caller's thread.
+
+    With a deadline, tiers that would parse the page are skipped when the
+    remaining budget can't cover the parse, and ingredients are left
+    unparsed (``parsed_ingredients`` is None) when there's no time for them.
+    A tier that runs out of time raises DeadlineExceeded.
+    ``enrich=False`` skips ingredient parsing.
+    """
+    recipes, tier = asyncio.run(_extract_recipes(Page(html, url, scan), deadline))
+    recipe = recipes[0]
+    if enrich:
+        _enrich_within(recipe, url, deadline)
+    return recipe, tier.name
+
+
+async def _extract_recipes(
+    page: Page, deadline: Deadline | None = None
+) -> tuple[list[Recipe], tiers.Tier]:
+    """Run the registered tiers in order; return what the first hit found, and it.
+
+    Only Tier 1 finds more than one recipe. On pages with several, each gets
+    its position and every recipe's title (page_index, page_recipes). Sync
+    tiers that parse the page run in a worker thread, so the event loop keeps
+    serving other requests; they and async tiers are awaited within the
+    deadline. Cheap sync tiers run on the calling thread. Sync tiers run under
+    the parse's profiler. The page's tree is freed as soon as no tier left to
+    run reads it.
+    """
+    from app.parser.soup import shared_soup
+
+    recipes: list[Recipe] = []
+    skipped = False
+    registered = tiers.registered()
+    # Tiers reading a BeautifulSoup tree share one; the page is parsed once.
+    with shared_soup():
+        for position, tier in enumerate(registered):
+            if deadline is not None:
+                deadline.check(tier.name)
+                cost = _tier_cost(tier, page)
+                if deadline.remaining() < cost:
+                    logger.info(
+                        "Skipping %s for %s: %.2fs left",
+                        tier.name,
+                        page.url,
+                        deadline.remaining(),
+                    )
+                    skipped = True
+                    continue
+            extract = tiers.resolve(tier)
+            start = time.perf_counter()
+            with profiling.stage(tier.name):
+                if tier.is_async:
+                    async with _within(
+                        deadline or Deadline(DEFAULT_DEADLINE), tier.name
+                    ):
+                        result = await extract(page)
+                elif tier.cost is tiers.Cost.PARSES_PAGE:
+                    # The thread gets a copy of the context, so the shared tree,
+                    # profiler and log record are the same ones
+                    async with _within(
+                        deadline or Deadline(DEFAULT_DEADLINE), tier.name
+                    ):
+                        result = await asyncio.to_thread(
+                            _run_sync_tier, extract, page, tier.name
+                        )
+                else:
+                    result = _run_sync_tier(extract, page, tier.name)
+            recipes = tiers.as_recipes(result)
+            tiers.record(tier.name, time.perf_counter() - start, bool(recipes))
+            if recipes:
+                logger.debug(
+                    "%s found %d recipe(s) for %s", tier.name, len(recipes), page.url
+                )
+                break
+            logger.debug("%s found nothing for %s", tier.name, page.url)
+            if not any(
+                tiers.Input.TREE in t.inputs for t in registered[position + 1 :]
+            ):
+                page.release_tree()
+
+    if not recipes:
+        if skipped:
+            raise DeadlineExceeded("extraction")
+        logger.warning("All tiers failed for %s", page.url)
         raise ParseError("parse", "No recipe found on that page. Try a different URL.")
 
-    enrich_recipe(recipe)
-    _recipe_cache[url] = recipe
+    if len(recipes) > 1:
+        titles = [recipe.title for recipe in recipes]
+        for i, recipe in enumerate(recipes):
+            recipe.page_recipes = titles
+            recipe.page_index = i
+    return recipes, tier
+
+
+def _run_sync_tier(extract: Callable, page: Page, name: str):
+    with profiling.profiled(), memory.traced(name):
+        return extract(page)
+
+
+def _tier_cost(tier: tiers.Tier, page: Page) -> float:
+    """Seconds a tier is expected to need for parsing the page first."""
+    if tier.cost is tiers.Cost.CHEAP:
+        return 0.0
+    if tier.streamable and page.scan is not None:
+        return 0.0
+    if tiers.Input.TREE in tier.inputs and page.has_tree():
+        # An earlier tier parsed it already
+        return 0.0
+    return len(page.html) / _SOUP_BYTES_PER_SECOND
+
+
+def _enrich_within(recipe: Recipe, url: str, deadline: Deadline | None) -> None:
+    """Parse the recipe's ingredients, unless the deadline can't cover it."""
+    from app.parser.ingredients import enrich_recipe
+
+    enrich_cost = len(recipe.ingredients) * _ENRICH_SECONDS_PER_INGREDIENT
+    if deadline is not None and deadline.remaining() < enrich_cost:
+        logger.info("Not enough time left to parse ingredients for %s", url)
+        return
+    with profiling.stage("ingredient parsing"):
+        enrich_recipe(recipe, deadline)
+
+
+async def _stream_page(
+    client: httpx.AsyncClient, url: str, parse: bool = True
+) -> tuple[httpx.Response, bytes, str, "StreamingScan | None"]:
+    """GET a page, refusing it as soon as it's known to be too big.
+
+    A page is refused on its Content-Length or, failing that, once the bytes
+    received pass memory.MAX_HTML_BYTES, without downloading the rest. With
+    `parse`, the body is also parsed as it arrives.
+
+    Returns the response, its body, the decoded HTML and the finished scan
+    (None without `parse`).
+    """
+    async with client.stream("GET", url) as response:
+        response.raise_for_status()
+        length = response.headers.get("Content-Length", "")
+        if length.isdigit():
+            # The compressed size, when compressed, which is never more
+            _check_size(int(length), url)
+        encoding = response.encoding or "utf-8"
+        scan = None
+        if parse:
+            from app.parser.streaming import StreamingScan
+
+            scan = StreamingScan(encoding)
+        chunks = []
+        received = 0
+        async for chunk in response.aiter_bytes():
+            received += len(chunk)
+            _check_size(received, url)
+            chunks.append(chunk)
+            if scan is not None:
+                scan.feed(chunk)
+    body = b"".join(chunks)
+    if scan is None:
+        # Decoded the way httpx's Response.text does
+        return response, body, body.decode(encoding, errors="replace"), None
+    return response, body, scan.close(), scan
+
+
+def _check_size(nbytes: int, url: str) -> None:
+    """Refuse pages over memory.MAX_HTML_BYTES, before any tier parses them."""
+    if nbytes > memory.MAX_HTML_BYTES:
+        logger.warning("Page over %d bytes: %s", memory.MAX_HTML_BYTES, url)
+        raise ParseError(
+            "too_large", "That page is too big to read. Try the recipe's print view."
+        )
+
+
+async def _archive_response(url: str, response: httpx.Response, body: bytes) -> None:
+    try:
+        await asyncio.to_thread(
+            archive.archive_response, archive.ARCHIVE_DIR, url, response, body
+        )
+    except OSError:
+        # The archive is best-effort; never fail a request over it.
+        logger.warning("Failed to archive %s", url, exc_info=True)
+
+
+def _reuse_recipe(known: Recipe, url: str) -> Recipe:
+    """Serve a recipe already parsed from the same content at another URL."""
+    logger.debug("Content of %s matches %s; skipping extraction", url, known.source_url)
+    request_log.annotate(cache="content")
+    recipe = known.model_copy(update={"source_url": url})
+    _cache_recipe(url, recipe)
     return recipe
+
+
+def _cache_recipe(key: str, recipe: Recipe) -> None:
+    _recipe_cache[key] = recipe
+    _cached_at[key] = time.time()
@@ -0,0 +1,228 @@
+"""Opt-in profiling of slow recipe parses.
+
+Enabled by ``RECIPE_PROFILE_THRESHOLD`` (seconds) and/or
+``RECIPE_PROFILE_SAMPLE_RATE`` (0-1). The sample rate picks which parses are
+profiled (all of them if only a threshold is set); the threshold picks which
+of those are kept (all of them if only a sample rate is set). cProfile roughly
+doubles extraction time, so set a sample rate on busy instances.
+
+Stage timings, the winning tier and the page size also go to the request's
+log record (app/request_log.py), profiled or not.
+
+A profiled parse records how long each stage took (DNS lookup, download,
+parser warm-up, each tier, ingredient parsing) and runs extraction — the tiers
+and ingredient parsing, which run synchronously on the event loop — under
+cProfile. Stages that await or run in worker threads are timed but not
+profiled, so concurrent requests don't show up in each other's profiles.
+
+Captures are kept in memory (the latest ``MAX_CAPTURES``) for the /admin routes
+and, if ``RECIPE_PROFILE_DIR`` is set, written there as ``<id>.prof`` (pstats
+format, for ``python -m pstats`` or snakeviz) and ``<id>.json`` (metadata).
+"""
+
+import asyncio
+import cProfile
+import io
+import logging
+import marshal
+import os
+import pstats
+import random
+import secrets
+import time
+from collections.abc import AsyncIterator, Iterator
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from datetime import UTC, datetime
+from pathlib import Path
+
+from pydantic import BaseModel
+
+from app import request_log
+from app.models import ParseError
+
+logger = logging.getLogger(__name__)
+
+
+def _env_float(name: str) -> float | None:
+    value = os.environ.get(name)
+    return float(value) if value else None
+
+
+PROFILE_THRESHOLD = _env_float("RECIPE_PROFILE_THRESHOLD")
+PROFILE_SAMPLE_RATE = _env_float("RECIPE_PROFILE_SAMPLE_RATE")
+PROFILE_DIR = (
+    Path(os.environ["RECIPE_PROFILE_DIR"])
+    if os.environ.get("RECIPE_PROFILE_DIR")
+    else None
+)
+MAX_CAPTURES = 50
+
+
+class ProfileCapture(BaseModel):
+    """What a profiled parse fetched, which tier won and where the time went."""
+
+    id: str
+    url: str
+    captured_at: datetime
+    total_seconds: float
+    stages: dict[str, float]
+    tier: str | None = None
+    html_bytes: int | None = None
+    error_type: str | None = None
+
+
+class _Trace:
+    """Timings and profile of the parse running in the current context."""
+
+    def __init__(self) -> None:
+        self.start = time.perf_counter()
+        self.stages: dict[str, float] = {}
+        self.tier: str | None = None
+        self.html_bytes: int | None = None
+        self.profile: cProfile.Profile | None = None
+
+
+_current: ContextVar[_Trace | None] = ContextVar("profile_trace", default=None)
+
+# Capture id -> (metadata, profile), oldest first
+_captures: dict[str, tuple[ProfileCapture, cProfile.Profile | None]] = {}
+
+
+def enabled() -> bool:
+    return PROFILE_THRESHOLD is not None or PROFILE_SAMPLE_RATE is not None
+
+
+@asynccontextmanager
+async def capture(url: str) -> AsyncIterator[None]:
+    """Profile the parse of `url` in this block, if it's sampled."""
+    rate = 1.0 if PROFILE_SAMPLE_RATE is None else PROFILE_SAMPLE_RATE
+    if not enabled() or random.random() >= rate:
+        yield
+        return
+
+    trace = _Trace()
+    token = _current.set(trace)
+    try:
+        yield
+    except ParseError as e:
+        await _finish(trace, url, e.error_type)
+        raise
+    else:
+        await _finish(trace, url, None)
+    finally:
+        _current.reset(token)
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """Time a stage of the current parse, for its log record and profile."""
+    trace = _current.get()
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        request_log.add_timing(name, elapsed)
+        if trace is not None:
+            trace.stages[name] = trace.stages.get(name, 0.0) + elapsed
+
+
+@contextmanager
+def profiled() -> Iterator[None]:
+    """Run synchronous work of the current profiled parse under cProfile."""
+    trace = _current.get()
+    if trace is None:
+        yield
+        return
+    profile = trace.profile or cProfile.Profile()
+    try:
+        profile.enable()
+    except ValueError:
+        # Another profiler (or a debugger's) is active on this thread
+        logger.debug("Could not start cProfile", exc_info=True)
+        yield
+        return
+    try:
+        yield
+    finally:
+        profile.disable()
+        trace.profile = profile
+
+
+def annotate(tier: str | None = None, html_bytes: int | None = None) -> None:
+    """Record the winning tier or the page size for the current parse."""
+    if tier is not None:
+        request_log.annotate(tier=tier)
+    if html_bytes is not None:
+        request_log.annotate(html_bytes=html_bytes)
+    trace = _current.get()
+    if trace is None:
+        return
+    if tier is not None:
+        trace.tier = tier
+    if html_bytes is not None:
+        trace.html_bytes = html_bytes
+
+
+def captures() -> list[ProfileCapture]:
+    """Captures held in memory, newest first."""
+    return [meta for meta, _ in reversed(_captures.values())]
+
+
+def profile_data(capture_id: str) -> bytes | None:
+    """A capture's profile in pstats format, or None if there isn't one."""
+    _, profile = _captures.get(capture_id, (None, None))
+    return _dump(profile) if profile is not None else None
+
+
+def profile_summary(capture_id: str, limit: int = 40) -> str | None:
+    """The top `limit` functions of a capture by cumulative time, as text."""
+    _, profile = _captures.get(capture_id, (None, None))
+    if profile is None:
+        return None
+    out = io.StringIO()
+    pstats.Stats(profile, stream=out).sort_stats("cumulative").print_stats(limit)
+    return out.getvalue()
+
+
+async def _finish(trace: _Trace, url: str, error_type: str | None) -> None:
+    total = time.perf_counter() - trace.start
+    if total < (PROFILE_THRESHOLD or 0.0):
+        return
+    now = datetime.now(UTC)
+    meta = ProfileCapture(
+        id=f"{now:%Y%m%dT%H%M%S}-{secrets.token_hex(4)}",
+        url=url,
+        captured_at=now,
+        total_seconds=round(total, 4),
+        stages={name: round(t, 4) for name, t in trace.stages.items()},
+        tier=trace.tier,
+        html_bytes=trace.html_bytes,
+        error_type=error_type,
+    )
+    _captures[meta.id] = (meta, trace.profile)
+    while len(_captures) > MAX_CAPTURES:
+        del _captures[next(iter(_captures))]
+    logger.info("Captured profile %s for %s (%.2fs)", meta.id, url, total)
+
+    if PROFILE_DIR is not None:
+        try:
+            await asyncio.to_thread(_write, PROFILE_DIR, meta, trace.profile)
+        except OSError:
+            logger.warning("Failed to write profile %s", meta.id, exc_info=True)
+
+
+def _dump(profile: cProfile.Profile) -> bytes:
+    # The format of Profile.dump_stats(), without going through a file
+    profile.create_stats()
+    return marshal.dumps(profile.stats)
+
+
+def _write(
+    directory: Path, meta: ProfileCapture, profile: cProfile.Profile | None
+) -> None:
+    directory.mkdir(parents=True, exist_ok=True)
+    if profile is not None:
+        (directory / f"{meta.id}.prof").write_bytes(_dump(profile))
+    (directory / f"{meta.id}.json").write_text(meta.model_dump_json(indent=2))
@@ -0,0 +1,135 @@
+"""Rebuild recipes from the page archive with the current parser, offline.
+
+Runs the extraction tiers and ingredient enrichment over every page in the
+archive (see ``app.parser.archive``) in a process pool, without any network
+traffic. From the command line it only reports how each page parsed, which is
+useful for checking a parser change against real pages: a separate process
+can't reach the server's caches. To also refresh the recipe cache, have the
+server run it with ``POST /admin/reparse``, which calls refresh_cache() with
+the results.
+
+The pool's worker processes are spawned, not forked, so it's safe to start from
+the server's threads; each loads every tier, so the server starts only
+``RECIPE_REPARSE_WORKERS`` of them (default 2).
+
+Usage:
+    python -m app.parser.reparse [--archive DIR] [--workers N]
+"""
+
+import argparse
+import logging
+import multiprocessing
+import os
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import NamedTuple
+
+from app.models import ParseError, Recipe
+from app.parser import archive, pipeline
+
+logger = logging.getLogger(__name__)
+
+REPARSE_WORKERS = int(os.environ.get("RECIPE_REPARSE_WORKERS") or 2)
+
+
+class ReparseReport(NamedTuple):
+    recipes: dict[str, Recipe]
+    tiers: dict[str, str]
+    failures: dict[str, str]
+    # URL -> SHA-256 of the archived body the recipe came from
+    body_hashes: dict[str, str]
+
+
+def reparse_archive(directory: Path, workers: int | None = None) -> ReparseReport:
+    """Reparse every archived page. Blocking; the caches aren't touched.
+
+    `workers` defaults to REPARSE_WORKERS; with 1 the pages are parsed in this
+    process.
+    """
+    pages = list(archive.iter_pages(directory))
+    workers = workers or REPARSE_WORKERS
+    if workers == 1:
+        pipeline.warm_up()
+        results = [_reparse_page(directory, page) for page in pages]
+    else:
+        with ProcessPoolExecutor(
+            workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=pipeline.warm_up,
+        ) as pool:
+            results = list(
+                pool.map(_reparse_page, [directory] * len(pages), pages, chunksize=4)
+            )
+
+    report = ReparseReport({}, {}, {}, {})
+    for page, (recipe, outcome) in zip(pages, results, strict=True):
+        if recipe is None:
+            report.failures[page.url] = outcome
+            continue
+        report.recipes[page.url] = recipe
+        report.tiers[page.url] = outcome
+        report.body_hashes[page.url] = page.body_sha256
+    logger.info(
+        "Reparsed %d archived pages: %d recipes, %d failures",
+        len(pages),
+        len(report.recipes),
+        len(report.failures),
+    )
+    return report
+
+
+def refresh_cache(report: ReparseReport) -> None:
+    """Replace cached recipes with a reparse's results. Run on the event loop.
+
+    Everything else cached from a reparsed page (its other recipes, the
+    JSON-LD hash of the old one) is dropped, to be parsed again when asked for.
+    """
+    for url, recipe in report.recipes.items():
+        pipeline.forget(url)
+        pipeline._remember(recipe, url, [f"html:{report.body_hashes[url]}"])
+
+
+def _reparse_page(
+    directory: Path, page: archive.ArchivedPage
+) -> tuple[Recipe | None, str]:
+    """Return (recipe, tier name), or (None, reason) if the page didn't parse."""
+    try:
+        html = archive.read_body(directory, page)
+        return pipeline.extract_recipe(html, page.url)
+    except ParseError as e:
+        return None, e.message
+    except OSError as e:
+        return None, f"Unreadable archived body: {e}"
+    except Exception as e:  # noqa: BLE001 - one bad page mustn't end the job
+        return None, f"{type(e).__name__}: {e}"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--archive",
+        type=Path,
+        default=archive.ARCHIVE_DIR,
+        required=archive.ARCHIVE_DIR is None,
+        help="archive directory (default: $RECIPE_ARCHIVE_DIR)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count(),
+        help="worker processes (default: the CPU count)",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING, format="%(message)s")
+    report = reparse_archive(args.archive, args.workers)
+    for tier, count in sorted(Counter(report.tiers.values()).items()):
+        print(f"{tier}: {count}")
+    print(f"Failed: {len(report.failures)}")
+    for url, reason in sorted(report.failures.items()):
+        print(f"  {url}: {reason}")
+
+
+if __name__ == "__main__":
+    main()
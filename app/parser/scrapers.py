@@ -1,60 +1,99 @@
 """Tier 2: Extract recipe using the recipe-scrapers library."""
 
 import logging
+from functools import lru_cache
+from typing import TYPE_CHECKING
+from urllib.parse import urlsplit
 
-from recipe_scrapers import scrape_html
+from recipe_scrapers import SCRAPERS, AbstractScraper, scrape_html
 
 from app.models import Recipe
+from app.parser.soup import share_soup
+
+if TYPE_CHECKING:
+    from app.parser.tiers import Page
 
 logger = logging.getLogger(__name__)
 
+# Without any JSON-LD or microdata, recipe-scrapers' generic schema.org scraper
+# has nothing to read, so it isn't worth building for unsupported sites.
+_STRUCTURED_DATA_MARKERS = ("application/ld+json", "itemscope", "itemtype")
+
+# Accessors read after a scraper is built: the two that decide whether the page
+# has a recipe, then the optional metadata.
+_CORE_FIELDS = ("ingredients", "instructions")
+_METADATA_FIELDS = ("title", "yields", "image", "prep_time", "cook_time")
+
+
+def extract_page(page: "Page") -> Recipe | None:
+    """Tier 2 for the registry."""
+    return extract_with_scraper(page.url, page.html)
+
 
 def extract_with_scraper(url: str, html: str) -> Recipe | None:
     """Try to extract a Recipe using recipe-scrapers."""
-    try:
-        scraper = scrape_html(html, org_url=url, supported_only=False)
-    except Exception:
-        logger.debug("recipe-scrapers failed to initialize", exc_info=True)
+    scraper = _build_scraper(url, html)
+    if scraper is None:
         return None
+    share_soup(html, scraper.soup)
 
-    try:
-        ingredients = scraper.ingredients()
-    except Exception:
-        logger.debug("recipe-scrapers failed to extract ingredients", exc_info=True)
-        ingredients = []
-
-    try:
-        instructions = scraper.instructions()
-    except Exception:
-        logger.debug("recipe-scrapers failed to extract instructions", exc_info=True)
-        instructions = ""
-
-    steps = [s.strip() for s in instructions.split("\n") if s.strip()]
+    fields = _read_fields(scraper, _CORE_FIELDS)
+    ingredients = fields["ingredients"] or []
+    steps = [s.strip() for s in (fields["instructions"] or "").split("\n") if s.strip()]
 
     if not ingredients and not steps:
         logger.debug("recipe-scrapers found no ingredients or steps")
         return None
 
-    def _safe_get(method):
-        try:
-            val = method()
-            return val if val else None
-        except Exception:
-            return None
-
-    title = _safe_get(scraper.title) or "Untitled Recipe"
-    servings = _safe_get(scraper.yields)
-    image = _safe_get(scraper.image)
-    prep_time = _safe_get(scraper.prep_time)
-    cook_time = _safe_get(scraper.cook_time)
+    fields = _read_fields(scraper, _METADATA_FIELDS)
+    servings = fields["yields"]
+    prep_time = fields["prep_time"]
+    cook_time = fields["cook_time"]
 
     return Recipe(
-        title=title,
+        title=fields["title"] or "Untitled Recipe",
         source_url=url,
         servings=str(servings) if servings else None,
         prep_time=f"{prep_time}m" if isinstance(prep_time, int) else prep_time,
         cook_time=f"{cook_time}m" if isinstance(cook_time, int) else cook_time,
-        image_url=image,
+        image_url=fields["image"],
         ingredients=ingredients,
         steps=steps,
     )
+
+
+def _build_scraper(url: str, html: str) -> AbstractScraper | None:
+    scraper_cls = scraper_class_for(urlsplit(url).hostname or "")
+    if scraper_cls is None and not _has_structured_data(html):
+        logger.debug("No site scraper and no structured data for %s", url)
+        return None
+    try:
+        if scraper_cls is not None:
+            return scraper_cls(html=html, url=url)
+        return scrape_html(html, org_url=url, supported_only=False)
+    except Exception:
+        logger.debug("recipe-scrapers failed to initialize", exc_info=True)
+        return None
+
+
+def _has_structured_data(html: str) -> bool:
+    lowered = html.lower()
+    return any(marker in lowered for marker in _STRUCTURED_DATA_MARKERS)
+
+
+@lru_cache(maxsize=1024)
+def scraper_class_for(hostname: str) -> type[AbstractScraper] | None:
+    """The site-specific scraper class for a hostname, if recipe-scrapers has one."""
+    return SCRAPERS.get(hostname.lower().removeprefix("www."))
+
+
+def _read_fields(scraper: AbstractScraper, names: tuple[str, ...]) -> dict:
+    """Call each named accessor once; failed or empty values become None."""
+    values = {}
+    for name in names:
+        try:
+            values[name] = getattr(scraper, name)() or None
+        except Exception:
+            logger.debug("recipe-scrapers failed to extract %s", name, exc_info=True)
+            values[name] = None
+    return values
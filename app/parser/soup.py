@@ -0,0 +1,70 @@
+"""Share one parsed BeautifulSoup tree between the tiers that read a page.
+
+Inside a ``shared_soup()`` block, ``parse_html(html)`` builds the tree once and
+returns the same object to every caller; tiers that already have a tree for
+the page (e.g. from recipe-scrapers) can hand it over with ``share_soup``.
+Outside the context each call parses afresh, so trees are never kept alive
+past the extraction they belong to. Shared trees must be treated as
+read-only.
+
+A tree is full of reference cycles (parents and siblings point at each other),
+so dropping it leaves it to the cyclic garbage collector, which can let a few
+trees of large pages pile up. Shared trees are taken apart with
+``decompose()`` instead: by ``release()`` once no tier needs the tree, and on
+leaving the block.
+"""
+
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from bs4 import BeautifulSoup
+
+_shared: ContextVar[dict[str, BeautifulSoup] | None] = ContextVar(
+    "shared_soup", default=None
+)
+
+
+@contextmanager
+def shared_soup() -> Iterator[None]:
+    """Reuse parsed trees for the same HTML until the block exits."""
+    shared: dict[str, BeautifulSoup] = {}
+    token = _shared.set(shared)
+    try:
+        yield
+    finally:
+        _shared.reset(token)
+        for soup in shared.values():
+            soup.decompose()
+
+
+def parse_html(html: str) -> BeautifulSoup:
+    """Parse HTML with the stdlib parser, reusing a shared tree if there is one."""
+    shared = _shared.get()
+    if shared is None:
+        return BeautifulSoup(html, "html.parser")
+    soup = shared.get(html)
+    if soup is None:
+        soup = shared[html] = BeautifulSoup(html, "html.parser")
+    return soup
+
+
+def is_parsed(html: str) -> bool:
+    """Whether a shared tree for `html` has been built in this block."""
+    shared = _shared.get()
+    return shared is not None and html in shared
+
+
+def share_soup(html: str, soup: BeautifulSoup) -> None:
+    """Offer an already-parsed ``html.parser`` tree for reuse."""
+    shared = _shared.get()
+    if shared is not None:
+        shared.setdefault(html, soup)
+
+
+def release(html: str) -> None:
+    """Free the shared tree for `html`, if there is one; no tier may hold it."""
+    shared = _shared.get()
+    soup = shared.pop(html, None) if shared is not None else None
+    if soup is not None:
+        soup.decompose()
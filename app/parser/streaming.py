@@ -0,0 +1,150 @@
+"""Parse a page while it downloads, collecting what the extraction tiers read.
+
+A ``StreamingScan`` is fed the response body chunk by chunk. It runs lxml's
+incremental HTML parser over each chunk as it arrives and keeps:
+
+* the contents of JSON-LD scripts, for Tier 1 without re-parsing the page,
+* whether the page has a microdata Recipe scope, in which case Tier 1 still
+  needs extruct,
+* heuristic label, list and title candidates, for Tier 3 without building a
+  BeautifulSoup tree.
+
+Tier 2 (recipe-scrapers) still reads the full HTML, which ``close()`` returns.
+lxml repairs broken markup differently from ``html.parser``, so on badly
+nested pages Tier 3 can pick a different list than a non-streaming parse.
+"""
+
+import codecs
+import logging
+
+from lxml import etree
+
+from app.models import Recipe
+from app.parser.heuristic import (
+    _LABEL_TAGS,
+    _LIST_TAGS,
+    PageScan,
+    heuristic_recipe,
+)
+from app.parser.structured import extract_all_from_html, extract_all_from_jsonld
+
+logger = logging.getLogger(__name__)
+
+_JSONLD_TYPE = "application/ld+json"
+# Elements the scan reads. lxml only reports events for these, which keeps the
+# per-element Python work off every other tag on the page.
+_SCANNED_TAGS = (*_LABEL_TAGS, *_LIST_TAGS, "p", "meta", "title", "script")
+_TEXT_NODES = etree.XPath("descendant::text()")
+_MICRODATA_RECIPE = etree.XPath('boolean(//*[contains(@itemtype, "Recipe")])')
+
+
+class StreamingScan:
+    """Incrementally parse an HTML body, keeping what the tiers need."""
+
+    def __init__(self, encoding: str = "utf-8") -> None:
+        # Decode the way httpx's Response.text does, so the HTML handed to
+        # Tier 2 and the content hashes match a non-streaming fetch.
+        self._decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+        self._parser = etree.HTMLPullParser(events=("start", "end"), tag=_SCANNED_TAGS)
+        self._text: list[str] = []
+        # Open scanned elements: (tag, document position for <p>, otherwise
+        # the element's slot in page.labels or page.lists)
+        self._open: list[tuple[str, int]] = []
+        self._position = 0
+        self.jsonld: list[str] = []
+        self.microdata_recipe = False
+        self.page = PageScan()
+
+    def feed(self, chunk: bytes) -> None:
+        """Parse the next chunk of the response body."""
+        self._feed_text(self._decoder.decode(chunk))
+
+    def close(self) -> str:
+        """Finish parsing and return the decoded HTML."""
+        self._feed_text(self._decoder.decode(b"", final=True))
+        try:
+            root = self._parser.close()
+        except etree.XMLSyntaxError:
+            logger.debug("lxml could not finish parsing the page", exc_info=True)
+        else:
+            self.microdata_recipe = _MICRODATA_RECIPE(root)
+        self._handle_events()
+        return "".join(self._text)
+
+    def structured_recipe(self, html: str, url: str) -> Recipe | None:
+        """Tier 1 from the collected JSON-LD, falling back to extruct if needed."""
+        recipes = self.structured_recipes(html, url)
+        return recipes[0] if recipes else None
+
+    def structured_recipes(self, html: str, url: str) -> list[Recipe]:
+        """structured_recipe, returning every recipe on the page."""
+        try:
+            recipes = extract_all_from_jsonld(self.jsonld, url)
+        except ValueError:
+            logger.debug("Malformed JSON-LD; falling back to extruct")
+            return extract_all_from_html(html, url)
+        if not recipes and self.microdata_recipe:
+            return extract_all_from_html(html, url)
+        return recipes
+
+    def heuristic_recipe(self, url: str) -> Recipe | None:
+        """Tier 3 from the collected label, list and title candidates."""
+        return heuristic_recipe(self.page, url)
+
+    def _feed_text(self, text: str) -> None:
+        if not text:
+            return
+        self._text.append(text)
+        self._parser.feed(text)
+        self._handle_events()
+
+    def _handle_events(self) -> None:
+        page = self.page
+        for event, el in self._parser.read_events():
+            tag = el.tag
+            if event == "start":
+                self._start(tag, el)
+                continue
+
+            _, slot = self._open.pop()
+            if tag in _LABEL_TAGS:
+                text = _text(el)
+                page.labels[slot] = (text, page.labels[slot][1])
+                if tag == "h1" and page.h1_text is None:
+                    page.h1_text = text
+            elif tag in _LIST_TAGS:
+                page.lists[slot] = [_text(li) for li in el.iter("li")]
+            elif tag == "title" and page.title_text is None:
+                page.title_text = _text(el)
+            elif tag == "script" and el.get("type") == _JSONLD_TYPE:
+                self.jsonld.append(el.text or "")
+
+    def _start(self, tag: str, el: etree._Element) -> None:
+        page = self.page
+        position = self._position
+        self._position += 1
+        slot = -1
+        if tag in _LABEL_TAGS:
+            # The label might be inside a <p> wrapper — look from the parent,
+            # which is then the innermost open scanned element
+            parent = el.getparent()
+            if parent is not None and parent.tag == "p":
+                search_from = self._open[-1][1]
+            else:
+                search_from = position
+            # Labels keep document order; the text is filled in at the end tag
+            slot = len(page.labels)
+            page.labels.append(("", search_from))
+        elif tag in _LIST_TAGS:
+            slot = len(page.lists)
+            page.list_positions.append(position)
+            page.lists.append([])
+        elif tag == "meta":
+            if page.og_title is None and el.get("property") == "og:title":
+                page.og_title = el.get("content", "")
+        self._open.append((tag, position if tag == "p" else slot))
+
+
+def _text(el: etree._Element) -> str:
+    """Element text joined from stripped pieces, like bs4's get_text(strip=True)."""
+    return "".join(piece.strip() for piece in _TEXT_NODES(el))
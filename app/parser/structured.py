@@ -1,29 +1,117 @@
 """Tier 1: Extract recipe from Schema.org structured data via extruct."""
 
+import hashlib
+import json
 import logging
+import re
+from typing import TYPE_CHECKING
 
 import extruct
 
 from app.models import Recipe
 
+if TYPE_CHECKING:
+    from app.parser.tiers import Page
+
 logger = logging.getLogger(__name__)
 
+_JSONLD_SCRIPT_RE = re.compile(
+    r"<script[^>]*type=[\"']?application/ld\+json[\"']?[^>]*>(.*?)</script>",
+    re.IGNORECASE | re.DOTALL,
+)
+# Keys that identify the page a Recipe block was published on rather than the
+# recipe itself; they differ between syndicated copies of the same recipe.
+_PAGE_IDENTITY_KEYS = {"@id", "url", "mainEntityOfPage"}
+
+
+def extract_page(page: "Page") -> list[Recipe]:
+    """Tier 1 for the registry: every Recipe in the page's structured data.
+
+    Reads the JSON-LD blocks the pipeline already found for content hashing,
+    and only runs extruct (which parses the whole page) when they hold no
+    recipe or don't parse as strict JSON, e.g. for microdata.
+    """
+    if page.scan is not None:
+        return page.scan.structured_recipes(page.html, page.url)
+    try:
+        recipes = extract_all_from_jsonld(page.jsonld, page.url)
+    except ValueError:
+        logger.debug("Malformed JSON-LD; falling back to extruct")
+        recipes = []
+    return recipes or extract_all_from_html(page.html, page.url)
+
 
 def extract_from_html(html: str, url: str) -> Recipe | None:
     """Try to extract a Recipe from structured data in HTML."""
+    recipes = extract_all_from_html(html, url)
+    return recipes[0] if recipes else None
+
+
+def extract_all_from_html(html: str, url: str) -> list[Recipe]:
+    """Every Recipe in the page's structured data, in page order.
+
+    Roundups and pages with sub-recipes (a sauce and a main) carry several.
+    """
     data = extruct.extract(html, base_url=url, syntaxes=["json-ld", "microdata"])
+    return _recipes_from_data(data, url)
+
+
+def extract_from_jsonld(blocks: list[str], url: str) -> Recipe | None:
+    """Extract a Recipe from the contents of a page's JSON-LD scripts.
+
+    For callers that already have the script texts, so the page isn't parsed
+    again. Raises ValueError for a block that isn't valid JSON; extruct is more
+    lenient with those (it strips leading comments), so fall back to
+    extract_from_html.
+    """
+    recipes = extract_all_from_jsonld(blocks, url)
+    return recipes[0] if recipes else None
+
+
+def extract_all_from_jsonld(blocks: list[str], url: str) -> list[Recipe]:
+    """extract_from_jsonld, returning every Recipe in the blocks."""
+    items: list = []
+    for block in blocks:
+        data = json.loads(block, strict=False)
+        if isinstance(data, list):
+            items.extend(item for item in data if item)
+        elif isinstance(data, dict) and data:
+            items.append(data)
+    return _recipes_from_data({"json-ld": items}, url)
+
 
-    recipe_obj = _find_recipe_objects(data.get("json-ld", []))
+def _recipes_from_data(data: dict, url: str) -> list[Recipe]:
+    recipe_objs = _find_recipe_objects(data.get("json-ld", []))
     source = "json-ld"
-    if recipe_obj is None:
-        recipe_obj = _find_recipe_objects(data.get("microdata", []))
+    if not recipe_objs:
+        recipe_objs = _find_recipe_objects(data.get("microdata", []))
         source = "microdata"
-    if recipe_obj is None:
+    if not recipe_objs:
         logger.debug("No structured recipe data found")
-        return None
+        return []
+
+    logger.debug("Found %d recipe(s) via %s", len(recipe_objs), source)
+    recipes = []
+    # The same recipe is often published twice, e.g. in two script blocks
+    seen = set()
+    for recipe_obj in recipe_objs:
+        # One malformed recipe (a list for a name, a nested image URL list)
+        # mustn't cost the page its other recipes
+        try:
+            recipe = _recipe_from_object(recipe_obj, url)
+        except (ValueError, TypeError, AttributeError):  # incl. ValidationError
+            logger.debug("Skipping malformed structured recipe on %s", url)
+            continue
+        if recipe is None:
+            continue
+        identity = (recipe.title, tuple(recipe.ingredients), tuple(recipe.steps))
+        if identity not in seen:
+            seen.add(identity)
+            recipes.append(recipe)
+    return recipes
 
-    logger.debug("Found recipe via %s", source)
 
+def _recipe_from_object(recipe_obj: dict, url: str) -> Recipe | None:
     ingredients = recipe_obj.get("recipeIngredient", [])
     steps = _normalize_instructions(recipe_obj.get("recipeInstructions", []))
 
@@ -57,26 +145,75 @@ def extract_from_html(html: str, url: str) -> Recipe | None:
     )
 
 
-def _find_recipe_objects(data: list[dict]) -> dict | None:
-    """Find a Recipe object in a list of JSON-LD or microdata items."""
+def recipe_jsonld_hash(html: str) -> str | None:
+    """Hash the page's JSON-LD Recipe block, ignoring page-specific keys.
+
+    A cheap scan that doesn't run extruct, so pages carrying the same recipe
+    can be recognized before any extraction tier runs. Returns None if there
+    is no parseable JSON-LD Recipe.
+    """
+    return jsonld_blocks_hash(jsonld_blocks(html))
+
+
+def jsonld_blocks(html: str) -> list[str]:
+    """Contents of the page's JSON-LD script blocks, found without parsing it."""
+    return _JSONLD_SCRIPT_RE.findall(html)
+
+
+def jsonld_blocks_hash(blocks: list[str]) -> str | None:
+    """recipe_jsonld_hash for JSON-LD script contents that were already found."""
+    items: list[dict] = []
+    for block in blocks:
+        try:
+            data = json.loads(block)
+        except ValueError:
+            continue
+        items.extend(
+            item
+            for item in (data if isinstance(data, list) else [data])
+            if isinstance(item, dict)
+        )
+    try:
+        recipe_objs = _find_recipe_objects(items)
+    except (AttributeError, TypeError):  # malformed @graph or @type
+        return None
+    if not recipe_objs:
+        return None
+    content = [
+        {k: v for k, v in recipe_obj.items() if k not in _PAGE_IDENTITY_KEYS}
+        for recipe_obj in recipe_objs
+    ]
+    canonical = json.dumps(content, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def _find_recipe_objects(data: list[dict]) -> list[dict]:
+    """Find the Recipe objects in a list of JSON-LD or microdata items.
+
+    Looks at the items themselves, inside @graph arrays, and in the elements
+    of ItemLists (how roundup pages usually list their recipes).
+    """
+    found = []
     for item in data:
-        # Direct Recipe type
-        item_type = item.get("@type", "")
-        if isinstance(item_type, list):
-            item_type = " ".join(item_type)
-        if "Recipe" in item_type:
-            return item
-
-        # Check inside @graph arrays
-        graph = item.get("@graph", [])
-        for node in graph:
-            node_type = node.get("@type", "")
-            if isinstance(node_type, list):
-                node_type = " ".join(node_type)
+        for node in (item, *item.get("@graph", [])):
+            node_type = _type_of(node)
             if "Recipe" in node_type:
-                return node
+                found.append(node)
+            elif "ItemList" in node_type:
+                for element in node.get("itemListElement", []):
+                    # Either the Recipe itself or a ListItem wrapping it
+                    if isinstance(element, dict):
+                        element = element.get("item", element)
+                    if isinstance(element, dict) and "Recipe" in _type_of(element):
+                        found.append(element)
+    return found
+
 
-    return None
+def _type_of(node: dict) -> str:
+    node_type = node.get("@type", "")
+    if isinstance(node_type, list):
+        node_type = " ".join(node_type)
+    return node_type
 
 
 def _normalize_instructions(raw) -> list[str]:
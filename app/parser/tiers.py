@@ -0,0 +1,209 @@
+"""Registry of extraction tiers.
+
+A tier is a function taking a ``Page`` and returning the recipes it found
+(a list, a single Recipe, or None). Each registered tier declares what it
+reads (``Input``), whether it's cheap or has to parse the page (``Cost``),
+whether it's a coroutine function, and whether it can read a StreamingScan
+instead. The pipeline runs tiers in registration order and stops at the first
+that finds something; it uses the declarations to skip page-parsing tiers the
+deadline can't cover, to run those off the event loop, to know when a tree is
+already there to reuse, and to know which results other pages with the same
+JSON-LD can share.
+
+Tier functions are registered as ``"module:function"`` and imported on first
+use (or by warm_up()), so registering one doesn't load its dependencies. New
+tiers are added with ``register()`` below, not in the pipeline.
+"""
+
+import importlib
+import inspect
+from collections.abc import Callable
+from enum import Enum
+from functools import cached_property
+from typing import TYPE_CHECKING, NamedTuple
+
+from app.models import Recipe
+
+if TYPE_CHECKING:
+    from bs4 import BeautifulSoup
+
+    from app.parser.streaming import StreamingScan
+
+SITE_TIER = "Site-specific extractor"
+STRUCTURED_TIER = "Tier 1 (structured data)"
+SCRAPERS_TIER = "Tier 2 (recipe-scrapers)"
+HEURISTIC_TIER = "Tier 3 (heuristic)"
+
+
+class Input(Enum):
+    HTML = "html"
+    # The page's BeautifulSoup tree (Page.tree)
+    TREE = "tree"
+    # Contents of the page's JSON-LD script blocks (Page.jsonld)
+    JSONLD = "jsonld"
+
+
+class Cost(Enum):
+    CHEAP = "cheap"
+    # Parses the page (or reads its tree, which takes a parse to build)
+    PARSES_PAGE = "parses_page"
+
+
+class Tier(NamedTuple):
+    name: str
+    # "module:function"
+    function: str
+    inputs: frozenset[Input]
+    cost: Cost
+    is_async: bool = False
+    # Reads a StreamingScan of the page when there is one, which is cheap
+    streamable: bool = False
+    # Finds recipes from the page's JSON-LD Recipe block alone, so another page
+    # with the same block gets the same result (see the pipeline's content index)
+    jsonld_only: bool = False
+
+
+class Page:
+    """A fetched page and what's been derived from it, shared by the tiers."""
+
+    def __init__(
+        self, html: str, url: str, scan: "StreamingScan | None" = None
+    ) -> None:
+        self.html = html
+        self.url = url
+        self.scan = scan
+
+    @cached_property
+    def jsonld(self) -> list[str]:
+        """Contents of the page's JSON-LD script blocks."""
+        if self.scan is not None:
+            return self.scan.jsonld
+        from app.parser.structured import jsonld_blocks
+
+        return jsonld_blocks(self.html)
+
+    @property
+    def tree(self) -> "BeautifulSoup":
+        """The page's tree; parsed once per extraction (see soup.shared_soup)."""
+        from app.parser.soup import parse_html
+
+        return parse_html(self.html)
+
+    def has_tree(self) -> bool:
+        """Whether a tier has already parsed the page into a shared tree."""
+        from app.parser.soup import is_parsed
+
+        return is_parsed(self.html)
+
+    def release_tree(self) -> None:
+        """Free the page's shared tree once no tier left to run reads it."""
+        from app.parser.soup import release
+
+        release(self.html)
+
+
+_tiers: list[Tier] = []
+_functions: dict[Tier, Callable] = {}
+# Tier name -> [runs, runs that found a recipe, total seconds]
+_timings: dict[str, list] = {}
+
+
+def register(
+    name: str,
+    function: str,
+    *,
+    inputs: set[Input],
+    cost: Cost,
+    is_async: bool = False,
+    streamable: bool = False,
+    jsonld_only: bool = False,
+    before: str | None = None,
+) -> Tier:
+    """Add a tier, after the others or just before the tier named `before`."""
+    if any(tier.name == name for tier in _tiers):
+        raise ValueError(f"Tier {name!r} is already registered")
+    tier = Tier(
+        name, function, frozenset(inputs), cost, is_async, streamable, jsonld_only
+    )
+    position = len(_tiers)
+    if before is not None:
+        names = [t.name for t in _tiers]
+        if before not in names:
+            raise ValueError(f"No tier named {before!r} to register {name!r} before")
+        position = names.index(before)
+    _tiers.insert(position, tier)
+    return tier
+
+
+def registered() -> list[Tier]:
+    """Registered tiers, in the order the pipeline tries them."""
+    return list(_tiers)
+
+
+def resolve(tier: Tier) -> Callable:
+    """Import a tier's function. Blocking the first time; see warm_up()."""
+    fn = _functions.get(tier)
+    if fn is None:
+        module, _, attr = tier.function.partition(":")
+        fn = getattr(importlib.import_module(module), attr)
+        if inspect.iscoroutinefunction(fn) != tier.is_async:
+            raise TypeError(f"{tier.name}: is_async doesn't match {tier.function}")
+        _functions[tier] = fn
+    return fn
+
+
+def record(name: str, seconds: float, found: bool) -> None:
+    """Count a run of a tier, for stats()."""
+    timing = _timings.setdefault(name, [0, 0, 0.0])
+    timing[0] += 1
+    timing[1] += found
+    timing[2] += seconds
+
+
+def stats() -> dict:
+    """Runs, hits and mean time (ms) of each tier that has run."""
+    return {
+        name: {
+            "runs": runs,
+            "hits": hits,
+            "mean_ms": round(total / runs * 1000, 2),
+        }
+        for name, (runs, hits, total) in _timings.items()
+    }
+
+
+def as_recipes(result: list[Recipe] | Recipe | None) -> list[Recipe]:
+    """A tier's result as a list of recipes."""
+    if result is None:
+        return []
+    return [result] if isinstance(result, Recipe) else result
+
+
+register(
+    SITE_TIER,
+    "app.parser.sites:extract_page",
+    inputs={Input.JSONLD},
+    cost=Cost.CHEAP,
+    jsonld_only=True,
+)
+register(
+    STRUCTURED_TIER,
+    "app.parser.structured:extract_page",
+    inputs={Input.HTML, Input.JSONLD},
+    cost=Cost.CHEAP,
+    streamable=True,
+    jsonld_only=True,
+)
+register(
+    SCRAPERS_TIER,
+    "app.parser.scrapers:extract_page",
+    inputs={Input.HTML},
+    cost=Cost.PARSES_PAGE,
+)
+register(
+    HEURISTIC_TIER,
+    "app.parser.heuristic:extract_page",
+    inputs={Input.TREE},
+    cost=Cost.PARSES_PAGE,
+    streamable=True,
+)
@@ -0,0 +1,192 @@
+"""Structured request logging, written off the event loop.
+
+``configure_logging()`` sends every log record through a queue to a background
+thread, which formats it as one JSON object per line and writes it to stderr.
+A slow or blocked stderr then delays that thread, not the event loop.
+
+``RequestLogMiddleware`` emits one record per HTTP request (logger
+``app.request``): method, path, status, response bytes and duration, plus what
+handlers add with ``annotate()`` and ``add_timing()`` — the recipe URL, cache
+status, winning tier, page size and per-stage timings. Every record also
+carries the process's peak resident memory so far (``max_rss_mb``), and, when
+tracemalloc is on, each tier's peak allocation (see parser/memory.py). Requests
+answered from the page or recipe cache are the bulk of the traffic, so only a
+fraction (``RECIPE_LOG_CACHE_HIT_SAMPLE_RATE``, default 0.1) of them are logged;
+those records carry ``sample_rate`` so counts can be scaled back up.
+"""
+
+import atexit
+import copy
+import json
+import logging
+import os
+import queue
+import random
+import sys
+import time
+from contextvars import ContextVar
+from datetime import UTC, datetime
+from logging.handlers import QueueHandler, QueueListener
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+logger = logging.getLogger("app.request")
+
+CACHE_HIT_SAMPLE_RATE = float(os.environ.get("RECIPE_LOG_CACHE_HIT_SAMPLE_RATE") or 0.1)
+# Values of the "cache" field that mean nothing was fetched
+_CACHE_HITS = frozenset({"page", "recipe"})
+
+# Fields of the request being handled in the current context
+_current: ContextVar[dict | None] = ContextVar("request_log", default=None)
+_listener: QueueListener | None = None
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record, with a request record's fields inlined."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": (
+                datetime.fromtimestamp(record.created, UTC).isoformat(
+                    timespec="milliseconds"
+                )
+            ),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        request = getattr(record, "request", None)
+        if request:
+            entry.update(request)
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class _QueueHandler(QueueHandler):
+    """A QueueHandler that leaves exc_info on the record for JsonFormatter.
+
+    The stock prepare() folds the traceback into the message, so it can cross
+    a process boundary; this queue stays in the process.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        # Formatted now, while the arguments still hold what was logged
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+def configure_logging(level: int = logging.INFO) -> None:
+    """Log JSON lines to stderr from a background thread. Idempotent."""
+    global _listener
+    if _listener is not None:
+        return
+    handler = logging.StreamHandler()
+    handler.setFormatter(JsonFormatter())
+    log_queue: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+    _listener = QueueListener(log_queue, handler, respect_handler_level=True)
+    _listener.start()
+    # Flush what's queued when the process exits
+    atexit.register(_listener.stop)
+    root = logging.getLogger()
+    root.setLevel(level)
+    root.addHandler(_QueueHandler(log_queue))
+
+
+def annotate(**fields) -> None:
+    """Add fields to the current request's log record, if there is one."""
+    record = _current.get()
+    if record is not None:
+        record.update(fields)
+
+
+def add_timing(stage: str, seconds: float) -> None:
+    """Add time spent in `stage` to the current request's log record."""
+    record = _current.get()
+    if record is not None:
+        timings = record.setdefault("timings_ms", {})
+        timings[stage] = round(timings.get(stage, 0.0) + seconds * 1000, 2)
+
+
+def add_memory_peak(stage: str, nbytes: int) -> None:
+    """Record the peak memory allocated in `stage` on the request's log record."""
+    record = _current.get()
+    if record is not None:
+        peaks = record.setdefault("memory_peak_kb", {})
+        peaks[stage] = max(peaks.get(stage, 0), round(nbytes / 1000))
+
+
+def max_rss_mb() -> float | None:
+    """Peak resident memory of this process so far, in MB."""
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Bytes on macOS, kilobytes elsewhere
+    return round(rss / (1_000_000 if sys.platform == "darwin" else 1000), 1)
+
+
+class RequestLogMiddleware:
+    """Log one structured record per HTTP request once the response is sent.
+
+    A pure ASGI middleware, like SecurityHeadersMiddleware: it counts body
+    bytes as they pass and doesn't buffer the response.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        record = {"method": scope["method"], "path": scope["path"]}
+        status = 500
+        sent = 0
+
+        async def send_counting(message: Message) -> None:
+            nonlocal status, sent
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                sent += len(message.get("body", b""))
+            await send(message)
+
+        token = _current.set(record)
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_counting)
+        finally:
+            _current.reset(token)
+            record["status"] = status
+            record["bytes"] = sent
+            record["duration_ms"] = round((time.perf_counter() - start) * 1000, 2)
+            record["max_rss_mb"] = max_rss_mb()
+            _emit(record)
+
+
+def _emit(record: dict) -> None:
+    if record.get("cache") in _CACHE_HITS and record["status"] < 400:
+        if random.random() >= CACHE_HIT_SAMPLE_RATE:
+            return
+        record["sample_rate"] = CACHE_HIT_SAMPLE_RATE
+    level = (
+        logging.WARNING
+        if record["status"] >= 500 or "error_type" in record
+        else logging.INFO
+    )
+    logger.log(
+        level,
+        "%s %s %d",
+        record["method"],
+        record["path"],
+        record["status"],
+        extra={"request": record},
+    )
@@ -0,0 +1,202 @@
+"""Recipe scaling and kitchen unit conversion.
+
+Scales ``ParsedIngredient`` amounts and produces ready-to-display text,
+including a friendlier equivalent measure when a scaled amount lands on an
+awkward value (e.g. ⅜ cup → "¼ cup + 2 tbsp", 12 tbsp → "¾ cup").
+"""
+
+import math
+
+from cachetools import TTLCache
+
+from app import units
+from app.models import ParsedIngredient, Recipe, ScaledIngredient
+
+# Multipliers offered by the recipe page's scale buttons.
+SCALE_OPTIONS = (0.5, 1.0, 2.0, 3.0)
+MAX_SCALE = 12.0
+
+# Display glyphs for fractional parts, matched within _FRACTION_TOLERANCE.
+_FRACTIONS = [
+    (1 / 16, "1/16"),
+    (1 / 8, "⅛"),
+    (1 / 6, "⅙"),
+    (1 / 4, "¼"),
+    (1 / 3, "⅓"),
+    (3 / 8, "⅜"),
+    (1 / 2, "½"),
+    (5 / 8, "⅝"),
+    (2 / 3, "⅔"),
+    (3 / 4, "¾"),
+    (5 / 6, "⅚"),
+    (7 / 8, "⅞"),
+]
+_FRACTION_TOLERANCE = 0.03
+
+# Fractions of a cup that aren't standard measuring cups → tbsp/tsp equivalent.
+_CUP_BREAKDOWNS = [
+    (1 / 8, "2 tbsp"),
+    (1 / 6, "2 tbsp + 2 tsp"),
+    (3 / 8, "¼ cup + 2 tbsp"),
+    (5 / 8, "½ cup + 2 tbsp"),
+    (5 / 6, "⅔ cup + 2 tbsp"),
+    (7 / 8, "¾ cup + 2 tbsp"),
+]
+
+# Standard measuring-cup fractions, used when converting tbsp up to cups.
+_STANDARD_CUP_FRACS = [
+    (1 / 4, "¼"),
+    (1 / 3, "⅓"),
+    (1 / 2, "½"),
+    (2 / 3, "⅔"),
+    (3 / 4, "¾"),
+]
+
+_TBSP_PER_CUP = round(units.CUP.base / units.TBSP.base)
+_TSP_PER_TBSP = round(units.TBSP.base / units.TSP.base)
+
+# Scaled ingredient lists, keyed by (source URL, page index, factor), so every
+# copy of a cached recipe shares one entry. Each holds the parsed ingredient
+# list it was scaled from: copies made with model_copy() share that list, and
+# a re-parse brings a new one, which replaces the entry.
+_scaled_cache: TTLCache[
+    tuple[str, int, float], tuple[list[ParsedIngredient], list[ScaledIngredient]]
+] = TTLCache(maxsize=512, ttl=30 * 60)
+
+
+def normalize_scale(value: float) -> float | None:
+    """Round a requested scale factor, or return None if it is out of range."""
+    if not math.isfinite(value) or value <= 0 or value > MAX_SCALE:
+        return None
+    return round(value, 3)
+
+
+def scale_key(factor: float) -> str:
+    """Format a scale factor the way the page's scale buttons spell it."""
+    return f"{factor:g}"
+
+
+def scale_recipe(recipe: Recipe, factor: float) -> list[ScaledIngredient] | None:
+    """Scale every parsed ingredient in a recipe, caching per (recipe, factor)."""
+    if recipe.parsed_ingredients is None:
+        return None
+    key = (recipe.source_url, recipe.page_index or 0, factor)
+    entry = _scaled_cache.get(key)
+    if entry is not None and entry[0] is recipe.parsed_ingredients:
+        return entry[1]
+    scaled = [scale_ingredient(ing, factor) for ing in recipe.parsed_ingredients]
+    _scaled_cache[key] = (recipe.parsed_ingredients, scaled)
+    return scaled
+
+
+def scale_ingredient(parsed: ParsedIngredient, factor: float) -> ScaledIngredient:
+    """Scale one ingredient and render its display text."""
+    if factor == 1 or parsed.amount is None:
+        return ScaledIngredient(text=parsed.raw)
+
+    amount = parsed.amount * factor
+    amount_max = parsed.amount_max * factor if parsed.amount_max else None
+
+    amount_text = format_fraction(amount)
+    if amount_max is not None:
+        amount_text += "-" + format_fraction(amount_max)
+    if parsed.unit:
+        amount_text += " " + units.spell(parsed.unit, amount_max or amount)
+
+    rest = [parsed.name]
+    if parsed.preparation:
+        rest.append(", " + parsed.preparation)
+    if parsed.comment:
+        rest.append(parsed.comment)
+    rest_text = " ".join(rest)
+
+    return ScaledIngredient(
+        text=f"{amount_text} {rest_text}",
+        amount_text=amount_text,
+        rest_text=rest_text,
+        conversion=convert(amount, parsed.unit),
+    )
+
+
+def convert(amount: float, unit: str | None) -> str | None:
+    """Return an easier-to-measure equivalent for an amount, if there is one."""
+    converter = _CONVERTERS.get(units.lookup(unit))
+    return converter(amount) if converter else None
+
+
+def format_fraction(n: float) -> str:
+    """Format a quantity using common kitchen fractions where possible."""
+    if n < 0.01:
+        return "0"
+
+    whole = math.floor(n)
+    decimal = n - whole
+    if decimal < 0.01:
+        return str(whole)
+
+    glyph = _match_fraction(decimal, _FRACTIONS)
+    if glyph is not None:
+        return f"{whole}{glyph}" if whole > 0 else glyph
+
+    # Fallback: round to 1 or 2 decimal places
+    rounded = _round_half_up(n * 100) / 100
+    if rounded == _round_half_up(rounded * 10) / 10:
+        return f"{rounded:.1f}"
+    return f"{rounded:.2f}"
+
+
+def _cups_to_smaller_units(amount: float) -> str | None:
+    """Break an awkward cup fraction into cups + tbsp/tsp."""
+    whole = math.floor(amount)
+    breakdown = _match_fraction(amount - whole, _CUP_BREAKDOWNS)
+    if breakdown is None or amount - whole < 0.01:
+        return None
+    if whole > 0:
+        return f"{whole} {'cup' if whole == 1 else 'cups'} + {breakdown}"
+    return breakdown
+
+
+def _tbsp_to_cups(amount: float) -> str | None:
+    """Convert tbsp up to cups, only when it lands on a standard cup measure."""
+    if amount < 4 - 0.3:  # minimum ¼ cup = 4 tbsp
+        return None
+
+    cups = amount / _TBSP_PER_CUP
+    whole = math.floor(cups)
+    frac = cups - whole
+    if frac < 0.01:
+        return f"{whole} {'cup' if whole == 1 else 'cups'}"
+
+    glyph = _match_fraction(frac, _STANDARD_CUP_FRACS)
+    if glyph is None:
+        return None
+    return f"{whole}{glyph} cups" if whole > 0 else f"{glyph} cup"
+
+
+def _tsp_to_tbsp(amount: float) -> str | None:
+    """Convert tsp up to tbsp, only for clean multiples."""
+    if amount < _TSP_PER_TBSP - 0.3:  # minimum 1 tbsp = 3 tsp
+        return None
+    tbsp = amount / _TSP_PER_TBSP
+    rounded = _round_half_up(tbsp)
+    if abs(tbsp - rounded) > 0.1:
+        return None
+    return f"{rounded} tbsp"
+
+
+_CONVERTERS = {
+    units.CUP: _cups_to_smaller_units,
+    units.TBSP: _tbsp_to_cups,
+    units.TSP: _tsp_to_tbsp,
+}
+
+
+def _match_fraction(value: float, table: list[tuple[float, str]]) -> str | None:
+    for target, label in table:
+        if abs(value - target) < _FRACTION_TOLERANCE:
+            return label
+    return None
+
+
+def _round_half_up(x: float) -> int:
+    return math.floor(x + 0.5)
@@ -0,0 +1,98 @@
+"""Compact, versioned binary codec for cached Recipe objects.
+
+Layout:
+
+    magic    4 bytes   b"JSMR"
+    version  1 byte    FORMAT_VERSION
+    flags    1 byte    bit 0 set when the payload is zlib-compressed
+    payload  ...
+
+The payload is the recipe as compact JSON (``None`` fields omitted). Both
+directions run entirely inside pydantic-core, which in benchmarks beat a
+hand-rolled struct layout whose per-string slicing has to happen in Python.
+Decoding skips ``Recipe.clean_text``: the text was cleaned when the Recipe was
+first built, and unescaping it a second time would corrupt literal entities.
+
+Compressed payloads use a preset zlib dictionary of common recipe vocabulary,
+which matters most for short recipes where there is little repetition for the
+compressor to find on its own. The dictionary is part of the format: changing
+it, or the payload encoding, requires bumping ``FORMAT_VERSION``.
+"""
+
+import struct
+import zlib
+
+from pydantic import ValidationError
+
+from app.models import Recipe
+
+FORMAT_VERSION = 1
+
+_MAGIC = b"JSMR"
+_PREAMBLE = struct.Struct("<4sBB")
+_FLAG_COMPRESSED = 0x01
+
+# Payloads smaller than this are stored uncompressed; zlib's own framing would
+# cost more than it saves.
+_COMPRESS_MIN_BYTES = 256
+
+# Preset dictionary for zlib. zlib favours matches near the end of the
+# dictionary, so the most frequent tokens come last.
+_ZDICT = (
+    "https://www. .com/recipe/ recipes/ .jpg .png minutes hours servings "
+    "preheat the oven to 350°F degrees until golden brown bake for "
+    "in a large bowl whisk together stir in add the season with to taste "
+    "over medium heat medium-high heat bring to a boil reduce heat simmer "
+    "cover and refrigerate let cool serve immediately set aside "
+    "finely chopped minced diced sliced thinly sliced grated melted softened "
+    "room temperature divided optional plus more for serving "
+    "garlic cloves onion olive oil unsalted butter all-purpose flour "
+    "granulated sugar brown sugar baking powder baking soda vanilla extract "
+    "kosher salt black pepper freshly ground eggs large egg milk water "
+    "ounces ounce pounds pound grams gram teaspoons teaspoon tablespoons "
+    'tablespoon tsp tbsp cups cup {"title":"source_url":"servings": '
+    '"prep_time":"cook_time":"image_url":"ingredients":["steps":[ '
+    '"parsed_ingredients":[{"raw":"amount":"amount_max":"unit":"name": '
+    '"preparation":"comment":'
+).encode()
+
+
+def encode_recipe(recipe: Recipe, compress: bool = True) -> bytes:
+    """Serialize a Recipe to the compact binary format."""
+    payload = recipe.model_dump_json(exclude_none=True).encode()
+
+    flags = 0
+    if compress and len(payload) >= _COMPRESS_MIN_BYTES:
+        compressor = zlib.compressobj(zdict=_ZDICT)
+        payload = compressor.compress(payload) + compressor.flush()
+        flags |= _FLAG_COMPRESSED
+
+    return _PREAMBLE.pack(_MAGIC, FORMAT_VERSION, flags) + payload
+
+
+def decode_recipe(data: bytes) -> Recipe:
+    """Deserialize a Recipe produced by ``encode_recipe``.
+
+    Raises ValueError if the data is not in a format this version understands;
+    callers holding persisted entries should treat that as a cache miss.
+    """
+    if len(data) < _PREAMBLE.size:
+        raise ValueError("Serialized recipe is truncated")
+    magic, version, flags = _PREAMBLE.unpack_from(data)
+    if magic != _MAGIC:
+        raise ValueError("Not a serialized recipe")
+    if version != FORMAT_VERSION:
+        raise ValueError(f"Unsupported recipe format version {version}")
+
+    payload = data[_PREAMBLE.size :]
+    if flags & _FLAG_COMPRESSED:
+        try:
+            decompressor = zlib.decompressobj(zdict=_ZDICT)
+            payload = decompressor.decompress(payload) + decompressor.flush()
+        except zlib.error as e:
+            raise ValueError(f"Corrupt recipe payload: {e}") from e
+
+    try:
+        return Recipe.model_validate_json(payload, context={"trusted": True})
+    except ValidationError as e:
+        raise ValueError(f"Corrupt recipe payload: {e}") from e
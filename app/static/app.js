@@ -1,3 +1,16 @@
+// Parsed ingredient data for the recipe scripts: embedded in the page, or
+// fetched after render (recipe-enrichment.js) when the server didn't wait for it
+function onRecipeData(callback) {
+    var dataEl = document.getElementById("recipe-data");
+    if (dataEl) {
+        callback(JSON.parse(dataEl.textContent), false);
+        return;
+    }
+    document.addEventListener("recipe-data", function (e) {
+        callback(e.detail, true);
+    });
+}
+
 document.addEventListener("change", function (e) {
     if (e.target.type === "checkbox" && e.target.closest(".check-item")) {
         e.target.closest(".check-item").classList.toggle("checked", e.target.checked);
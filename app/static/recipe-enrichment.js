@@ -0,0 +1,23 @@
+// Deferred enrichment — fetches the parsed ingredient data for a page that was
+// rendered before ingredient parsing finished, then hands it to the scaler and
+// linker through the "recipe-data" event
+(function () {
+    var article = document.querySelector(".recipe[data-enrichment-url]");
+    if (!article) return;
+
+    fetch(article.dataset.enrichmentUrl)
+        .then(function (resp) {
+            return resp.ok ? resp.json() : null;
+        })
+        .then(function (data) {
+            if (!data) return;
+            var toggle = document.getElementById("highlight-toggle");
+            if (toggle) toggle.hidden = false;
+            var controls = document.getElementById("scale-controls");
+            if (controls && data.scalable) controls.hidden = false;
+            document.dispatchEvent(new CustomEvent("recipe-data", { detail: data }));
+        })
+        .catch(function () {
+            // The page is still usable without scaling and highlighting
+        });
+})();
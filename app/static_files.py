@@ -0,0 +1,89 @@
+"""Static file serving with fingerprinted URLs and precompressed variants."""
+
+import hashlib
+import mimetypes
+import os
+from pathlib import Path
+from urllib.parse import parse_qs
+
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from starlette.types import Scope
+
+from app.compression import PRECOMPRESSED_SUFFIXES, negotiate_encoding
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "no-cache"
+
+_VARIANT_SUFFIXES = tuple(PRECOMPRESSED_SUFFIXES.values())
+
+
+def _fingerprint_files(directory: Path) -> dict[str, str]:
+    """Map each file under `directory` (as a relative POSIX path) to a short hash."""
+    return {
+        path.relative_to(directory).as_posix(): (
+            hashlib.sha256(path.read_bytes()).hexdigest()[:12]
+        )
+        for path in sorted(directory.rglob("*"))
+        if path.is_file() and not path.name.endswith(_VARIANT_SUFFIXES)
+    }
+
+
+class FingerprintedStaticFiles(StaticFiles):
+    """StaticFiles that marks fingerprinted URLs as immutable.
+
+    Templates link to assets via ``static_url()``, which appends ``?v=<hash>``
+    of the file's contents. Requests carrying the current hash can be cached
+    forever; anything else (old hashes, bare URLs) must revalidate, which
+    StaticFiles already answers with a 304 via its ETag/Last-Modified support.
+
+    If a ``.br`` or ``.gz`` file built by ``python -m app.compression`` sits
+    next to the requested file, it is served instead to clients that accept
+    that encoding.
+    """
+
+    def __init__(self, *, directory: Path, mount_path: str = "/static", **kwargs):
+        super().__init__(directory=directory, **kwargs)
+        self.root = Path(directory).resolve()
+        self.mount_path = mount_path.rstrip("/")
+        self.fingerprints = _fingerprint_files(self.root)
+
+    def url_for(self, path: str) -> str:
+        """Return the fingerprinted URL for a file under the static directory."""
+        version = self.fingerprints.get(path)
+        url = f"{self.mount_path}/{path}"
+        return f"{url}?v={version}" if version else url
+
+    def file_response(self, full_path, stat_result, scope: Scope, status_code=200):
+        request_headers = Headers(scope=scope)
+        available = [
+            encoding
+            for encoding, suffix in PRECOMPRESSED_SUFFIXES.items()
+            if os.path.isfile(f"{full_path}{suffix}")
+        ]
+        encoding = negotiate_encoding(
+            request_headers.get("accept-encoding", ""), available
+        )
+        if encoding is None:
+            response = super().file_response(full_path, stat_result, scope, status_code)
+        else:
+            variant = f"{full_path}{PRECOMPRESSED_SUFFIXES[encoding]}"
+            media_type, _ = mimetypes.guess_type(str(full_path))
+            response = FileResponse(
+                variant,
+                status_code=status_code,
+                media_type=media_type,
+                stat_result=os.stat(variant),
+                headers={"Content-Encoding": encoding, "Vary": "Accept-Encoding"},
+            )
+            if self.is_not_modified(response.headers, request_headers):
+                response = NotModifiedResponse(response.headers)
+
+        relative = Path(full_path).resolve().relative_to(self.root).as_posix()
+        requested = parse_qs(scope.get("query_string", b"").decode()).get("v")
+        if requested and requested[0] == self.fingerprints.get(relative):
+            response.headers["Cache-Control"] = IMMUTABLE_CACHE_CONTROL
+        else:
+            response.headers["Cache-Control"] = REVALIDATE_CACHE_CONTROL
+        return response
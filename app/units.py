@@ -0,0 +1,134 @@
+"""Canonical kitchen units, built once at import.
+
+Every spelling of a unit the ingredient parser produces — plurals,
+abbreviations, capitalized forms and pint's names such as ``fluid_ounce`` —
+maps to one ``Unit`` with its dimension and size in the dimension's base unit
+(millilitres for volume, grams for mass). ``Unit.name`` is the spelling stored
+on ParsedIngredient; it's the same string object for every ingredient, so
+cached recipes don't each hold their own copy of "cup". Scaled text spells it
+with ``spell()``, which uses ``Unit.plural`` for amounts above one.
+"""
+
+import sys
+from enum import Enum
+from typing import NamedTuple
+
+
+class Dimension(Enum):
+    VOLUME = "volume"
+    MASS = "mass"
+    # Things counted rather than measured (cloves, cans, pinches)
+    COUNT = "count"
+
+
+class Unit(NamedTuple):
+    name: str
+    # The name for amounts above one; the same as name for abbreviations
+    plural: str
+    dimension: Dimension
+    # Size in millilitres (VOLUME) or grams (MASS); 1 for COUNT
+    base: float
+    metric: bool
+
+
+# Canonical name, dimension, base factor, metric, other spellings. Plurals are
+# added by _spellings(), so only irregular ones are listed.
+_TABLE = [
+    ("tsp", Dimension.VOLUME, 4.92892, False, ["teaspoon", "ts"]),
+    ("tbsp", Dimension.VOLUME, 14.7868, False, ["tablespoon", "tb", "tbs", "tbl"]),
+    ("fl oz", Dimension.VOLUME, 29.5735, False, ["fluid_ounce", "floz", "fl"]),
+    ("cup", Dimension.VOLUME, 236.588, False, ["c"]),
+    ("pint", Dimension.VOLUME, 473.176, False, ["pt"]),
+    ("quart", Dimension.VOLUME, 946.353, False, ["qt"]),
+    ("gallon", Dimension.VOLUME, 3785.41, False, ["gal"]),
+    ("ml", Dimension.VOLUME, 1.0, True, ["milliliter", "millilitre", "cc"]),
+    ("cl", Dimension.VOLUME, 10.0, True, ["centiliter", "centilitre"]),
+    ("dl", Dimension.VOLUME, 100.0, True, ["deciliter", "decilitre"]),
+    ("l", Dimension.VOLUME, 1000.0, True, ["liter", "litre"]),
+    ("mg", Dimension.MASS, 0.001, True, ["milligram"]),
+    ("g", Dimension.MASS, 1.0, True, ["gram", "gm"]),
+    ("kg", Dimension.MASS, 1000.0, True, ["kilogram", "kilo"]),
+    ("oz", Dimension.MASS, 28.3495, False, ["ounce"]),
+    ("lb", Dimension.MASS, 453.592, False, ["pound", "lbs"]),
+    ("pinch", Dimension.COUNT, 1.0, False, []),
+    ("dash", Dimension.COUNT, 1.0, False, []),
+    ("clove", Dimension.COUNT, 1.0, False, []),
+    ("can", Dimension.COUNT, 1.0, False, ["tin"]),
+    ("package", Dimension.COUNT, 1.0, False, ["pack", "packet", "pkg"]),
+    ("slice", Dimension.COUNT, 1.0, False, []),
+    ("stick", Dimension.COUNT, 1.0, False, []),
+    ("sprig", Dimension.COUNT, 1.0, False, []),
+    ("bunch", Dimension.COUNT, 1.0, False, []),
+    ("head", Dimension.COUNT, 1.0, False, []),
+    ("stalk", Dimension.COUNT, 1.0, False, []),
+    ("piece", Dimension.COUNT, 1.0, False, []),
+    ("leaf", Dimension.COUNT, 1.0, False, ["leaves"]),
+]
+
+
+# Canonical names that are abbreviations, which scaled text doesn't pluralize
+_ABBREVIATIONS = frozenset(
+    {"tsp", "tbsp", "fl oz", "ml", "cl", "dl", "l", "mg", "g", "kg", "oz", "lb"}
+)
+_IRREGULAR_PLURALS = {"leaf": "leaves"}
+
+
+def _plural(word: str) -> str | None:
+    if len(word) > 2 and word.isalpha() and not word.endswith("s"):
+        return word + ("es" if word.endswith(("ch", "sh", "x")) else "s")
+    return None
+
+
+def _spellings(name: str, others: list[str]) -> set[str]:
+    spellings = set()
+    for word in [name, *others]:
+        spellings.add(word)
+        plural = _plural(word)
+        if plural is not None:
+            spellings.add(plural)
+    return spellings
+
+
+def _plural_name(name: str) -> str:
+    if name in _ABBREVIATIONS:
+        return name
+    return _IRREGULAR_PLURALS.get(name) or _plural(name) or name
+
+
+def _build() -> dict[str, Unit]:
+    units = {}
+    for name, dimension, base, metric, others in _TABLE:
+        plural = sys.intern(_plural_name(name))
+        unit = Unit(sys.intern(name), plural, dimension, base, metric)
+        for spelling in _spellings(name, others):
+            units[spelling] = unit
+    return units
+
+
+# Lowercase spelling (no trailing period) -> Unit
+_UNITS = _build()
+
+TSP = _UNITS["tsp"]
+TBSP = _UNITS["tbsp"]
+CUP = _UNITS["cup"]
+
+
+def lookup(spelling: str | None) -> Unit | None:
+    """The unit a spelling stands for, or None if it isn't in the table."""
+    if not spelling:
+        return None
+    return _UNITS.get(spelling.strip().lower().removesuffix("."))
+
+
+def spell(name: str, amount: float) -> str:
+    """How a unit is written after `amount`: "2 cups", "1 cup", "2 tbsp"."""
+    unit = lookup(name)
+    if unit is None or amount <= 1:
+        return name
+    return unit.plural
+
+
+def normalize(spelling: str) -> str:
+    """The canonical name of a known unit; other spellings, interned."""
+    unit = lookup(spelling)
+    return unit.name if unit is not None else sys.intern(spelling)
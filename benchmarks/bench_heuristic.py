@@ -0,0 +1,138 @@
+"""Compare the single-pass heuristic scanner with the previous label search.
+
+The previous implementation searched all label tags once per pattern and
+called ``find_next`` for every matching label, so pages with many headings
+that mention "ingredients" or "steps" (recipe roundups, long comment threads)
+cost time quadratic in page size. Pages are generated at increasing sizes,
+including a worst case where every label matches but the only list after them
+is empty and at the end of the page. Parsing is timed separately; both scans
+run on the same tree.
+
+Usage:
+    python -m benchmarks.bench_heuristic [--repeat N]
+"""
+
+import argparse
+import re
+import statistics
+import time
+
+from bs4 import BeautifulSoup
+
+from app.parser.heuristic import _INGREDIENT_RE, _INSTRUCTION_RE, extract_heuristic
+from app.parser.soup import share_soup, shared_soup
+
+URL = "https://example.com/recipe"
+
+_LABEL_TAGS = ["h1", "h2", "h3", "h4", "h5", "h6", "strong", "b"]
+
+
+def legacy_scan(soup: BeautifulSoup):
+    """The previous Tier 3 scan: one label search per pattern."""
+    return (
+        _legacy_find_list_after_label(soup, _INGREDIENT_RE),
+        _legacy_find_list_after_label(soup, _INSTRUCTION_RE),
+        _legacy_extract_title(soup),
+    )
+
+
+def _legacy_find_list_after_label(soup, pattern):
+    for tag in soup.find_all(_LABEL_TAGS):
+        if not pattern.search(tag.get_text(strip=True)):
+            continue
+        search_from = tag.parent if tag.parent.name == "p" else tag
+        ul = search_from.find_next(["ul", "ol"])
+        if ul:
+            items = [li.get_text(strip=True) for li in ul.find_all("li")]
+            if items:
+                return items
+    return []
+
+
+def _legacy_extract_title(soup):
+    og = soup.find("meta", property="og:title")
+    if og and og.get("content", "").strip():
+        return og["content"].strip()
+    title_tag = soup.find("title")
+    if title_tag:
+        text = title_tag.get_text(strip=True)
+        text = re.split(r"\s*[—|–\-]\s*(?!.*[—|–\-])", text)[0].strip()
+        if text:
+            return text
+    h1 = soup.find("h1")
+    if h1:
+        return h1.get_text(strip=True)
+    return "Untitled Recipe"
+
+
+def _blog_page(sections: int) -> str:
+    """A long post: many headings, paragraphs and link lists, recipe at the end."""
+    body = "".join(
+        f"<h2>Section {i}</h2><p>Story paragraph {i} with <b>bold</b> words.</p>"
+        f"<ul><li><a href='/p/{i}'>Related {i}</a></li></ul>"
+        for i in range(sections)
+    )
+    return (
+        f"<html><head><title>Soup — Blog</title></head><body>{body}"
+        "<h2>Ingredients</h2><ul><li>water</li><li>salt</li></ul>"
+        "<h2>Instructions</h2><ol><li>Boil.</li></ol></body></html>"
+    )
+
+
+def _worst_case_page(sections: int) -> str:
+    """Every label matches, but the first list after them all is empty."""
+    body = "".join(
+        f"<h3>Ingredients and steps, part {i}</h3><p><strong>Steps:</strong> "
+        f"see below ({i}).</p>"
+        for i in range(sections)
+    )
+    return (
+        f"<html><body>{body}<ol></ol>"
+        "<h2>Ingredients</h2><ul><li>flour</li></ul>"
+        "<h2>Method</h2><ol><li>Bake.</li></ol></body></html>"
+    )
+
+
+def _time(fn, arg, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(arg)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+
+def _parse(html: str) -> BeautifulSoup:
+    return BeautifulSoup(html, "html.parser")
+
+
+def _current_scan(html: str) -> None:
+    extract_heuristic(html, URL)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(
+        f"{'page':<28} {'size':>8} {'parse (ms)':>11}"
+        f" {'scan before':>12} {'scan after':>11}"
+    )
+    for name, build in (("blog", _blog_page), ("worst case", _worst_case_page)):
+        for sections in (100, 500, 2000):
+            html = build(sections)
+            soup = BeautifulSoup(html, "html.parser")
+            parse = _time(_parse, html, args.repeat)
+            before = _time(legacy_scan, soup, args.repeat)
+            with shared_soup():
+                share_soup(html, soup)
+                after = _time(_current_scan, html, args.repeat)
+            print(
+                f"{name + f' ({sections} sections)':<28} {len(html) // 1024:5} KB"
+                f" {parse:11.1f} {before:12.1f} {after:11.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
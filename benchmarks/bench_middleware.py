@@ -0,0 +1,99 @@
+"""Compare the pure ASGI security-headers middleware with a BaseHTTPMiddleware one.
+
+Drives the real app in-process through httpx's ASGI transport, so the numbers
+isolate framework and middleware overhead from sockets and the network.
+
+Usage:
+    python -m benchmarks.bench_middleware [--requests N] [--concurrency N]
+"""
+
+import argparse
+import asyncio
+import logging
+import statistics
+import time
+
+import httpx
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from app.main import SECURITY_HEADERS, SecurityHeadersMiddleware, app, limiter
+from app.models import Recipe
+from app.parser.pipeline import _recipe_cache
+
+RECIPE_URL = "https://example.com/bench-cookies"
+
+
+class LegacySecurityHeadersMiddleware(BaseHTTPMiddleware):
+    """The previous BaseHTTPMiddleware implementation, kept for comparison."""
+
+    async def dispatch(self, request, call_next):
+        response = await call_next(request)
+        for name, value in SECURITY_HEADERS.items():
+            response.headers[name] = value
+        return response
+
+
+def _use_security_middleware(cls) -> None:
+    for middleware in app.user_middleware:
+        if middleware.cls in (
+            SecurityHeadersMiddleware,
+            LegacySecurityHeadersMiddleware,
+        ):
+            middleware.cls = cls
+    app.middleware_stack = None  # rebuilt on the next request
+
+
+async def _run(path: str, n_requests: int, concurrency: int) -> list[float]:
+    transport = httpx.ASGITransport(app=app)
+    latencies: list[float] = []
+    queue = iter(range(n_requests))
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as c:
+
+        async def worker():
+            for _ in queue:
+                start = time.perf_counter()
+                resp = await c.get(path)
+                latencies.append(time.perf_counter() - start)
+                assert resp.status_code == 200, resp.status_code
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies
+
+
+def _report(label: str, latencies: list[float], elapsed: float) -> None:
+    quantiles = statistics.quantiles(latencies, n=100)
+    print(
+        f"  {label:<34} {len(latencies) / elapsed:8.0f} req/s"
+        f"   p50 {quantiles[49] * 1000:6.2f} ms   p99 {quantiles[98] * 1000:6.2f} ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=3000)
+    parser.add_argument("--concurrency", type=int, default=20)
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    limiter.enabled = False
+    _recipe_cache[RECIPE_URL] = Recipe(
+        title="Bench Cookies",
+        source_url=RECIPE_URL,
+        ingredients=[f"{i} cups flour" for i in range(1, 31)],
+        steps=[f"Step {i}: mix and bake." for i in range(1, 21)],
+    )
+    paths = {"/": "/", "/recipe (cached)": f"/recipe?url={RECIPE_URL}"}
+
+    for cls in (LegacySecurityHeadersMiddleware, SecurityHeadersMiddleware):
+        _use_security_middleware(cls)
+        print(cls.__name__)
+        for label, path in paths.items():
+            asyncio.run(_run(path, 200, args.concurrency))  # warm up
+            start = time.perf_counter()
+            latencies = asyncio.run(_run(path, args.requests, args.concurrency))
+            _report(label, latencies, time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    main()
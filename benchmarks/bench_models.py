@@ -0,0 +1,109 @@
+"""Cost of building Recipe and ParsedIngredient objects, by construction path.
+
+Times what happens for every fetched page: a tier builds a Recipe from
+extracted text (with and without HTML entities in it), ingredient parsing
+builds one ParsedIngredient per line, and the cache codec rebuilds a Recipe
+from JSON with and without ``clean_text``. Also times ``model_construct``, the
+usual "skip validation" shortcut, against validated construction.
+
+Usage:
+    python -m benchmarks.bench_models [--ingredients N] [--number N]
+"""
+
+import argparse
+import timeit
+
+from app.models import ParsedIngredient, Recipe
+
+
+def tier_output(n_ingredients: int, entities: bool) -> dict:
+    """Fields as a tier passes them to Recipe(...)."""
+    amp = "&amp;" if entities else "and"
+    return {
+        "title": f"Brown Butter {amp} Chocolate Chip Cookies",
+        "source_url": "https://www.example.com/recipes/brown-butter-cookies",
+        "servings": "24 cookies",
+        "prep_time": "20m",
+        "cook_time": "12m",
+        "ingredients": [
+            f"{i % 4 + 1} tablespoons unsalted butter, melted"
+            + (f" {amp} cooled" if i % 5 == 0 else "")
+            for i in range(n_ingredients)
+        ],
+        "steps": [
+            f"Whisk the butter {amp} sugar over medium heat until golden brown,"
+            " then set aside to cool."
+            for _ in range(20)
+        ],
+    }
+
+
+def parsed_fields(n_ingredients: int) -> list[dict]:
+    """Fields as ingredient parsing passes them to ParsedIngredient(...)."""
+    return [
+        {
+            "raw": f"{i % 4 + 1} tablespoons unsalted butter, melted",
+            "amount": float(i % 4 + 1),
+            "amount_max": None,
+            "unit": "tbsp",
+            "name": "unsalted butter",
+            "preparation": "melted",
+            "comment": None,
+        }
+        for i in range(n_ingredients)
+    ]
+
+
+def _report(label: str, seconds: float, number: int) -> None:
+    print(f"  {label:<44} {seconds / number * 1e6:8.1f} µs/op")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ingredients", type=int, default=50)
+    parser.add_argument("--number", type=int, default=5000)
+    args = parser.parse_args()
+    n, number = args.ingredients, args.number
+
+    def time(fn) -> float:
+        return timeit.timeit(fn, number=number)
+
+    print(f"{n} ingredients, 20 steps")
+    plain, entities = tier_output(n, False), tier_output(n, True)
+    _report("Recipe(...), plain text", time(lambda: Recipe(**plain)), number)
+    _report("Recipe(...), with entities", time(lambda: Recipe(**entities)), number)
+    _report(
+        "Recipe.model_construct(...), no cleanup",
+        time(lambda: Recipe.model_construct(**plain)),
+        number,
+    )
+
+    rows = parsed_fields(n)
+    recipe = Recipe(**plain, parsed_ingredients=[ParsedIngredient(**r) for r in rows])
+    payload = recipe.model_dump_json()
+    _report(
+        "Recipe.model_validate_json, clean_text",
+        time(lambda: Recipe.model_validate_json(payload)),
+        number,
+    )
+    _report(
+        "Recipe.model_validate_json, trusted",
+        time(lambda: Recipe.model_validate_json(payload, context={"trusted": True})),
+        number,
+    )
+    _report("recipe.model_copy()", time(recipe.model_copy), number)
+
+    _report(
+        f"{n} x ParsedIngredient(...)",
+        time(lambda: [ParsedIngredient(**row) for row in rows]),
+        number,
+    )
+    _report(
+        f"{n} x ParsedIngredient.model_construct(...)",
+        time(lambda: [ParsedIngredient.model_construct(**row) for row in rows]),
+        number,
+    )
+
+
+if __name__ == "__main__":
+    main()
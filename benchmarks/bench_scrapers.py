@@ -0,0 +1,158 @@
+"""Per-page cost of Tier 2 (recipe-scrapers), before and after the fast path.
+
+Pages are synthetic: a schema.org JSON-LD recipe inside ~60 KB of typical blog
+markup, served under the hostnames of popular supported sites. Two extra cases
+cover unsupported sites, with and without structured data, where the previous
+implementation built a generic schema scraper either way.
+
+The "+ heuristic" column adds Tier 3 on the same page, as happens when Tier 2
+finds nothing; it shows the saving from sharing one parsed tree.
+
+Usage:
+    python -m benchmarks.bench_scrapers [--repeat N]
+"""
+
+import argparse
+import json
+import logging
+import statistics
+import time
+
+from bs4 import BeautifulSoup
+from recipe_scrapers import scrape_html
+
+from app.parser.heuristic import extract_heuristic
+from app.parser.scrapers import extract_with_scraper
+from app.parser.soup import shared_soup
+from benchmarks.bench_heuristic import legacy_scan
+
+SUPPORTED_HOSTS = [
+    "allrecipes.com",
+    "foodnetwork.com",
+    "seriouseats.com",
+    "bbcgoodfood.com",
+    "simplyrecipes.com",
+    "bonappetit.com",
+    "epicurious.com",
+    "budgetbytes.com",
+    "cooking.nytimes.com",
+    "tasty.co",
+]
+
+_FILLER = "".join(
+    f'<div class="post-block"><h3>Tip {i}</h3><p>Lorem ipsum dolor sit amet, '
+    f'<a href="/tips/{i}">consectetur</a> adipiscing elit. Sed do eiusmod tempor '
+    "incididunt ut labore et dolore magna aliqua.</p></div>"
+    for i in range(250)
+)
+
+
+def _page(with_schema: bool) -> str:
+    schema = {
+        "@context": "https://schema.org",
+        "@type": "Recipe",
+        "name": "Weeknight Chili",
+        "recipeYield": "6 servings",
+        "prepTime": "PT15M",
+        "cookTime": "PT45M",
+        "image": "https://example.com/chili.jpg",
+        "recipeIngredient": [f"{i} tbsp ingredient {i}" for i in range(1, 16)],
+        "recipeInstructions": [
+            {"@type": "HowToStep", "text": f"Do step {i}."} for i in range(1, 9)
+        ],
+    }
+    script = (
+        f'<script type="application/ld+json">{json.dumps(schema)}</script>'
+        if with_schema
+        else ""
+    )
+    return (
+        f"<html><head><title>Weeknight Chili</title>{script}</head><body>"
+        f"<nav>{'<a href=/x>Link</a>' * 80}</nav>{_FILLER}"
+        "<h2>Ingredients</h2><ul><li>1 lb beef</li><li>1 onion</li></ul>"
+        "<h2>Instructions</h2><ol><li>Brown beef.</li><li>Simmer.</li></ol>"
+        "</body></html>"
+    )
+
+
+def legacy_extract_with_scraper(url: str, html: str):
+    """The previous Tier 2: scrape_html plus one try/except per accessor."""
+    try:
+        scraper = scrape_html(html, org_url=url, supported_only=False)
+    # The old tier swallowed every error; the baseline has to as well
+    except Exception:  # noqa: BLE001
+        return None
+    values = {}
+    for name in (
+        "ingredients",
+        "instructions",
+        "title",
+        "yields",
+        "image",
+        "prep_time",
+        "cook_time",
+    ):
+        try:
+            values[name] = getattr(scraper, name)()
+        except Exception:  # noqa: BLE001 - as above
+            values[name] = None
+    return values
+
+
+def legacy_extract_heuristic(url: str, html: str):
+    """The previous Tier 3 entry point, which always parsed its own tree."""
+    return legacy_scan(BeautifulSoup(html, "html.parser"))
+
+
+def _time(fn, url: str, html: str, repeat: int) -> float:
+    fn(url, html)  # warm up
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(url, html)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+
+def _legacy_both(url: str, html: str) -> None:
+    legacy_extract_with_scraper(url, html)
+    legacy_extract_heuristic(url, html)
+
+
+def _current_both(url: str, html: str) -> None:
+    with shared_soup():
+        extract_with_scraper(url, html)
+        extract_heuristic(html, url)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    cases = [(host, _page(with_schema=True)) for host in SUPPORTED_HOSTS]
+    cases.append(("unsupported.example (schema)", _page(with_schema=True)))
+    cases.append(("unsupported.example (no schema)", _page(with_schema=False)))
+
+    print(f"{'site':<32} {'tier 2 (ms)':>22} {'+ heuristic (ms)':>24}")
+    print(f"{'':<32} {'before':>10} {'after':>11} {'before':>12} {'after':>11}")
+    for label, html in cases:
+        url = f"https://www.{label.split()[0]}/recipes/weeknight-chili"
+        timings = [
+            _time(fn, url, html, args.repeat)
+            for fn in (
+                legacy_extract_with_scraper,
+                extract_with_scraper,
+                _legacy_both,
+                _current_both,
+            )
+        ]
+        print(
+            f"{label:<32} {timings[0]:10.2f} {timings[1]:11.2f}"
+            f" {timings[2]:12.2f} {timings[3]:11.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
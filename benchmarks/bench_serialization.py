@@ -0,0 +1,83 @@
+"""Benchmark the binary Recipe codec against JSON.
+
+Usage:
+    python -m benchmarks.bench_serialization [--ingredients N] [--number N]
+"""
+
+import argparse
+import timeit
+
+from app.models import ParsedIngredient, Recipe
+from app.serialization import decode_recipe, encode_recipe
+
+
+def make_recipe(n_ingredients: int) -> Recipe:
+    ingredients = [
+        f"{i % 4 + 1} tablespoons unsalted butter, melted (ingredient {i})"
+        for i in range(n_ingredients)
+    ]
+    return Recipe(
+        title="Benchmark Brown Butter Chocolate Chip Cookies",
+        source_url="https://www.example.com/recipes/brown-butter-cookies",
+        servings="24 cookies",
+        prep_time="20m",
+        cook_time="12m",
+        image_url="https://www.example.com/images/cookies.jpg",
+        ingredients=ingredients,
+        parsed_ingredients=[
+            ParsedIngredient(
+                raw=raw,
+                amount=float(i % 4 + 1),
+                unit="tbsp",
+                name="unsalted butter",
+                preparation="melted",
+                comment=f"(ingredient {i})",
+            )
+            for i, raw in enumerate(ingredients)
+        ],
+        steps=[
+            f"Step {i}: In a large bowl, whisk together the butter and sugar over"
+            " medium heat until golden brown, then set aside to cool."
+            for i in range(20)
+        ],
+    )
+
+
+def _report(label: str, seconds: float, number: int) -> None:
+    per_op = seconds / number * 1e6
+    print(f"  {label:<28} {per_op:8.1f} µs/op  {number / seconds:10.0f} ops/s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ingredients", type=int, default=40)
+    parser.add_argument("--number", type=int, default=2000)
+    args = parser.parse_args()
+
+    recipe = make_recipe(args.ingredients)
+    as_json = recipe.model_dump_json().encode()
+    as_binary = encode_recipe(recipe)
+    as_raw_binary = encode_recipe(recipe, compress=False)
+    assert decode_recipe(as_binary) == recipe
+
+    print(f"Recipe with {args.ingredients} ingredients, {len(recipe.steps)} steps")
+    print(f"  json size:                   {len(as_json):8d} bytes")
+    print(f"  binary size (uncompressed):  {len(as_raw_binary):8d} bytes")
+    print(f"  binary size (zlib + dict):   {len(as_binary):8d} bytes")
+    print()
+
+    n = args.number
+    timings = {
+        "json encode": lambda: recipe.model_dump_json(),
+        "json decode": lambda: Recipe.model_validate_json(as_json),
+        "binary encode": lambda: encode_recipe(recipe),
+        "binary decode": lambda: decode_recipe(as_binary),
+        "binary encode (no zlib)": lambda: encode_recipe(recipe, compress=False),
+        "binary decode (no zlib)": lambda: decode_recipe(as_raw_binary),
+    }
+    for label, fn in timings.items():
+        _report(label, timeit.timeit(fn, number=n), n)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""Per-domain cost of extraction with and without the site-specific tier.
+
+Times extract_recipe() (ingredient parsing off) on each site's pages, once
+with every registered tier and once with the site tier removed, i.e. the
+generic Tier 1 → recipe-scrapers → heuristic chain. With ``--archive`` the
+pages are the archived pages of those sites (see app/parser/archive.py);
+otherwise each host gets two synthetic pages: a Recipe JSON-LD block among
+Organization/WebSite/BreadcrumbList blocks and ~60 KB of blog markup, and the
+same page with one non-recipe block that isn't strict JSON (a trailing comma),
+which sends Tier 1 to extruct.
+
+Usage:
+    python -m benchmarks.bench_sites [--archive DIR] [--repeat N]
+"""
+
+import argparse
+import json
+import logging
+import statistics
+import time
+from collections import defaultdict
+from pathlib import Path
+from unittest.mock import patch
+from urllib.parse import urlsplit
+
+from app.models import ParseError
+from app.parser import archive, tiers
+from app.parser.pipeline import extract_recipe, warm_up
+from app.parser.sites import SITE_HOSTS, handles
+from benchmarks.bench_scrapers import _FILLER
+
+_RECIPE = {
+    "@context": "https://schema.org",
+    "@type": "Recipe",
+    "name": "Weeknight Chili",
+    "recipeYield": "6 servings",
+    "prepTime": "PT15M",
+    "cookTime": "PT45M",
+    "recipeIngredient": [f"{i} tbsp ingredient {i}" for i in range(1, 16)],
+    "recipeInstructions": [
+        {"@type": "HowToStep", "text": f"Do step {i}."} for i in range(1, 9)
+    ],
+}
+_OTHER_BLOCKS = [
+    {"@type": "Organization", "name": "Example Media", "logo": "/logo.png"},
+    {"@type": "WebSite", "name": "Example", "url": "https://example.com/"},
+    {
+        "@type": "BreadcrumbList",
+        "itemListElement": [
+            {"@type": "ListItem", "position": i, "name": f"Section {i}"}
+            for i in range(1, 5)
+        ],
+    },
+]
+
+
+def synthetic_page(malformed: bool) -> str:
+    blocks = [json.dumps(block) for block in _OTHER_BLOCKS]
+    if malformed:
+        blocks[-1] = blocks[-1][:-1] + ",}"
+    blocks.append(json.dumps(_RECIPE))
+    scripts = "".join(
+        f'<script type="application/ld+json">{block}</script>' for block in blocks
+    )
+    return (
+        f"<html><head><title>Weeknight Chili</title>{scripts}</head>"
+        f"<body>{_FILLER}</body></html>"
+    )
+
+
+def _generic_only():
+    generic = [t for t in tiers.registered() if t.name != tiers.SITE_TIER]
+    return patch.object(tiers, "_tiers", generic)
+
+
+def _time(url: str, html: str, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        extract_recipe(html, url, enrich=False)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+
+def _archived_cases(directory: Path) -> dict[str, list[tuple[str, str]]]:
+    cases = defaultdict(list)
+    for page in archive.iter_pages(directory):
+        if handles(page.url):
+            host = urlsplit(page.url).hostname.removeprefix("www.")
+            cases[host].append((page.url, archive.read_body(directory, page)))
+    return cases
+
+
+def _synthetic_cases() -> dict[str, list[tuple[str, str]]]:
+    cases = {}
+    for host in sorted(SITE_HOSTS):
+        url = f"https://www.{host}/recipes/weeknight-chili"
+        cases[host] = [(url, synthetic_page(False))]
+        cases[f"{host} (bad block)"] = [(url, synthetic_page(True))]
+    return cases
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--archive", type=Path, default=None)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+    warm_up()
+
+    cases = _archived_cases(args.archive) if args.archive else _synthetic_cases()
+    print(f"{'site':<36} {'pages':>5} {'generic (ms)':>13} {'site tier (ms)':>15}")
+    for label, pages in cases.items():
+        site, generic = [], []
+        for url, html in pages:
+            try:
+                extract_recipe(html, url, enrich=False)  # warm up
+            except ParseError:
+                continue
+            site.append(_time(url, html, args.repeat))
+            with _generic_only():
+                generic.append(_time(url, html, args.repeat))
+        if site:
+            print(
+                f"{label:<36} {len(site):>5} {statistics.median(generic):>13.2f}"
+                f" {statistics.median(site):>15.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
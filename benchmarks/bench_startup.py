@@ -0,0 +1,74 @@
+"""Measure app import time and parser warm-up cost with ``python -X importtime``.
+
+Each measurement runs in a fresh interpreter so nothing is already imported.
+The report shows the time until the app can start serving (``import app.main``),
+the time to load the parser tiers in the background, and the most expensive
+top-level packages for each.
+
+Usage:
+    python -m benchmarks.bench_startup [--runs N] [--top N]
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+
+STAGES = {
+    "import app.main": "import app.main",
+    "parser warm-up": (
+        "import app.main; from app.parser.pipeline import warm_up; warm_up()"
+    ),
+}
+
+
+def _importtime(code: str) -> tuple[float, dict[str, int]]:
+    """Run `code` under -X importtime; return wall time and µs per package.
+
+    A package's cost is the cumulative time of its most expensive import, which
+    is the outermost one and includes its own dependencies.
+    """
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    elapsed = time.perf_counter() - start
+
+    packages: dict[str, int] = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.removeprefix("import time:").split("|")
+        package = name.strip().split(".")[0]
+        if package != "app":
+            packages[package] = max(packages.get(package, 0), int(cumulative))
+    return elapsed, packages
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=8)
+    args = parser.parse_args()
+
+    for label, code in STAGES.items():
+        timings = []
+        packages: dict[str, int] = {}
+        for _ in range(args.runs):
+            elapsed, packages = _importtime(code)
+            timings.append(elapsed)
+        print(
+            f"{label:<18} median {statistics.median(timings) * 1000:7.0f} ms"
+            f"   min {min(timings) * 1000:7.0f} ms   ({args.runs} runs)"
+        )
+        ranked = sorted(packages.items(), key=lambda item: item[1], reverse=True)
+        for name, micros in ranked[: args.top]:
+            print(f"    {name:<24} {micros / 1000:7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
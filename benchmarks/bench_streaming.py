@@ -0,0 +1,125 @@
+"""Time to a recipe with and without parsing while the page downloads.
+
+A mock origin serves each page in 16 KB chunks at a fixed bandwidth. The
+buffered path waits for the whole body and then runs the tiers; the streaming
+path (``RECIPE_STREAMING_PARSE``) feeds each chunk to the incremental parser as
+it arrives, so Tiers 1 and 3 have little left to do once the body is complete.
+Ingredient enrichment is the same on both paths and is left out.
+
+Usage:
+    python -m benchmarks.bench_streaming [--repeat N]
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import statistics
+import time
+
+import httpx
+
+from app.parser.heuristic import extract_heuristic
+from app.parser.pipeline import _stream_page, warm_up
+from app.parser.scrapers import extract_with_scraper
+from app.parser.soup import shared_soup
+from app.parser.structured import extract_from_html
+from benchmarks.bench_heuristic import _blog_page
+
+URL = "https://unsupported.example/recipes/soup"
+CHUNK = 16 * 1024
+BANDWIDTHS = {"local": None, "2 MB/s": 2_000_000, "500 KB/s": 500_000}
+
+
+def _jsonld_page(sections: int) -> str:
+    schema = {
+        "@context": "https://schema.org",
+        "@type": "Recipe",
+        "name": "Soup",
+        "recipeIngredient": [f"{i} cups stock" for i in range(1, 12)],
+        "recipeInstructions": [{"@type": "HowToStep", "text": "Simmer."}],
+    }
+    script = f'<script type="application/ld+json">{json.dumps(schema)}</script>'
+    return _blog_page(sections).replace("<head>", f"<head>{script}", 1)
+
+
+def _transport(body: bytes, bandwidth: int | None) -> httpx.MockTransport:
+    async def chunks():
+        # Chunks arrive on a schedule, whether or not the client is busy
+        start = time.perf_counter()
+        for i in range(0, len(body), CHUNK):
+            if bandwidth:
+                arrival = start + (i + CHUNK) / bandwidth
+                await asyncio.sleep(max(0.0, arrival - time.perf_counter()))
+            yield body[i : i + CHUNK]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(
+            200, headers={"Content-Type": "text/html; charset=utf-8"}, content=chunks()
+        )
+
+    return httpx.MockTransport(handler)
+
+
+def _tiers(html: str, structured, heuristic) -> None:
+    with shared_soup():
+        if structured() is None and extract_with_scraper(URL, html) is None:
+            heuristic()
+
+
+async def _buffered(client: httpx.AsyncClient) -> None:
+    response = await client.get(URL)
+    html = response.text
+    _tiers(
+        html,
+        lambda: extract_from_html(html, URL),
+        lambda: extract_heuristic(html, URL),
+    )
+
+
+async def _streaming(client: httpx.AsyncClient) -> None:
+    _, _, html, scan = await _stream_page(client, URL)
+    _tiers(
+        html,
+        lambda: scan.structured_recipe(html, URL),
+        lambda: scan.heuristic_recipe(URL),
+    )
+
+
+async def _time(fn, body: bytes, bandwidth: int | None, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        async with httpx.AsyncClient(transport=_transport(body, bandwidth)) as client:
+            start = time.perf_counter()
+            await fn(client)
+            timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+
+async def _run(repeat: int) -> None:
+    pages = {
+        "JSON-LD": _jsonld_page(2000).encode(),
+        "heuristic only": _blog_page(2000).encode(),
+    }
+    print(f"{'page':<16} {'origin':<10} {'size':>7} {'buffered':>10} {'streaming':>10}")
+    for name, body in pages.items():
+        for origin, bandwidth in BANDWIDTHS.items():
+            buffered = await _time(_buffered, body, bandwidth, repeat)
+            streaming = await _time(_streaming, body, bandwidth, repeat)
+            print(
+                f"{name:<16} {origin:<10} {len(body) // 1024:4} KB"
+                f" {buffered:7.0f} ms {streaming:7.0f} ms"
+            )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+    warm_up()
+    asyncio.run(_run(args.repeat))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+"""Load-test a running app against the local mock origin.
+
+Drives ``/``, ``/recipe`` and ``/api/recipe`` over HTTP at a fixed concurrency,
+one scenario at a time, and reports throughput, latency percentiles and error
+counts per scenario. Recipe URLs point at ``benchmarks.mock_origin``; "hit"
+scenarios reuse one warmed-up URL, "miss" scenarios give every request a fresh
+page variant so nothing is served from the app's caches.
+
+With ``--spawn``, the mock origin and the app (uvicorn, rate limiting off, the
+origin's host allowed past the private-address check) are started here and
+stopped afterwards. Otherwise start them yourself, e.g.::
+
+    python -m benchmarks.mock_origin --port 8001
+    RECIPE_ALLOWED_PRIVATE_HOSTS=localhost RATELIMIT_ENABLED=false \\
+        uvicorn app.main:app --port 8000
+
+Errors are transport failures, HTTP status >= 400, and /recipe answers that
+render the error page (parse errors are shown with status 200).
+
+Usage:
+    python -m benchmarks.load_test [--spawn] [--requests N] [--concurrency N]
+        [--scenario NAME ...]
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import subprocess
+import sys
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager, nullcontext
+from urllib.parse import urlencode
+
+import httpx
+
+_ERROR_PAGE_MARKER = 'class="error-box"'
+
+
+def scenarios(origin: str) -> dict[str, Callable[[int], str]]:
+    """Scenario name -> function from request number to the path to GET."""
+
+    def page(name: str, **params) -> str:
+        query = f"?{urlencode(params)}" if params else ""
+        return f"{origin}/page/{name}{query}"
+
+    def recipe(url: str, api: bool = False) -> str:
+        return ("/api/recipe?" if api else "/recipe?") + urlencode({"url": url})
+
+    hit = page("jsonld")
+    return {
+        "home": lambda i: "/",
+        "recipe hit": lambda i: recipe(hit),
+        "recipe miss": lambda i: recipe(page("jsonld", v=f"miss-{i}")),
+        "recipe miss (heuristic)": lambda i: recipe(page("heuristic", v=f"h-{i}")),
+        "recipe 80% hit": lambda i: (
+            recipe(hit) if random.random() < 0.8 else recipe(page("jsonld", v=i))
+        ),
+        "api hit": lambda i: recipe(hit, api=True),
+        "api miss": lambda i: recipe(page("jsonld", v=f"api-{i}"), api=True),
+        "slow origin (500 ms)": lambda i: recipe(
+            page("jsonld", v=f"slow-{i}", latency=500)
+        ),
+        "large pages (+1 MB)": lambda i: recipe(page("jsonld", v=f"big-{i}", pad=1024)),
+        "flaky origin (20% 503, 2 redirects)": lambda i: recipe(
+            page("jsonld", v=f"flaky-{i}", fail=0.2, redirects=2)
+        ),
+        "no recipe": lambda i: recipe(page("none", v=f"none-{i}")),
+    }
+
+
+async def run_scenario(
+    app_url: str, path_for: Callable[[int], str], requests: int, concurrency: int
+) -> tuple[list[float], int, float]:
+    """Return per-request latencies, the error count and the elapsed time."""
+    latencies: list[float] = []
+    errors = 0
+    numbers = iter(range(requests))
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(base_url=app_url, timeout=60, limits=limits) as c:
+
+        async def worker():
+            nonlocal errors
+            for i in numbers:
+                start = time.perf_counter()
+                try:
+                    resp = await c.get(path_for(i))
+                except httpx.HTTPError:
+                    errors += 1
+                    continue
+                latencies.append(time.perf_counter() - start)
+                if resp.status_code >= 400 or _ERROR_PAGE_MARKER in resp.text:
+                    errors += 1
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies, errors, time.perf_counter() - start
+
+
+def _report(name: str, latencies: list[float], errors: int, elapsed: float) -> None:
+    if len(latencies) >= 2:
+        q = statistics.quantiles(latencies, n=100)
+        p50, p95, p99 = (q[i] * 1000 for i in (49, 94, 98))
+    else:
+        p50 = p95 = p99 = float("nan")
+    rate = len(latencies) / elapsed
+    print(
+        f"{name:<38} {rate:7.1f} req/s  p50 {p50:7.1f}  p95 {p95:7.1f}"
+        f"  p99 {p99:7.1f} ms  errors {errors}"
+    )
+
+
+def _wait_until_ready(url: str, timeout: float = 120) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(url, timeout=2).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.5)
+    raise SystemExit(f"{url} did not become ready within {timeout:.0f}s")
+
+
+@contextmanager
+def _spawned_servers(app_port: int, origin_port: int) -> Iterator[None]:
+    env = {
+        **os.environ,
+        "RECIPE_ALLOWED_PRIVATE_HOSTS": "localhost",
+        "RATELIMIT_ENABLED": "false",
+    }
+    commands = [
+        [sys.executable, "-m", "benchmarks.mock_origin", "--port", str(origin_port)],
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "app.main:app",
+            "--port",
+            str(app_port),
+            "--log-level",
+            "warning",
+        ],
+    ]
+    # The app logs every failed parse; keep that out of the report
+    procs = [
+        subprocess.Popen(cmd, env=env, stdout=log, stderr=log)
+        for cmd, log in zip(commands, (None, subprocess.DEVNULL), strict=True)
+    ]
+    try:
+        _wait_until_ready(f"http://127.0.0.1:{origin_port}/pages")
+        # /readyz turns 200 once the parser tiers have loaded
+        _wait_until_ready(f"http://127.0.0.1:{app_port}/readyz")
+        yield
+    finally:
+        for proc in procs:
+            proc.terminate()
+        for proc in procs:
+            proc.wait()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--app", default="http://127.0.0.1:8000")
+    parser.add_argument("--origin", default="http://localhost:8001")
+    parser.add_argument("--spawn", action="store_true")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--scenario", action="append", help="run only these")
+    args = parser.parse_args()
+
+    table = scenarios(args.origin)
+    names = args.scenario or list(table)
+    unknown = set(names) - set(table)
+    if unknown:
+        parser.error(f"unknown scenarios {sorted(unknown)}; choose from {list(table)}")
+
+    servers = (
+        _spawned_servers(httpx.URL(args.app).port, httpx.URL(args.origin).port)
+        if args.spawn
+        else nullcontext()
+    )
+    with servers:
+        # Warm the cache for the "hit" scenarios
+        asyncio.run(run_scenario(args.app, table["recipe hit"], 1, 1))
+        asyncio.run(run_scenario(args.app, table["api hit"], 1, 1))
+        print(f"{args.requests} requests per scenario, concurrency {args.concurrency}")
+        for name in names:
+            _report(
+                name,
+                *asyncio.run(
+                    run_scenario(args.app, table[name], args.requests, args.concurrency)
+                ),
+            )
+
+
+if __name__ == "__main__":
+    main()
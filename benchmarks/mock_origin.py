@@ -0,0 +1,130 @@
+"""A local recipe origin for load tests, so they never touch real sites.
+
+Serves a corpus of pages: a few synthetic ones (JSON-LD recipe, heuristic-only
+blog post, page without a recipe) plus, with ``--archive``, every page saved by
+the app's page archive (``RECIPE_ARCHIVE_DIR``). Each request can shape its own
+response with query parameters; the command-line options set the defaults:
+
+    latency=MS     delay before responding
+    pad=KB         extra markup appended to the page
+    fail=RATE      fraction of requests answered with 503
+    redirects=N    redirect N times before serving the page
+    v=ANY          variant: makes the page content unique, so the app's
+                   URL cache and content-hash dedup both miss
+
+The app refuses private addresses, so start it with
+``RECIPE_ALLOWED_PRIVATE_HOSTS=localhost`` and point it at
+``http://localhost:<port>/page/<name>``. Use a different hostname (e.g.
+127.0.0.1) for the app itself, or its own-host check rejects the URLs.
+
+Usage:
+    python -m benchmarks.mock_origin [--port 8001] [--archive DIR]
+        [--latency MS] [--pad KB] [--fail RATE]
+"""
+
+import argparse
+import asyncio
+import random
+from html import escape
+from pathlib import Path
+
+import uvicorn
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import HTMLResponse, JSONResponse, RedirectResponse, Response
+from starlette.routing import Route
+
+from app.parser import archive
+from benchmarks.bench_heuristic import _blog_page
+from benchmarks.bench_streaming import _jsonld_page
+
+_VARIANT = "__VARIANT__"
+_PAD_BLOCK = (
+    '<div class="pad"><h3>More from the blog</h3><p>Lorem ipsum dolor sit amet, '
+    '<a href="/more">consectetur</a> adipiscing elit.</p></div>'
+)
+
+
+def synthetic_pages() -> dict[str, str]:
+    """Built-in pages, with a marker where a request's variant goes."""
+    return {
+        "jsonld": _jsonld_page(200).replace("Soup", f"Soup {_VARIANT}"),
+        "heuristic": _blog_page(200).replace("Soup", f"Soup {_VARIANT}"),
+        "none": (
+            f"<html><head><title>News {_VARIANT}</title></head>"
+            "<body><h1>Nothing to cook here</h1><p>Just news.</p></body></html>"
+        ),
+    }
+
+
+def archived_pages(directory: Path) -> dict[str, str]:
+    """Pages saved by the app's archive, named by position."""
+    return {
+        f"archive-{i}": archive.read_body(directory, page)
+        for i, page in enumerate(archive.iter_pages(directory))
+    }
+
+
+def create_app(
+    pages: dict[str, str],
+    latency: float = 0.0,
+    pad: int = 0,
+    fail: float = 0.0,
+) -> Starlette:
+    """The origin app; `latency` is in ms, `pad` in KB."""
+
+    async def index(request: Request) -> Response:
+        return JSONResponse(sorted(pages))
+
+    async def page(request: Request) -> Response:
+        html = pages.get(request.path_params["name"])
+        if html is None:
+            return HTMLResponse("<h1>Not found</h1>", status_code=404)
+        params = request.query_params
+        delay = float(params.get("latency", latency))
+        if delay:
+            await asyncio.sleep(delay / 1000)
+        if random.random() < float(params.get("fail", fail)):
+            return HTMLResponse("<h1>Unavailable</h1>", status_code=503)
+        redirects = int(params.get("redirects", 0))
+        if redirects > 0:
+            url = request.url.include_query_params(redirects=redirects - 1)
+            return RedirectResponse(str(url), status_code=302)
+
+        variant = escape(params.get("v", ""))
+        if _VARIANT in html:
+            html = html.replace(_VARIANT, variant)
+        elif variant:
+            meta = f'<meta name="variant" content="{variant}">'
+            html = html.replace("</head>", f"{meta}</head>", 1)
+        kb = int(params.get("pad", pad))
+        if kb:
+            padding = _PAD_BLOCK * (kb * 1024 // len(_PAD_BLOCK) + 1)
+            html = html.replace("</body>", f"{padding}</body>", 1)
+        return HTMLResponse(html)
+
+    return Starlette(
+        routes=[Route("/pages", index), Route("/page/{name}", page)],
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--archive", type=Path, default=archive.ARCHIVE_DIR)
+    parser.add_argument("--latency", type=float, default=0.0, help="ms")
+    parser.add_argument("--pad", type=int, default=0, help="KB")
+    parser.add_argument("--fail", type=float, default=0.0, help="error rate")
+    args = parser.parse_args()
+
+    pages = synthetic_pages()
+    if args.archive is not None:
+        pages.update(archived_pages(args.archive))
+    print(f"Serving {len(pages)} pages on http://{args.host}:{args.port}/page/<name>")
+    app = create_app(pages, latency=args.latency, pad=args.pad, fail=args.fail)
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
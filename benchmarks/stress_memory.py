@@ -0,0 +1,107 @@
+"""Parse many large pages at once and check peak memory stays under a ceiling.
+
+Starts ``benchmarks.mock_origin`` and calls parse_recipe() in this process
+(ingredient parsing off) for ``--requests`` unique pages, ``--concurrency`` at
+a time. Each page is the origin's heuristic-only blog post padded to ``--pad``
+KB, so every request runs Tier 2 and Tier 3 over the whole page. Reports the
+process's peak RSS before and after, with the memory budget as configured
+(``--budget-mb``, default ``RECIPE_MEMORY_BUDGET_MB``), and exits non-zero if
+the peak passes ``--ceiling-mb``.
+
+Compare runs with and without a budget, e.g.::
+
+    python -m benchmarks.stress_memory --budget-mb 0
+    python -m benchmarks.stress_memory --budget-mb 200 --ceiling-mb 400
+
+Usage:
+    python -m benchmarks.stress_memory [--requests N] [--concurrency N]
+        [--pad KB] [--budget-mb MB] [--ceiling-mb MB] [--port PORT]
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import subprocess
+import sys
+import time
+from collections import Counter
+
+from app.models import ParseError
+from app.parser import memory, pipeline
+from app.parser.deadline import Deadline
+from app.request_log import max_rss_mb
+from benchmarks.load_test import _wait_until_ready
+
+
+async def _run(origin: str, requests: int, concurrency: int, pad: int) -> Counter:
+    outcomes = Counter()
+    slots = asyncio.Semaphore(concurrency)
+
+    async def one(i: int) -> None:
+        url = f"{origin}/page/heuristic?pad={pad}&latency=20&v={i}-{time.time_ns()}"
+        async with slots:
+            try:
+                await pipeline.parse_recipe(url, deadline=Deadline(120), enrich=False)
+            except ParseError as e:
+                outcomes[e.error_type] += 1
+            else:
+                outcomes["ok"] += 1
+
+    await asyncio.gather(*(one(i) for i in range(requests)))
+    return outcomes
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=30)
+    parser.add_argument("--concurrency", type=int, default=30)
+    parser.add_argument("--pad", type=int, default=1000, help="KB")
+    parser.add_argument("--budget-mb", type=float, default=None, help="0 for none")
+    parser.add_argument("--ceiling-mb", type=float, default=None)
+    parser.add_argument("--port", type=int, default=8001)
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    if args.budget_mb is not None:
+        memory.MEMORY_BUDGET = int(args.budget_mb * 1_000_000) or None
+    pipeline.ALLOWED_PRIVATE_HOSTS = frozenset({"localhost"})
+    pipeline.warm_up()
+    baseline = max_rss_mb()
+
+    origin = subprocess.Popen(
+        [sys.executable, "-m", "benchmarks.mock_origin", "--port", str(args.port)],
+        env=os.environ,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        _wait_until_ready(f"http://127.0.0.1:{args.port}/pages")
+        start = time.perf_counter()
+        outcomes = asyncio.run(
+            _run(
+                f"http://localhost:{args.port}",
+                args.requests,
+                args.concurrency,
+                args.pad,
+            )
+        )
+        elapsed = time.perf_counter() - start
+    finally:
+        origin.terminate()
+        origin.wait()
+
+    peak = max_rss_mb()
+    budget = memory.MEMORY_BUDGET
+    print(
+        f"{args.requests} pages of {args.pad} KB, {args.concurrency} at a time,"
+        f" budget {f'{budget / 1e6:.0f} MB' if budget else 'none'}"
+    )
+    print(f"outcomes: {dict(outcomes)} in {elapsed:.1f}s")
+    print(f"peak RSS: {baseline:.0f} MB after warm-up, {peak:.0f} MB after the run")
+    if args.ceiling_mb is not None and peak > args.ceiling_mb:
+        raise SystemExit(f"peak RSS {peak:.0f} MB is over {args.ceiling_mb:.0f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""HTML pages, and an origin serving them, shared by several test modules."""
+
+import httpx
+
+_AsyncClient = httpx.AsyncClient
+
+JSONLD_RECIPE_HTML = """
+<html><head>
+<script type="application/ld+json">
+{
+    "@context": "https://schema.org",
+    "@type": "Recipe",
+    "name": "Test Cookies",
+    "recipeIngredient": ["1 cup flour", "1/2 cup sugar", "2 eggs"],
+    "recipeInstructions": [
+        {"@type": "HowToStep", "text": "Mix flour and sugar."},
+        {"@type": "HowToStep", "text": "Add eggs and stir."},
+        {"@type": "HowToStep", "text": "Bake at 350F for 12 minutes."}
+    ],
+    "prepTime": "PT10M",
+    "cookTime": "PT12M",
+    "recipeYield": "24 cookies",
+    "image": "https://example.com/cookies.jpg"
+}
+</script>
+</head><body></body></html>
+"""
+
+JSONLD_GRAPH_HTML = """
+<html><head>
+<script type="application/ld+json">
+{
+    "@context": "https://schema.org",
+    "@graph": [
+        {"@type": "WebPage", "name": "Blog Post"},
+        {
+            "@type": "Recipe",
+            "name": "Graph Soup",
+            "recipeIngredient": ["water", "salt"],
+            "recipeInstructions": "Boil water.\\nAdd salt."
+        }
+    ]
+}
+</script>
+</head><body></body></html>
+"""
+
+# No structured data, but content the heuristic tier can parse
+HEURISTIC_FALLBACK_HTML = """
+<html><body>
+<h1>Grandma's Soup</h1>
+<h2>Ingredients</h2>
+<ul><li>water</li><li>salt</li></ul>
+<h2>Directions</h2>
+<ol><li>Boil water.</li><li>Add salt.</li></ol>
+</body></html>
+"""
+
+HEURISTIC_FULL_HTML = """
+<html>
+<head><title>Best Pancakes — My Food Blog</title></head>
+<body>
+<h1>Best Pancakes Ever</h1>
+<p>Long story about my grandma...</p>
+<h2>Ingredients</h2>
+<ul>
+    <li>1 cup flour</li>
+    <li>1 egg</li>
+    <li>1 cup milk</li>
+</ul>
+<h2>Directions</h2>
+<ol>
+    <li>Mix dry ingredients.</li>
+    <li>Add wet ingredients and stir.</li>
+    <li>Cook on griddle.</li>
+</ol>
+</body></html>
+"""
+
+HEURISTIC_LABEL_IN_P_HTML = """
+<html><body>
+<p><strong>Ingredients:</strong></p>
+<ul><li>flour</li><li>water</li></ul>
+</body></html>
+"""
+
+
+def origin_client(*pages):
+    """An httpx.AsyncClient factory to patch over the pipeline's.
+
+    Its requests get `pages` in turn, the last one repeating: HTML, an
+    httpx.Response, or an exception to raise.
+    """
+    served = 0
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal served
+        page = pages[min(served, len(pages) - 1)]
+        served += 1
+        if isinstance(page, Exception):
+            raise page
+        if isinstance(page, str):
+            page = httpx.Response(200, text=page)
+        return page
+
+    return lambda **kwargs: _AsyncClient(
+        transport=httpx.MockTransport(handler), **kwargs
+    )
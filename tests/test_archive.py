@@ -0,0 +1,142 @@
+"""Tests for the raw-HTML archive and offline reparsing."""
+
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from app.models import Recipe
+from app.parser import archive
+from app.parser.pipeline import (
+    _cache_key,
+    _content_index,
+    _page_recipes,
+    _recipe_cache,
+    parse_recipe,
+)
+from app.parser.reparse import refresh_cache, reparse_archive
+from tests.fixtures import HEURISTIC_FALLBACK_HTML, JSONLD_RECIPE_HTML, origin_client
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache():
+    _recipe_cache.clear()
+    _content_index.clear()
+    _page_recipes.clear()
+
+
+def _response(html: str, content_type: str = "text/html; charset=utf-8"):
+    return httpx.Response(
+        200,
+        headers={"Content-Type": content_type},
+        content=html.encode(content_type.rpartition("charset=")[2] or "utf-8"),
+        request=httpx.Request("GET", "https://example.com"),
+    )
+
+
+def test_archive_round_trip(tmp_path):
+    archive.archive_response(tmp_path, "https://example.com/a", _response("<p>hé</p>"))
+    [page] = archive.iter_pages(tmp_path)
+    assert page.url == "https://example.com/a"
+    assert page.status_code == 200
+    assert ("content-type", "text/html; charset=utf-8") in page.headers
+    assert archive.read_body(tmp_path, page) == "<p>hé</p>"
+
+
+def test_archive_decodes_with_original_charset(tmp_path):
+    resp = _response("<p>café</p>", "text/html; charset=latin-1")
+    archive.archive_response(tmp_path, "https://example.com/a", resp)
+    [page] = archive.iter_pages(tmp_path)
+    assert archive.read_body(tmp_path, page) == "<p>café</p>"
+
+
+def test_archive_stores_identical_bodies_once(tmp_path):
+    archive.archive_response(tmp_path, "https://example.com/a", _response("<p>x</p>"))
+    archive.archive_response(tmp_path, "https://example.com/b", _response("<p>x</p>"))
+    assert len(list((tmp_path / "pages").iterdir())) == 2
+    assert len(list((tmp_path / "bodies").iterdir())) == 1
+
+
+def test_archive_replaces_page_record_on_refetch(tmp_path):
+    archive.archive_response(tmp_path, "https://example.com/a", _response("<p>1</p>"))
+    archive.archive_response(tmp_path, "https://example.com/a", _response("<p>2</p>"))
+    [page] = archive.iter_pages(tmp_path)
+    assert archive.read_body(tmp_path, page) == "<p>2</p>"
+
+
+def test_iter_pages_skips_corrupt_records(tmp_path):
+    archive.archive_response(tmp_path, "https://example.com/a", _response("<p>x</p>"))
+    (tmp_path / "pages" / "broken.json").write_text("{not json")
+    assert [p.url for p in archive.iter_pages(tmp_path)] == ["https://example.com/a"]
+
+
+@pytest.mark.anyio
+@patch("app.parser.pipeline.httpx.AsyncClient")
+async def test_parse_recipe_archives_when_enabled(mock_client_cls, tmp_path):
+    mock_client_cls.side_effect = origin_client(_response(JSONLD_RECIPE_HTML))
+
+    with patch("app.parser.archive.ARCHIVE_DIR", tmp_path):
+        await parse_recipe("https://example.com/cookies")
+    assert [p.url for p in archive.iter_pages(tmp_path)] == [
+        "https://example.com/cookies"
+    ]
+
+
+def test_reparse_archive_refreshes_cache(tmp_path):
+    archive.archive_response(
+        tmp_path, "https://example.com/cookies", _response(JSONLD_RECIPE_HTML)
+    )
+    archive.archive_response(
+        tmp_path, "https://example.com/pasta", _response(HEURISTIC_FALLBACK_HTML)
+    )
+    archive.archive_response(
+        tmp_path, "https://example.com/blog", _response("<p>No recipe.</p>")
+    )
+
+    report = reparse_archive(tmp_path, workers=1)
+
+    assert report.tiers == {
+        "https://example.com/cookies": "Tier 1 (structured data)",
+        "https://example.com/pasta": "Tier 3 (heuristic)",
+    }
+    assert list(report.failures) == ["https://example.com/blog"]
+    assert not _recipe_cache
+    refresh_cache(report)
+    assert _recipe_cache["https://example.com/cookies"].title == "Test Cookies"
+    assert "https://example.com/blog" not in _recipe_cache
+
+
+def test_reparse_archive_in_spawned_workers(tmp_path):
+    for name in ("a", "b"):
+        archive.archive_response(
+            tmp_path, f"https://example.com/{name}", _response(JSONLD_RECIPE_HTML)
+        )
+    report = reparse_archive(tmp_path, workers=2)
+    assert set(report.recipes) == {"https://example.com/a", "https://example.com/b"}
+
+
+def test_refresh_cache_drops_stale_page_entries(tmp_path):
+    url = "https://example.com/cookies"
+    archive.archive_response(tmp_path, url, _response(JSONLD_RECIPE_HTML))
+    stale = Recipe(title="Old", source_url=url, ingredients=["x"], steps=["y"])
+    _recipe_cache[url] = _recipe_cache[_cache_key(url, 1)] = stale
+    _page_recipes[url] = [stale, stale]
+    _content_index["jsonld:old"] = stale
+
+    refresh_cache(reparse_archive(tmp_path, workers=1))
+    assert _recipe_cache[url].title == "Test Cookies"
+    assert _cache_key(url, 1) not in _recipe_cache
+    assert url not in _page_recipes
+    assert "jsonld:old" not in _content_index
+    assert [r.title for r in _content_index.values()] == ["Test Cookies"]
+
+
+def test_reparse_archive_records_unexpected_errors(tmp_path):
+    archive.archive_response(
+        tmp_path, "https://example.com/cookies", _response(JSONLD_RECIPE_HTML)
+    )
+    with patch(
+        "app.parser.pipeline.extract_recipe", side_effect=AttributeError("boom")
+    ):
+        report = reparse_archive(tmp_path, workers=1)
+    assert report.failures == {"https://example.com/cookies": "AttributeError: boom"}
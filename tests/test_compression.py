@@ -0,0 +1,145 @@
+"""Tests for response compression and precompressed static assets."""
+
+import gzip
+
+import brotli
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
+from fastapi.testclient import TestClient
+
+from app.compression import (
+    CompressionMiddleware,
+    negotiate_encoding,
+    precompress_static,
+)
+from app.static_files import FingerprintedStaticFiles
+
+LARGE_TEXT = "Whisk the eggs and sugar together until pale. " * 100
+
+
+@pytest.fixture()
+def client():
+    app = FastAPI()
+
+    @app.get("/large")
+    async def large():
+        return PlainTextResponse(LARGE_TEXT)
+
+    @app.get("/small")
+    async def small():
+        return PlainTextResponse("ok")
+
+    app.add_middleware(CompressionMiddleware)
+    return TestClient(app)
+
+
+@pytest.fixture()
+def static_dir(tmp_path):
+    (tmp_path / "app.js").write_text("console.log('hello world');\n" * 100)
+    (tmp_path / "tiny.css").write_text("body{}")
+    return tmp_path
+
+
+@pytest.fixture()
+def static_client(static_dir):
+    precompress_static(static_dir)
+    app = FastAPI()
+    app.mount("/static", FingerprintedStaticFiles(directory=static_dir))
+    app.add_middleware(CompressionMiddleware)
+    return TestClient(app)
+
+
+# -- Encoding negotiation --
+
+
+def test_negotiate_prefers_brotli():
+    assert negotiate_encoding("gzip, deflate, br") == "br"
+
+
+def test_negotiate_respects_quality():
+    assert negotiate_encoding("br;q=0.5, gzip") == "gzip"
+    assert negotiate_encoding("br;q=0, gzip;q=0") is None
+
+
+def test_negotiate_wildcard_and_empty():
+    assert negotiate_encoding("*") == "br"
+    assert negotiate_encoding("") is None
+    assert negotiate_encoding("identity") is None
+
+
+def test_negotiate_limited_to_available():
+    assert negotiate_encoding("br, gzip", available=["gzip"]) == "gzip"
+
+
+# -- Dynamic compression --
+
+
+def test_brotli_response(client):
+    resp = client.get("/large", headers={"Accept-Encoding": "br"})
+    assert resp.headers["Content-Encoding"] == "br"
+    assert "Accept-Encoding" in resp.headers["Vary"]
+    assert resp.text == LARGE_TEXT
+
+
+def test_gzip_response(client):
+    resp = client.get("/large", headers={"Accept-Encoding": "gzip"})
+    assert resp.headers["Content-Encoding"] == "gzip"
+    assert resp.text == LARGE_TEXT
+
+
+def test_identity_response(client):
+    resp = client.get("/large", headers={"Accept-Encoding": "identity"})
+    assert "Content-Encoding" not in resp.headers
+    assert resp.text == LARGE_TEXT
+
+
+def test_small_response_not_compressed(client):
+    resp = client.get("/small", headers={"Accept-Encoding": "br, gzip"})
+    assert "Content-Encoding" not in resp.headers
+    assert resp.text == "ok"
+
+
+# -- Precompressed static assets --
+
+
+def test_precompress_writes_variants(static_dir):
+    written = precompress_static(static_dir)
+    names = sorted(p.name for p in written)
+    assert names == ["app.js.br", "app.js.gz"]
+    original = (static_dir / "app.js").read_bytes()
+    assert brotli.decompress((static_dir / "app.js.br").read_bytes()) == original
+    assert gzip.decompress((static_dir / "app.js.gz").read_bytes()) == original
+
+
+def test_precompressed_variant_served(static_client, static_dir):
+    resp = static_client.get("/static/app.js", headers={"Accept-Encoding": "br"})
+    assert resp.status_code == 200
+    assert resp.headers["Content-Encoding"] == "br"
+    assert resp.headers["Vary"] == "Accept-Encoding"
+    assert "javascript" in resp.headers["Content-Type"]
+    assert resp.content == (static_dir / "app.js").read_bytes()
+    assert int(resp.headers["Content-Length"]) == len(
+        (static_dir / "app.js.br").read_bytes()
+    )
+
+
+def test_precompressed_gzip_variant_served(static_client):
+    resp = static_client.get("/static/app.js", headers={"Accept-Encoding": "gzip"})
+    assert resp.headers["Content-Encoding"] == "gzip"
+
+
+def test_original_served_without_accept_encoding(static_client, static_dir):
+    resp = static_client.get("/static/app.js", headers={"Accept-Encoding": ""})
+    assert "Content-Encoding" not in resp.headers
+    assert "Accept-Encoding" in resp.headers["Vary"]
+    assert resp.content == (static_dir / "app.js").read_bytes()
+
+
+def test_precompressed_variant_not_modified(static_client):
+    headers = {"Accept-Encoding": "br"}
+    etag = static_client.get("/static/app.js", headers=headers).headers["ETag"]
+    resp = static_client.get(
+        "/static/app.js", headers={**headers, "If-None-Match": etag}
+    )
+    assert resp.status_code == 304
@@ -0,0 +1,31 @@
+"""Tests for the per-request deadline."""
+
+import time
+
+import pytest
+
+from app.models import DeadlineExceeded, ParseError
+from app.parser.deadline import Deadline
+
+
+def test_remaining_counts_down():
+    deadline = Deadline(60)
+    first = deadline.remaining()
+    time.sleep(0.01)
+    assert 0 < deadline.remaining() < first <= 60
+    assert not deadline.expired()
+
+
+def test_expired_deadline_has_no_time_left():
+    deadline = Deadline(0)
+    assert deadline.remaining() == 0
+    assert deadline.expired()
+
+
+def test_check_raises_distinct_parse_error():
+    Deadline(60).check("download")
+    with pytest.raises(DeadlineExceeded) as exc_info:
+        Deadline(0).check("download")
+    assert isinstance(exc_info.value, ParseError)
+    assert exc_info.value.error_type == "timeout"
+    assert exc_info.value.stage == "download"
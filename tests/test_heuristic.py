@@ -1,27 +1,7 @@
 """Tests for the heuristic (Tier 3) parser."""
 
 from app.parser.heuristic import extract_heuristic
-
-HEURISTIC_FULL_HTML = """
-<html>
-<head><title>Best Pancakes — My Food Blog</title></head>
-<body>
-<h1>Best Pancakes Ever</h1>
-<p>Long story about my grandma...</p>
-<h2>Ingredients</h2>
-<ul>
-    <li>1 cup flour</li>
-    <li>1 egg</li>
-    <li>1 cup milk</li>
-</ul>
-<h2>Directions</h2>
-<ol>
-    <li>Mix dry ingredients.</li>
-    <li>Add wet ingredients and stir.</li>
-    <li>Cook on griddle.</li>
-</ol>
-</body></html>
-"""
+from tests.fixtures import HEURISTIC_FULL_HTML, HEURISTIC_LABEL_IN_P_HTML
 
 HEURISTIC_INGREDIENTS_ONLY_HTML = """
 <html><body>
@@ -44,12 +24,6 @@ HEURISTIC_NO_RECIPE_HTML = """
 </body></html>
 """
 
-HEURISTIC_LABEL_IN_P_HTML = """
-<html><body>
-<p><strong>Ingredients:</strong></p>
-<ul><li>flour</li><li>water</li></ul>
-</body></html>
-"""
 
 HEURISTIC_METHOD_LABEL_HTML = """
 <html><body>
@@ -157,3 +131,28 @@ def test_title_fallback():
     recipe = extract_heuristic(HEURISTIC_NO_TITLE_HTML, URL)
     assert recipe is not None
     assert recipe.title == "Untitled Recipe"
+
+
+# -- Label/list matching --
+
+
+def test_label_with_empty_list_falls_through_to_next_label():
+    html = """
+    <html><body>
+    <h2>Ingredients</h2><ul></ul>
+    <h3>Ingredients</h3><ul><li>sugar</li></ul>
+    <h3>Steps</h3><ol><li>Stir.</li></ol>
+    </body></html>
+    """
+    recipe = extract_heuristic(html, URL)
+    assert recipe is not None
+    assert recipe.ingredients == ["sugar"]
+    assert recipe.steps == ["Stir."]
+
+
+def test_many_matching_labels_without_lists():
+    labels = "<h3>Steps to success</h3><p>Story.</p>" * 500
+    html = f"<html><body>{labels}<ol></ol><h2>Method</h2><ol><li>Bake.</li></ol>"
+    recipe = extract_heuristic(html, URL)
+    assert recipe is not None
+    assert recipe.steps == ["Bake."]
@@ -1,6 +1,7 @@
 """Tests for ingredient string parsing."""
 
 from app.models import ParsedIngredient, Recipe
+from app.parser.deadline import Deadline
 from app.parser.ingredients import _parse_single, enrich_recipe
 
 # -- _parse_single tests --
@@ -143,3 +144,15 @@ def test_enrich_recipe_graceful_fallback():
     # Both should have raw preserved
     assert recipe.parsed_ingredients[0].raw == "2 cups flour"
     assert recipe.parsed_ingredients[1].raw == "a generous handful of love"
+
+
+def test_enrich_recipe_stops_at_deadline():
+    recipe = Recipe(
+        title="Test",
+        source_url="https://example.com",
+        ingredients=["2 cups flour"],
+        steps=["Mix."],
+    )
+    enrich_recipe(recipe, Deadline(0))
+    assert recipe.parsed_ingredients is None
+    assert recipe.step_links is None
@@ -0,0 +1,110 @@
+"""Tests for server-side ingredient-to-step linking."""
+
+from app.models import ParsedIngredient
+from app.parser.linking import build_variants, link_ingredients
+
+
+def _ings(*names: str) -> list[ParsedIngredient]:
+    return [ParsedIngredient(raw=name, name=name) for name in names]
+
+
+def _mentions(step: str, spans) -> list[tuple[int, str]]:
+    return [(idx, step[start:end]) for idx, start, end in spans]
+
+
+# -- build_variants --
+
+
+def test_variants_include_plurals():
+    variants = build_variants("egg")
+    assert "egg" in variants
+    assert "eggs" in variants
+
+
+def test_variants_strip_modifiers():
+    variants = build_variants("unsalted butter")
+    assert "butter" in variants
+
+
+def test_variants_head_and_tail():
+    variants = build_variants("chicken breast halves")
+    assert "breast halves" in variants
+    assert "chicken breast" in variants
+
+
+def test_variants_alternate_spellings():
+    assert "chilli flakes" in build_variants("chili flakes")
+    assert "yoghurt" in build_variants("yogurt")
+
+
+def test_variants_skip_short():
+    assert all(len(v) >= 3 for v in build_variants("oil"))
+
+
+# -- link_ingredients --
+
+
+def test_links_simple_mentions():
+    steps = ["Whisk the eggs and sugar.", "Fold in the flour."]
+    links = link_ingredients(_ings("egg", "sugar", "flour"), steps)
+    assert _mentions(steps[0], links[0]) == [(0, "eggs"), (1, "sugar")]
+    assert _mentions(steps[1], links[1]) == [(2, "flour")]
+
+
+def test_links_case_insensitive():
+    steps = ["Melt the Butter."]
+    links = link_ingredients(_ings("unsalted butter"), steps)
+    assert _mentions(steps[0], links[0]) == [(0, "Butter")]
+
+
+def test_links_respect_word_boundaries():
+    steps = ["Add the oats, then the saltine crackers."]
+    links = link_ingredients(_ings("oat", "salt"), steps)
+    assert _mentions(steps[0], links[0]) == [(0, "oats")]
+
+
+def test_links_prefer_longer_match():
+    steps = ["Drizzle with olive oil."]
+    links = link_ingredients(_ings("extra-virgin olive oil"), steps)
+    assert _mentions(steps[0], links[0]) == [(0, "olive oil")]
+
+
+def test_links_skip_ambiguous_compounds():
+    steps = ["Dice the bell pepper, then season with black pepper."]
+    links = link_ingredients(_ings("black pepper"), steps)
+    assert _mentions(steps[0], links[0]) == [(0, "black pepper")]
+
+
+def test_links_skip_ambiguous_powder():
+    steps = ["Sift the flour with the baking powder."]
+    links = link_ingredients(_ings("chili powder", "flour"), steps)
+    assert _mentions(steps[0], links[0]) == [(1, "flour")]
+
+
+def test_links_shared_variant_links_both_ingredients():
+    steps = ["Add the cheese."]
+    links = link_ingredients(_ings("cheddar cheese", "parmesan cheese"), steps)
+    assert sorted(idx for idx, _, _ in links[0]) == [0, 1]
+
+
+def test_links_skip_short_names():
+    links = link_ingredients(_ings("ok"), ["ok then"])
+    assert links == [[]]
+
+
+def test_links_empty():
+    assert link_ingredients([], ["Step one.", "Step two."]) == [[], []]
+
+
+def test_links_use_utf16_offsets():
+    step = "🔥 Sear the beef."
+    links = link_ingredients(_ings("beef"), [step])
+    [(_, start, end)] = links[0]
+    encoded = step.encode("utf-16-le")
+    assert encoded[start * 2 : end * 2].decode("utf-16-le") == "beef"
+
+
+def test_links_offsets_survive_lowercase_that_changes_length():
+    # "İ" lowercases to two characters
+    assert link_ingredients(_ings("salt"), ["İİİ add salt"]) == [[(0, 8, 12)]]
+    assert link_ingredients(_ings("salt"), ["🍮 İsalt"]) == [[(0, 4, 8)]]
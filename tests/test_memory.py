@@ -0,0 +1,118 @@
+"""Tests for the memory budget and memory reporting."""
+
+import asyncio
+import tracemalloc
+
+import pytest
+
+from app import request_log
+from app.models import DeadlineExceeded
+from app.parser import memory
+from app.parser.deadline import Deadline
+
+
+@pytest.fixture()
+def budget(monkeypatch):
+    """A budget of 100 bytes per byte of HTML (room for 100 bytes of page)."""
+    monkeypatch.setattr(memory, "MEMORY_BUDGET", memory.estimate(100))
+    monkeypatch.setattr(memory, "_DEFAULT_PAGE_BYTES", 30)
+    monkeypatch.setattr(memory, "_reserved", 0)
+    monkeypatch.setattr(memory, "_growing", 0)
+    monkeypatch.setattr(memory, "_waiters", memory._waiters.__class__())
+
+
+@pytest.mark.anyio
+async def test_reservation_is_a_no_op_without_budget(monkeypatch):
+    monkeypatch.setattr(memory, "MEMORY_BUDGET", None)
+    async with memory.reservation(Deadline(1)):
+        await memory.resize(10**9, Deadline(1))
+    assert memory.stats() is None
+
+
+@pytest.mark.anyio
+async def test_reservations_wait_for_room(budget):
+    order = []
+
+    async def fetch(name: str, page_bytes: int) -> None:
+        async with memory.reservation(Deadline(5)):
+            await memory.resize(page_bytes, Deadline(5))
+            order.append(f"{name} start")
+            await asyncio.sleep(0.01)
+            order.append(f"{name} end")
+
+    await asyncio.gather(fetch("big", 80), fetch("small", 30))
+    # The small page fit before the big one grew, then waited for it
+    assert order[0] == "big start"
+    assert order.index("small start") > order.index("big end")
+    assert memory.stats()["reserved"] == 0
+
+
+@pytest.mark.anyio
+async def test_growing_reservation_goes_before_new_ones(budget):
+    order = []
+
+    async def fetch(name: str, page_bytes: int, delay: float) -> None:
+        await asyncio.sleep(delay)
+        async with memory.reservation(Deadline(5)):
+            await asyncio.sleep(0.01)  # download
+            await memory.resize(page_bytes, Deadline(5))
+            order.append(name)
+            await asyncio.sleep(0.01)
+
+    # "late" arrives while "grown" waits to go from 30 to 90 bytes of page, and
+    # would fit beside "first"
+    await asyncio.gather(
+        fetch("first", 30, 0), fetch("grown", 90, 0), fetch("late", 10, 0.015)
+    )
+    assert order == ["first", "grown", "late"]
+
+
+@pytest.mark.anyio
+async def test_resize_shrinks_reservation(budget):
+    async with memory.reservation(Deadline(1)):
+        await memory.resize(10, Deadline(1))
+        assert memory.stats()["reserved"] == memory.estimate(10)
+        # A page bigger than the budget gets all of it
+        await memory.resize(1000, Deadline(1))
+        assert memory.stats()["reserved"] == memory.MEMORY_BUDGET
+    assert memory.stats()["reserved"] == 0
+
+
+@pytest.mark.anyio
+async def test_waiting_past_deadline_raises(budget):
+    async with memory.reservation(Deadline(1)):
+        await memory.resize(100, Deadline(1))
+        with pytest.raises(DeadlineExceeded) as exc_info:
+            async with memory.reservation(Deadline(0.05)):
+                pass
+    assert exc_info.value.stage == "memory budget"
+    assert memory.stats() == {
+        "budget": memory.MEMORY_BUDGET,
+        "reserved": 0,
+        "waiting": 0,
+    }
+
+
+def test_traced_records_peak_allocation():
+    record = {}
+    token = request_log._current.set(record)
+    tracemalloc.start()
+    try:
+        with memory.traced("Tier 3 (heuristic)"):
+            block = bytearray(2_000_000)
+            del block
+    finally:
+        tracemalloc.stop()
+        request_log._current.reset(token)
+    assert record["memory_peak_kb"]["Tier 3 (heuristic)"] >= 2000
+
+
+def test_traced_is_silent_without_tracemalloc():
+    record = {}
+    token = request_log._current.set(record)
+    try:
+        with memory.traced("Tier 3 (heuristic)"):
+            pass
+    finally:
+        request_log._current.reset(token)
+    assert record == {}
@@ -1,61 +1,49 @@
 """Tests for the recipe parsing pipeline."""
 
-from unittest.mock import AsyncMock, patch
+import asyncio
+import json
+import subprocess
+import sys
+from unittest.mock import patch
 
 import httpx
 import pytest
 
-from app.models import ParseError
-from app.parser.pipeline import _recipe_cache, parse_recipe
+from app.models import DeadlineExceeded, ParseError
+from app.parser.deadline import Deadline
+from app.parser.heuristic import extract_heuristic
+from app.parser.pipeline import (
+    _content_index,
+    _page_recipes,
+    _pending,
+    _recipe_cache,
+    enriched_recipe,
+    extract_recipe,
+    parse_recipe,
+    stats,
+    tiers_loaded,
+    warm_up,
+)
+from app.parser.scrapers import extract_with_scraper, scraper_class_for
+from app.parser.soup import shared_soup
 from app.parser.structured import (
     _normalize_instructions,
     _normalize_time,
+    extract_all_from_html,
+    extract_all_from_jsonld,
     extract_from_html,
+    recipe_jsonld_hash,
+)
+from app.parser.tiers import STRUCTURED_TIER
+from tests.fixtures import (
+    HEURISTIC_FALLBACK_HTML,
+    JSONLD_GRAPH_HTML,
+    JSONLD_RECIPE_HTML,
+    origin_client,
 )
-from app.parser.scrapers import extract_with_scraper
 
 # -- Fixtures: sample HTML snippets --
 
-JSONLD_RECIPE_HTML = """
-<html><head>
-<script type="application/ld+json">
-{
-    "@context": "https://schema.org",
-    "@type": "Recipe",
-    "name": "Test Cookies",
-    "recipeIngredient": ["1 cup flour", "1/2 cup sugar", "2 eggs"],
-    "recipeInstructions": [
-        {"@type": "HowToStep", "text": "Mix flour and sugar."},
-        {"@type": "HowToStep", "text": "Add eggs and stir."},
-        {"@type": "HowToStep", "text": "Bake at 350F for 12 minutes."}
-    ],
-    "prepTime": "PT10M",
-    "cookTime": "PT12M",
-    "recipeYield": "24 cookies",
-    "image": "https://example.com/cookies.jpg"
-}
-</script>
-</head><body></body></html>
-"""
-
-JSONLD_GRAPH_HTML = """
-<html><head>
-<script type="application/ld+json">
-{
-    "@context": "https://schema.org",
-    "@graph": [
-        {"@type": "WebPage", "name": "Blog Post"},
-        {
-            "@type": "Recipe",
-            "name": "Graph Soup",
-            "recipeIngredient": ["water", "salt"],
-            "recipeInstructions": "Boil water.\\nAdd salt."
-        }
-    ]
-}
-</script>
-</head><body></body></html>
-"""
 
 JSONLD_STRING_INSTRUCTIONS_HTML = """
 <html><head>
@@ -172,15 +160,30 @@ JSONLD_YIELD_LIST_HTML = """
 </head><body></body></html>
 """
 
-# HTML that has no structured data but has heuristic-parseable content
-HEURISTIC_FALLBACK_HTML = """
-<html><body>
-<h1>Grandma's Soup</h1>
-<h2>Ingredients</h2>
-<ul><li>water</li><li>salt</li></ul>
-<h2>Directions</h2>
-<ol><li>Boil water.</li><li>Add salt.</li></ol>
-</body></html>
+MULTI_RECIPE_HTML = """
+<html><head>
+<script type="application/ld+json">
+{"@context": "https://schema.org", "@type": "ItemList", "itemListElement": [
+  {"@type": "ListItem", "position": 1, "item": {"@type": "Recipe",
+   "name": "Pancakes", "recipeIngredient": ["1 cup flour", "1 egg"],
+   "recipeInstructions": ["Whisk.", "Fry."]}},
+  {"@type": "ListItem", "position": 2, "item": {"@type": "Recipe",
+   "name": "Maple Syrup Butter", "recipeIngredient": ["4 tbsp butter"],
+   "recipeInstructions": ["Beat in the syrup."]}}
+]}
+</script>
+<script type="application/ld+json">
+{"@context": "https://schema.org", "@graph": [
+  {"@type": "WebPage", "name": "Breakfast"},
+  {"@type": "Recipe", "name": "Fruit Salad", "recipeIngredient": ["2 apples"],
+   "recipeInstructions": ["Chop."]}
+]}
+</script>
+<script type="application/ld+json">
+{"@type": "Recipe", "name": "Pancakes", "recipeIngredient": ["1 cup flour", "1 egg"],
+ "recipeInstructions": ["Whisk.", "Fry."]}
+</script>
+</head><body></body></html>
 """
 
 
@@ -207,6 +210,37 @@ def test_extract_jsonld_graph():
     assert recipe.ingredients == ["water", "salt"]
 
 
+def test_extract_all_recipes_on_page():
+    recipes = extract_all_from_html(MULTI_RECIPE_HTML, "https://example.com/brunch")
+    # ItemList entries and @graph members, in page order, with the repeated
+    # Pancakes block dropped
+    assert [r.title for r in recipes] == [
+        "Pancakes",
+        "Maple Syrup Butter",
+        "Fruit Salad",
+    ]
+    assert recipes[1].ingredients == ["4 tbsp butter"]
+    assert extract_from_html(MULTI_RECIPE_HTML, "https://e.com").title == "Pancakes"
+
+
+def test_malformed_recipe_block_is_skipped():
+    good = {
+        "@type": "Recipe",
+        "name": "Good Soup",
+        "recipeIngredient": ["water"],
+        "recipeInstructions": ["Boil."],
+    }
+    bad = {**good, "name": ["Bad", "Name"], "image": {"url": ["a", "b"]}}
+    blocks = [json.dumps(good), json.dumps(bad)]
+    html = "".join(
+        f'<script type="application/ld+json">{block}</script>' for block in blocks
+    )
+    recipes = extract_all_from_jsonld(blocks, "https://example.com/soup")
+    assert [r.title for r in recipes] == ["Good Soup"]
+    recipe, tier = extract_recipe(html, "https://example.com/soup", enrich=False)
+    assert (recipe.title, tier) == ("Good Soup", STRUCTURED_TIER)
+
+
 def test_string_instructions_split():
     recipe = extract_from_html(
         JSONLD_STRING_INSTRUCTIONS_HTML, "https://example.com/toast"
@@ -260,6 +294,38 @@ def test_scraper_no_recipe():
     assert result is None
 
 
+def test_scraper_generic_schema_fallback():
+    result = extract_with_scraper("https://example.com/cookies", JSONLD_RECIPE_HTML)
+    assert result is not None
+    assert result.title == "Test Cookies"
+    assert result.ingredients == ["1 cup flour", "1/2 cup sugar", "2 eggs"]
+    assert result.prep_time == "10m"
+
+
+def test_scraper_skips_unsupported_site_without_structured_data():
+    with patch("app.parser.scrapers.scrape_html") as mock_scrape:
+        result = extract_with_scraper(
+            "https://example.com/pasta", HEURISTIC_FALLBACK_HTML
+        )
+    assert result is None
+    mock_scrape.assert_not_called()
+
+
+def test_scraper_class_lookup():
+    assert scraper_class_for("www.allrecipes.com").__name__ == "AllRecipes"
+    assert scraper_class_for("AllRecipes.com") is scraper_class_for("allrecipes.com")
+    assert scraper_class_for("example.com") is None
+
+
+def test_scraper_shares_parsed_tree_with_heuristic():
+    url = "https://www.allrecipes.com/recipe/1/pasta"
+    with shared_soup():
+        extract_with_scraper(url, HEURISTIC_FALLBACK_HTML)
+        with patch("app.parser.soup.BeautifulSoup") as mock_soup:
+            assert extract_heuristic(HEURISTIC_FALLBACK_HTML, url) is not None
+    mock_soup.assert_not_called()
+
+
 # -- Tests: error model --
 
 
@@ -331,26 +397,18 @@ def test_normalize_time_non_string():
 
 @pytest.fixture(autouse=True)
 def _clear_cache():
-    """Clear the recipe cache before each test to avoid cross-test pollution."""
+    """Clear the recipe caches before each test to avoid cross-test pollution."""
     _recipe_cache.clear()
-
-
-def _make_mock_response(html: str, status_code: int = 200) -> httpx.Response:
-    """Create a mock httpx.Response with the given HTML content."""
-    return httpx.Response(
-        status_code=status_code,
-        text=html,
-        request=httpx.Request("GET", "https://example.com"),
-    )
+    _content_index.clear()
+    _pending.clear()
+    _page_recipes.clear()
 
 
 @pytest.mark.anyio
 @patch("app.parser.pipeline.httpx.AsyncClient")
 async def test_pipeline_tier1_success(mock_client_cls):
     """parse_recipe returns Tier 1 result when structured data exists."""
-    mock_client = AsyncMock()
-    mock_client.get.return_value = _make_mock_response(JSONLD_RECIPE_HTML)
-    mock_client_cls.return_value.__aenter__.return_value = mock_client
+    mock_client_cls.side_effect = origin_client(JSONLD_RECIPE_HTML)
 
     recipe = await parse_recipe("https://example.com/cookies")
     assert recipe.title == "Test Cookies"
@@ -361,9 +419,7 @@ async def test_pipeline_tier1_success(mock_client_cls):
 @patch("app.parser.pipeline.httpx.AsyncClient")
 async def test_pipeline_falls_through_to_heuristic(mock_client_cls):
     """parse_recipe falls through to Tier 3 when Tier 1 and 2 fail."""
-    mock_client = AsyncMock()
-    mock_client.get.return_value = _make_mock_response(HEURISTIC_FALLBACK_HTML)
-    mock_client_cls.return_value.__aenter__.return_value = mock_client
+    mock_client_cls.side_effect = origin_client(HEURISTIC_FALLBACK_HTML)
 
     recipe = await parse_recipe("https://example.com/blog-recipe")
     assert recipe.title == "Grandma's Soup"
@@ -374,9 +430,7 @@ async def test_pipeline_falls_through_to_heuristic(mock_client_cls):
 @patch("app.parser.pipeline.httpx.AsyncClient")
 async def test_pipeline_no_recipe_raises(mock_client_cls):
     """parse_recipe raises ParseError when no tier finds a recipe."""
-    mock_client = AsyncMock()
-    mock_client.get.return_value = _make_mock_response(NO_RECIPE_HTML)
-    mock_client_cls.return_value.__aenter__.return_value = mock_client
+    mock_client_cls.side_effect = origin_client(NO_RECIPE_HTML)
 
     with pytest.raises(ParseError, match="No recipe found"):
         await parse_recipe("https://example.com/blog")
@@ -386,9 +440,7 @@ async def test_pipeline_no_recipe_raises(mock_client_cls):
 @patch("app.parser.pipeline.httpx.AsyncClient")
 async def test_pipeline_timeout(mock_client_cls):
     """parse_recipe raises ParseError on timeout."""
-    mock_client = AsyncMock()
-    mock_client.get.side_effect = httpx.TimeoutException("timed out")
-    mock_client_cls.return_value.__aenter__.return_value = mock_client
+    mock_client_cls.side_effect = origin_client(httpx.TimeoutException("timed out"))
 
     with pytest.raises(ParseError, match="timed out"):
         await parse_recipe("https://example.com/slow")
@@ -398,10 +450,7 @@ async def test_pipeline_timeout(mock_client_cls):
 @patch("app.parser.pipeline.httpx.AsyncClient")
 async def test_pipeline_http_error(mock_client_cls):
     """parse_recipe raises ParseError on HTTP error status."""
-    mock_client = AsyncMock()
-    resp = _make_mock_response("", status_code=403)
-    mock_client.get.return_value = resp
-    mock_client_cls.return_value.__aenter__.return_value = mock_client
+    mock_client_cls.side_effect = origin_client(httpx.Response(403))
 
     with pytest.raises(ParseError, match="blocked the request"):
         await parse_recipe("https://example.com/blocked")
@@ -411,9 +460,7 @@ async def test_pipeline_http_error(mock_client_cls):
 @patch("app.parser.pipeline.httpx.AsyncClient")
 async def test_pipeline_caches_result(mock_client_cls):
     """Second call for the same URL returns cached result without fetching."""
-    mock_client = AsyncMock()
-    mock_client.get.return_value = _make_mock_response(JSONLD_RECIPE_HTML)
-    mock_client_cls.return_value.__aenter__.return_value = mock_client
+    mock_client_cls.side_effect = origin_client(JSONLD_RECIPE_HTML)
 
     first = await parse_recipe("https://example.com/cookies")
     second = await parse_recipe("https://example.com/cookies")
@@ -421,3 +468,327 @@ async def test_pipeline_caches_result(mock_client_cls):
     assert first.title == second.title
     # httpx.AsyncClient should only have been constructed once
     assert mock_client_cls.call_count == 1
+
+
+# -- Tests: content-hash deduplication --
+
+
+SYNDICATED_HTML = """
+<html><head><title>Reposted</title>
+<script type="application/ld+json">
+{"@context": "https://schema.org", "@type": "Recipe", "name": "Test Cookies",
+ "url": "https://mirror.example.org/cookies",
+ "recipeIngredient": ["1 cup flour", "1/2 cup sugar", "2 eggs"],
+ "recipeInstructions": [
+    {"@type": "HowToStep", "text": "Mix flour and sugar."},
+    {"@type": "HowToStep", "text": "Add eggs and stir."},
+    {"@type": "HowToStep", "text": "Bake at 350F for 12 minutes."}],
+ "prepTime": "PT10M", "cookTime": "PT12M", "recipeYield": "24 cookies",
+ "image": "https://example.com/cookies.jpg"}
+</script></head><body><p>Shared from elsewhere.</p></body></html>
+"""
+
+
+def test_recipe_jsonld_hash_ignores_page_identity():
+    html = JSONLD_RECIPE_HTML.replace(
+        '"@type": "Recipe",', '"@type": "Recipe", "url": "https://a.example/x",'
+    )
+    assert recipe_jsonld_hash(html) == recipe_jsonld_hash(JSONLD_RECIPE_HTML)
+    assert recipe_jsonld_hash(html) is not None
+
+
+def test_recipe_jsonld_hash_without_recipe():
+    assert recipe_jsonld_hash(HEURISTIC_FALLBACK_HTML) is None
+    assert (
+        recipe_jsonld_hash('<script type="application/ld+json">{bad</script>') is None
+    )
+
+
+@pytest.mark.anyio
+@patch("app.parser.pipeline.httpx.AsyncClient")
+async def test_pipeline_reuses_identical_html(mock_client_cls):
+    """A new URL serving already-parsed HTML skips extraction entirely."""
+    mock_client_cls.side_effect = origin_client(JSONLD_RECIPE_HTML)
+
+    first = await parse_recipe("https://example.com/cookies")
+    with patch("app.parser.structured.extract_from_html") as mock_extract:
+        second = await parse_recipe("https://example.com/cookies?amp=1")
+
+    mock_extract.assert_not_called()
+    assert second.title == first.title
+    assert second.parsed_ingredients == first.parsed_ingredients
+    assert second.source_url == "https://example.com/cookies?amp=1"
+    assert first.source_url == "https://example.com/cookies"
+    assert _recipe_cache["https://example.com/cookies?amp=1"] is second
+
+
+@pytest.mark.anyio
+@patch("app.parser.pipeline.httpx.AsyncClient")
+async def test_pipeline_reuses_matching_jsonld_block(mock_client_cls):
+    """A different page carrying the same JSON-LD Recipe skips extraction."""
+    mock_client_cls.side_effect = origin_client(JSONLD_RECIPE_HTML, SYNDICATED_HTML)
+
+    first = await parse_recipe("https://example.com/cookies")
+    with patch("app.parser.structured.extract_from_html") as mock_extract:
+        second = await parse_recipe("https://mirror.example.org/cookies")
+
+    mock_extract.assert_not_called()
+    assert second.steps == first.steps
+    assert second.source_url == "https://mirror.example.org/cookies"
+
+
+# -- Tests: lazy tier imports --
+
+
+def test_app_import_defers_parser_dependencies():
+    code = (
+        "import sys, app.main; "
+        "print(sorted(m for m in ('extruct', 'recipe_scrapers', 'ingredient_parser')"
+        " if m in sys.modules))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    assert result.stdout.strip() == "[]"
+
+
+def test_warm_up_loads_tiers():
+    warm_up()
+    assert tiers_loaded()
+    assert "app.parser.structured" in sys.modules
+
+
+@pytest.mark.anyio
+@patch("app.parser.pipeline.httpx.AsyncClient")
+async def test_in_flight_count_released_after_error(mock_client_cls):
+    """The in-flight count reported to /readyz drops back after a failed fetch."""
+    mock_client_cls.side_effect = origin_client(httpx.TimeoutException("timed out"))
+
+    with pytest.raises(ParseError):
+        await parse_recipe("https://example.com/slow")
+    assert stats()["in_flight"] == 0
+
+
+# -- Tests: streaming parse --
+
+_AsyncClient = httpx.AsyncClient
+
+
+def _streaming_client(html: str, status_code: int = 200):
+    """An AsyncClient factory whose requests stream `html` in small chunks."""
+
+    async def chunks():
+        body = html.encode()
+        for i in range(0, len(body), 7):
+            yield body[i : i + 7]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(status_code, content=chunks())
+
+    return lambda **kwargs: _AsyncClient(
+        transport=httpx.MockTransport(handler), **kwargs
+    )
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize(
+    ("html", "title"),
+    [(JSONLD_RECIPE_HTML, "Test Cookies"), (HEURISTIC_FALLBACK_HTML, "Grandma's Soup")],
+)
+async def test_pipeline_streaming_parse(html, title):
+    with (
+        patch("app.parser.pipeline.STREAMING_PARSE", True),
+        patch("app.parser.pipeline.httpx.AsyncClient", _streaming_client(html)),
+    ):
+        recipe = await parse_recipe("https://example.com/streamed")
+    assert recipe.title == title
+    assert _content_index
+
+
+@pytest.mark.anyio
+async def test_pipeline_streaming_http_error():
+    with (
+        patch("app.parser.pipeline.STREAMING_PARSE", True),
+        patch(
+            "app.parser.pipeline.httpx.AsyncClient",
+            _streaming_client("", status_code=404),
+        ),
+        pytest.raises(ParseError, match="Page not found"),
+    ):
+        await parse_recipe("https://example.com/missing")
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("streaming", [False, True])
+async def test_pipeline_rejects_oversized_page(streaming):
+    with (
+        patch("app.parser.memory.MAX_HTML_BYTES", 100),
+        patch("app.parser.pipeline.STREAMING_PARSE", streaming),
+        patch(
+            "app.parser.pipeline.httpx.AsyncClient",
+            _streaming_client(HEURISTIC_FALLBACK_HTML),
+        ),
+        pytest.raises(ParseError) as exc_info,
+    ):
+        await parse_recipe("https://example.com/huge")
+    assert exc_info.value.error_type == "too_large"
+    assert stats()["in_flight"] == 0
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("streaming", [False, True])
+@pytest.mark.parametrize(
+    ("headers", "chunks_read"), [({}, 3), ({"Content-Length": "50000"}, 0)]
+)
+async def test_pipeline_abandons_oversized_download(streaming, headers, chunks_read):
+    """An oversized page is refused without downloading the rest of it."""
+    sent = 0
+
+    async def chunks():
+        nonlocal sent
+        for _ in range(1000):
+            sent += 1
+            yield b"x" * 50
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, headers=headers, content=chunks())
+
+    with (
+        patch("app.parser.memory.MAX_HTML_BYTES", 100),
+        patch("app.parser.pipeline.STREAMING_PARSE", streaming),
+        patch(
+            "app.parser.pipeline.httpx.AsyncClient",
+            lambda **kwargs: _AsyncClient(
+                transport=httpx.MockTransport(handler), **kwargs
+            ),
+        ),
+        pytest.raises(ParseError) as exc_info,
+    ):
+        await parse_recipe("https://example.com/huge")
+    assert exc_info.value.error_type == "too_large"
+    assert sent == chunks_read
+
+
+# -- Tests: deadline --
+
+
+@pytest.mark.anyio
+@patch("app.parser.pipeline.httpx.AsyncClient")
+async def test_pipeline_deadline_during_download(mock_client_cls):
+    async def slow_origin(request):
+        await asyncio.sleep(5)
+
+    mock_client_cls.side_effect = lambda **kwargs: _AsyncClient(
+        transport=httpx.MockTransport(slow_origin), **kwargs
+    )
+
+    with pytest.raises(DeadlineExceeded) as exc_info:
+        await parse_recipe("https://example.com/slow", deadline=Deadline(0.05))
+    assert exc_info.value.stage == "download"
+    assert stats()["in_flight"] == 0
+
+
+def test_extract_recipe_skips_page_parsing_tiers_without_budget():
+    with patch("app.parser.pipeline._SOUP_BYTES_PER_SECOND", 1):
+        _, tier = extract_recipe(
+            JSONLD_RECIPE_HTML, "https://e.com", None, Deadline(60)
+        )
+        assert tier == STRUCTURED_TIER
+        with pytest.raises(DeadlineExceeded):
+            extract_recipe(HEURISTIC_FALLBACK_HTML, "https://e.com", None, Deadline(60))
+
+
+@pytest.mark.anyio
+@patch("app.parser.pipeline.httpx.AsyncClient")
+async def test_pipeline_returns_unenriched_recipe_without_budget(mock_client_cls):
+    mock_client_cls.side_effect = origin_client(JSONLD_RECIPE_HTML)
+
+    with patch("app.parser.pipeline._ENRICH_SECONDS_PER_INGREDIENT", 3600):
+        recipe = await parse_recipe("https://example.com/cookies")
+    assert recipe.ingredients
+    assert recipe.parsed_ingredients is None
+    # Not cached, so a later request can parse the ingredients
+    assert "https://example.com/cookies" not in _recipe_cache
+    assert not _content_index
+
+
+# -- Tests: deferred enrichment --
+
+
+@pytest.mark.anyio
+@patch("app.parser.pipeline.httpx.AsyncClient")
+async def test_pipeline_defers_enrichment(mock_client_cls):
+    mock_client_cls.side_effect = origin_client(JSONLD_RECIPE_HTML)
+    url = "https://example.com/cookies"
+
+    recipe = await parse_recipe(url, enrich=False)
+    assert recipe.parsed_ingredients is None
+    assert url in _pending
+    assert stats()["pending_enrichment"] == 1
+    # A second render while parsing is under way doesn't fetch again
+    assert await parse_recipe(url, enrich=False) is recipe
+    assert mock_client_cls.call_count == 1
+
+    enriched = await enriched_recipe(url)
+    assert enriched.parsed_ingredients is not None
+    assert recipe.parsed_ingredients is None
+    assert _recipe_cache[url] is enriched
+    assert _content_index
+    assert not _pending
+    assert await parse_recipe(url) is enriched
+
+
+@pytest.mark.anyio
+async def test_enriched_recipe_unknown_url():
+    assert await enriched_recipe("https://example.com/unknown") is None
+
+
+# -- Tests: pages with several recipes --
+
+
+@pytest.mark.anyio
+@patch("app.parser.pipeline.httpx.AsyncClient")
+async def test_pipeline_picks_recipe_by_index(mock_client_cls):
+    mock_client_cls.side_effect = origin_client(MULTI_RECIPE_HTML)
+    url = "https://example.com/brunch"
+
+    butter = await parse_recipe(url, index=1)
+    assert butter.title == "Maple Syrup Butter"
+    assert butter.page_index == 1
+    assert butter.page_recipes == ["Pancakes", "Maple Syrup Butter", "Fruit Salad"]
+    assert butter.parsed_ingredients is not None
+    # Only the recipe asked for is enriched
+    assert all(r.parsed_ingredients is None for r in _page_recipes[url])
+    assert stats()["multi_recipe_pages"] == 1
+
+    # The other recipes come from the same fetch
+    pancakes = await parse_recipe(url)
+    assert pancakes.title == "Pancakes"
+    assert pancakes.parsed_ingredients is not None
+    assert mock_client_cls.call_count == 1
+    assert await parse_recipe(url, index=1) is butter
+
+
+@pytest.mark.anyio
+@patch("app.parser.pipeline.httpx.AsyncClient")
+async def test_pipeline_index_out_of_range(mock_client_cls):
+    mock_client_cls.side_effect = origin_client(JSONLD_RECIPE_HTML)
+
+    with pytest.raises(ParseError) as exc_info:
+        await parse_recipe("https://example.com/cookies", index=1)
+    assert exc_info.value.error_type == "validation"
+    assert "https://example.com/cookies" not in _recipe_cache
+
+
+@pytest.mark.anyio
+@patch("app.parser.pipeline.httpx.AsyncClient")
+async def test_pipeline_defers_enrichment_of_picked_recipe(mock_client_cls):
+    mock_client_cls.side_effect = origin_client(MULTI_RECIPE_HTML)
+    url = "https://example.com/brunch"
+
+    salad = await parse_recipe(url, enrich=False, index=2)
+    assert salad.title == "Fruit Salad"
+    assert salad.parsed_ingredients is None
+    enriched = await enriched_recipe(url, index=2)
+    assert enriched.parsed_ingredients is not None
+    assert await enriched_recipe(url) is None
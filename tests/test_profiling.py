@@ -0,0 +1,125 @@
+"""Tests for opt-in profiling of slow parses."""
+
+import json
+import marshal
+import pstats
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from app.models import ParseError
+from app.parser import profiling
+from app.parser.pipeline import (
+    _content_index,
+    _recipe_cache,
+    parse_recipe,
+)
+from app.parser.tiers import STRUCTURED_TIER
+from tests.fixtures import origin_client
+
+JSONLD_HTML = """
+<html><head><script type="application/ld+json">
+{"@type": "Recipe", "name": "Profiled Soup",
+ "recipeIngredient": ["1 cup water", "1 tsp salt"],
+ "recipeInstructions": ["Boil.", "Season."]}
+</script></head><body><p>Soup.</p></body></html>
+"""
+
+
+@pytest.fixture(autouse=True)
+def _reset(monkeypatch):
+    _recipe_cache.clear()
+    _content_index.clear()
+    profiling._captures.clear()
+    monkeypatch.setattr(profiling, "PROFILE_THRESHOLD", None)
+    monkeypatch.setattr(profiling, "PROFILE_SAMPLE_RATE", None)
+    monkeypatch.setattr(profiling, "PROFILE_DIR", None)
+
+
+@pytest.fixture()
+def mock_client():
+    with patch(
+        "app.parser.pipeline.httpx.AsyncClient", side_effect=origin_client(JSONLD_HTML)
+    ) as client_cls:
+        yield client_cls
+
+
+@pytest.mark.anyio
+async def test_disabled_by_default(mock_client):
+    await parse_recipe("https://example.com/soup")
+    assert profiling.captures() == []
+
+
+@pytest.mark.anyio
+async def test_sampled_parse_is_captured(mock_client, monkeypatch):
+    monkeypatch.setattr(profiling, "PROFILE_SAMPLE_RATE", 1.0)
+    await parse_recipe("https://example.com/soup")
+
+    [capture] = profiling.captures()
+    assert capture.url == "https://example.com/soup"
+    assert capture.tier == STRUCTURED_TIER
+    assert capture.html_bytes == len(JSONLD_HTML.encode())
+    assert capture.error_type is None
+    assert {"DNS lookup", "download", STRUCTURED_TIER} <= capture.stages.keys()
+    assert capture.total_seconds >= sum(capture.stages.values()) * 0.99
+
+    stats = marshal.loads(profiling.profile_data(capture.id))
+    assert any(func == "extract_page" for _, _, func in stats)
+    assert "extract_page" in profiling.profile_summary(capture.id)
+
+
+@pytest.mark.anyio
+async def test_threshold_keeps_only_slow_parses(mock_client, monkeypatch):
+    monkeypatch.setattr(profiling, "PROFILE_THRESHOLD", 60.0)
+    await parse_recipe("https://example.com/soup")
+    assert profiling.captures() == []
+
+    monkeypatch.setattr(profiling, "PROFILE_THRESHOLD", 0.0)
+    await parse_recipe("https://example.com/other-soup")
+    assert [c.url for c in profiling.captures()] == ["https://example.com/other-soup"]
+
+
+@pytest.mark.anyio
+async def test_failed_parse_is_captured_with_error_type(mock_client, monkeypatch):
+    monkeypatch.setattr(profiling, "PROFILE_SAMPLE_RATE", 1.0)
+    mock_client.side_effect = origin_client(httpx.TimeoutException("timed out"))
+    with pytest.raises(ParseError):
+        await parse_recipe("https://example.com/slow")
+
+    [capture] = profiling.captures()
+    assert capture.error_type == "network"
+    assert capture.tier is None
+    assert profiling.profile_data(capture.id) is None
+
+
+@pytest.mark.anyio
+async def test_captures_written_to_profile_dir(mock_client, monkeypatch, tmp_path):
+    monkeypatch.setattr(profiling, "PROFILE_SAMPLE_RATE", 1.0)
+    monkeypatch.setattr(profiling, "PROFILE_DIR", tmp_path)
+    await parse_recipe("https://example.com/soup")
+
+    [capture] = profiling.captures()
+    meta = json.loads((tmp_path / f"{capture.id}.json").read_text())
+    assert meta["url"] == "https://example.com/soup"
+    stats = pstats.Stats(str(tmp_path / f"{capture.id}.prof"))
+    assert stats.total_calls > 0
+
+
+@pytest.mark.anyio
+async def test_keeps_latest_captures(monkeypatch):
+    monkeypatch.setattr(profiling, "PROFILE_SAMPLE_RATE", 1.0)
+    monkeypatch.setattr(profiling, "MAX_CAPTURES", 2)
+    for i in range(3):
+        async with profiling.capture(f"https://example.com/{i}"):
+            pass
+    assert [c.url for c in profiling.captures()] == [
+        "https://example.com/2",
+        "https://example.com/1",
+    ]
+
+
+def test_helpers_are_no_ops_outside_a_capture():
+    with profiling.stage("download"), profiling.profiled():
+        profiling.annotate(tier="Tier 3 (heuristic)", html_bytes=10)
+    assert profiling.captures() == []
@@ -0,0 +1,147 @@
+"""Tests for structured request logging."""
+
+import json
+import logging
+import queue
+from logging.handlers import QueueHandler
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import request_log
+from app.main import _page_cache, app, limiter
+from app.models import ParseError
+from app.parser import pipeline
+from app.parser.pipeline import _content_index, _recipe_cache
+from app.parser.tiers import STRUCTURED_TIER
+from tests.fixtures import origin_client
+
+JSONLD_HTML = """
+<html><head><script type="application/ld+json">
+{"@type": "Recipe", "name": "Logged Soup",
+ "recipeIngredient": ["1 cup water"], "recipeInstructions": ["Boil."]}
+</script></head><body></body></html>
+"""
+
+
+@pytest.fixture(autouse=True)
+def _clear_caches(monkeypatch):
+    # These tests fetch more than the routes' rate limits allow
+    monkeypatch.setattr(limiter, "enabled", False)
+    _page_cache.clear()
+    _recipe_cache.clear()
+    _content_index.clear()
+
+
+@pytest.fixture()
+def client():
+    return TestClient(app)
+
+
+def _request_records(caplog) -> list[dict]:
+    return [r.request for r in caplog.records if r.name == "app.request"]
+
+
+@pytest.fixture()
+def mock_origin():
+    # Loaded up front: the first parse would otherwise log the warm-up at INFO
+    pipeline.warm_up()
+    with patch(
+        "app.parser.pipeline.httpx.AsyncClient", side_effect=origin_client(JSONLD_HTML)
+    ) as client_cls:
+        yield client_cls
+
+
+def test_json_formatter_inlines_request_fields():
+    record = logging.LogRecord(
+        "app.request", logging.INFO, __file__, 1, "GET %s", ("/recipe",), None
+    )
+    record.request = {"status": 200, "cache": "miss"}
+    entry = json.loads(request_log.JsonFormatter().format(record))
+    assert entry["message"] == "GET /recipe"
+    assert entry["level"] == "INFO"
+    assert entry["status"] == 200
+    assert entry["cache"] == "miss"
+
+
+def test_queued_records_keep_exc_info():
+    log_queue = queue.SimpleQueue()
+    handler = request_log._QueueHandler(log_queue)
+    test_logger = logging.getLogger("tests.request_log")
+    test_logger.addHandler(handler)
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        test_logger.exception("Failed on %s", "soup")
+    finally:
+        test_logger.removeHandler(handler)
+    entry = json.loads(request_log.JsonFormatter().format(log_queue.get_nowait()))
+    assert entry["message"] == "Failed on soup"
+    assert "ValueError: boom" in entry["exc_info"]
+
+
+def test_logging_goes_through_one_queue_handler():
+    request_log.configure_logging()
+    handlers = logging.getLogger().handlers
+    assert sum(isinstance(h, QueueHandler) for h in handlers) == 1
+
+
+def test_one_record_per_parsed_request(client, mock_origin, caplog):
+    caplog.set_level(logging.DEBUG)
+    resp = client.get("/api/recipe", params={"url": "https://example.com/soup"})
+    assert resp.status_code == 200
+
+    [record] = _request_records(caplog)
+    assert record["method"] == "GET"
+    assert record["path"] == "/api/recipe"
+    assert record["status"] == 200
+    assert record["url"] == "https://example.com/soup"
+    assert record["cache"] == "miss"
+    assert record["tier"] == STRUCTURED_TIER
+    assert record["html_bytes"] == len(JSONLD_HTML.encode())
+    assert record["bytes"] == len(resp.content)
+    assert {"DNS lookup", "download", STRUCTURED_TIER} <= record["timings_ms"].keys()
+    assert record["duration_ms"] > 0
+    assert record["max_rss_mb"] > 0
+    # The per-stage INFO lines are gone
+    assert not [
+        r
+        for r in caplog.records
+        if r.name == "app.parser.pipeline" and r.levelno >= logging.INFO
+    ]
+
+
+def test_cache_hits_are_sampled(client, mock_origin, caplog):
+    params = {"url": "https://example.com/soup"}
+    client.get("/api/recipe", params=params)
+
+    caplog.clear()
+    with patch.object(request_log, "CACHE_HIT_SAMPLE_RATE", 0.0):
+        client.get("/api/recipe", params=params)
+    assert _request_records(caplog) == []
+
+    with patch.object(request_log, "CACHE_HIT_SAMPLE_RATE", 1.0):
+        client.get("/api/recipe", params=params)
+    [record] = _request_records(caplog)
+    assert record["cache"] == "recipe"
+    assert record["sample_rate"] == 1.0
+
+
+def test_page_cache_hit_is_recorded(client, mock_origin, caplog):
+    params = {"url": "https://example.com/soup"}
+    client.get("/recipe", params=params)
+    caplog.clear()
+    with patch.object(request_log, "CACHE_HIT_SAMPLE_RATE", 1.0):
+        client.get("/recipe", params=params)
+    [record] = _request_records(caplog)
+    assert record["cache"] == "page"
+
+
+@patch("app.main.parse_recipe", new_callable=AsyncMock)
+def test_errors_are_logged_as_warnings(mock_parse, client, caplog):
+    mock_parse.side_effect = ParseError("parse", "No recipe found.")
+    client.get("/recipe", params={"url": "https://example.com/blog"})
+    [record] = [r for r in caplog.records if r.name == "app.request"]
+    assert record.levelno == logging.WARNING
+    assert record.request["error_type"] == "parse"
@@ -1,12 +1,30 @@
 """Tests for FastAPI route handlers."""
 
+import asyncio
+import json
+import marshal
+import time
+from email.utils import formatdate
 from unittest.mock import AsyncMock, patch
 
 import pytest
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
 from fastapi.testclient import TestClient
 
-from app.main import app
-from app.models import ParseError, Recipe
+from app.main import (
+    SecurityHeadersMiddleware,
+    _page_cache,
+    _page_key,
+    app,
+    limiter,
+    static_files,
+)
+from app.models import DeadlineExceeded, ParsedIngredient, ParseError, Recipe
+from app.parser import profiling
+from app.parser.pipeline import _content_index, _recipe_cache
+from app.parser.reparse import ReparseReport
+from tests.fixtures import JSONLD_RECIPE_HTML, origin_client
 
 
 @pytest.fixture()
@@ -14,14 +32,30 @@ def client():
     return TestClient(app)
 
 
+@pytest.fixture(autouse=True)
+def _clear_page_cache(monkeypatch):
+    """Clear rendered pages so one test's recipe can't leak into another."""
+    # There are more recipe route tests than the routes' rate limits allow
+    monkeypatch.setattr(limiter, "enabled", False)
+    _page_cache.clear()
+
+
 SAMPLE_RECIPE = Recipe(
     title="Test Soup",
     source_url="https://example.com/soup",
     ingredients=["water", "salt"],
     steps=["Boil water.", "Add salt."],
+    parsed_ingredients=[
+        ParsedIngredient(raw="water", name="water"),
+        ParsedIngredient(raw="salt", name="salt"),
+    ],
 )
 
 
+# What parse_recipe returns when ingredient parsing was deferred or skipped
+UNPARSED_RECIPE = SAMPLE_RECIPE.model_copy(update={"parsed_ingredients": None})
+
+
 # -- Homepage --
 
 
@@ -44,6 +78,364 @@ def test_recipe_success(mock_parse, client):
     assert "Boil water." in resp.text
 
 
+# -- Recipe route: pages with several recipes --
+
+
+@patch("app.main.parse_recipe", new_callable=AsyncMock)
+def test_recipe_index_picks_recipe_and_links_the_others(mock_parse, client):
+    mock_parse.return_value = SAMPLE_RECIPE.model_copy(
+        update={"page_recipes": ["Test Soup", "Croutons"], "page_index": 0}
+    )
+    resp = client.get("/recipe", params={"url": "https://example.com/soup#croutons"})
+    assert mock_parse.call_args.args[0] == "https://example.com/soup"
+    assert mock_parse.call_args.kwargs["index"] == 0
+    assert '<span aria-current="page">Test Soup</span>' in resp.text
+    assert (
+        '<a href="/recipe?url=https%3A%2F%2Fexample.com%2Fsoup&amp;index=1">'
+        "Croutons</a>"
+    ) in resp.text
+
+    client.get("/recipe", params={"url": "https://example.com/soup", "index": "1"})
+    assert mock_parse.call_args.kwargs["index"] == 1
+    assert _page_key("https://example.com/soup", 1.0, 1) in _page_cache
+
+
+@patch("app.main.parse_recipe", new_callable=AsyncMock)
+def test_recipe_single_recipe_page_has_no_recipe_links(mock_parse, client):
+    mock_parse.return_value = SAMPLE_RECIPE
+    resp = client.get("/recipe", params={"url": "https://example.com/soup"})
+    assert "page-recipes" not in resp.text
+
+
+@patch("app.main.parse_recipe", new_callable=AsyncMock)
+def test_recipe_api_passes_index(mock_parse, client):
+    mock_parse.return_value = SAMPLE_RECIPE
+    client.get("/api/recipe", params={"url": "https://example.com/soup", "index": "2"})
+    assert mock_parse.call_args.kwargs["index"] == 2
+
+
+# -- Recipe route: rendered page cache --
+
+
+@patch("app.main.parse_recipe", new_callable=AsyncMock)
+def test_recipe_page_cache_hit_skips_parse_and_render(mock_parse, client):
+    mock_parse.return_value = SAMPLE_RECIPE
+    first = client.get("/recipe", params={"url": "https://example.com/soup"})
+    with patch("app.main.templates.TemplateResponse") as mock_render:
+        second = client.get("/recipe", params={"url": "https://example.com/soup"})
+    assert mock_parse.call_count == 1
+    mock_render.assert_not_called()
+    assert second.status_code == 200
+    assert second.text == first.text
+
+
+@patch("app.main.parse_recipe", new_callable=AsyncMock)
+def test_recipe_page_cache_keyed_by_normalized_url(mock_parse, client):
+    mock_parse.return_value = SAMPLE_RECIPE
+    client.get("/recipe", params={"url": "example.com/soup"})
+    assert _page_key("https://example.com/soup") in _page_cache
+
+
+@patch("app.main.parse_recipe", new_callable=AsyncMock)
+def test_recipe_page_cache_skips_errors(mock_parse, client):
+    mock_parse.side_effect = ParseError("parse", "No recipe found on that page.")
+    client.get("/recipe", params={"url": "https://example.com/blog"})
+    assert len(_page_cache) == 0
+
+
+@patch("app.main.parse_recipe", new_callable=AsyncMock)
+def test_recipe_page_cache_keyed_by_template_version(mock_parse, client):
+    mock_parse.return_value = SAMPLE_RECIPE
+    client.get("/recipe", params={"url": "https://example.com/soup"})
+    with patch("app.main.TEMPLATE_VERSION", "changed"):
+        client.get("/recipe", params={"url": "https://example.com/soup"})
+    assert mock_parse.call_count == 2
+
+
+# -- Recipe route: HTTP caching --
+
+
+@patch("app.main.parse_recipe", new_callable=AsyncMock)
+def test_recipe_caching_headers(mock_parse, client):
+    mock_parse.return_value = SAMPLE_RECIPE
+    resp = client.get("/recipe", params={"url": "https://example.com/soup"})
+    assert resp.headers["ETag"].startswith('"')
+    assert "Last-Modified" in resp.headers
+    assert "max-age" in resp.headers["Cache-Control"]
+
+    cached = client.get("/recipe", params={"url": "https://example.com/soup"})
+    assert cached.headers["ETag"] == resp.headers["ETag"]
+    assert cached.headers["Last-Modified"] == resp.headers["Last-Modified"]
+
+
+@patch("app.main.parse_recipe", new_callable=AsyncMock)
+def test_recipe_if_none_match_returns_304(mock_parse, client):
+    mock_parse.return_value = SAMPLE_RECIPE
+    params = {"url": "https://example.com/soup"}
+    etag = client.get("/recipe", params=params).headers["ETag"]
+
+    with patch("app.main.templates.TemplateResponse") as mock_render:
+        resp = client.get("/recipe", params=params, headers={"If-None-Match": etag})
+    mock_render.assert_not_called()
+    assert resp.status_code == 304
+    assert resp.content == b""
+    assert resp.headers["ETag"] == etag
+
+
+@patch("app.main.parse_recipe", new_callable=AsyncMock)
+def test_recipe_if_none_match_on_page_cache_miss(mock_parse, client):
+    """A matching ETag is honoured, without rendering, after the page was evicted."""
+    mock_parse.return_value = SAMPLE_RECIPE
+    params = {"url": "https://example.com/soup"}
+    etag = client.get("/recipe", params=params).headers["ETag"]
+    _page_cache.clear()
+
+    with patch("app.main.templates.TemplateResponse") as mock_render:
+        resp = client.get("/recipe", params=params, headers={"If-None-Match": etag})
+    mock_render.assert_not_called()
+    assert resp.status_code == 304
+    assert resp.headers["ETag"] == etag
+    # Only a rendered page is cached
+    assert not _page_cache
+
+
+@patch("app.main.parse_recipe", new_callable=AsyncMock)
+def test_recipe_stale_etag_returns_page(mock_parse, client):
+    mock_parse.return_value = SAMPLE_RECIPE
+    params = {"url": "https://example.com/soup"}
+    resp = client.get("/recipe", params=params, headers={"If-None-Match": '"stale"'})
+    assert resp.status_code == 200
+    assert "Test Soup" in resp.text
+
+
+@patch("app.main.parse_recipe", new_callable=AsyncMock)
+def test_recipe_if_modified_since_returns_304(mock_parse, client):
+    mock_parse.return_value = SAMPLE_RECIPE
+    params = {"url": "https://example.com/soup"}
+    last_modified = client.get("/recipe", params=params).headers["Last-Modified"]
+    resp = client.get(
+        "/recipe", params=params, headers={"If-Modified-Since": last_modified}
+    )
+    assert resp.status_code == 304
+
+
+@patch("app.main.parse_recipe", new_callable=AsyncMock)
+def test_recipe_last_modified_is_when_recipe_was_cached(mock_parse, client):
+    mock_parse.return_value = SAMPLE_RECIPE
+    params = {"url": "https://example.com/soup"}
+    cached_at = time.time() - 3600
+    with patch("app.main.pipeline.cached_at", return_value=cached_at) as when:
+        resp = client.get("/recipe", params=params)
+    when.assert_called_once_with("https://example.com/soup", 0)
+    assert resp.headers["Last-Modified"] == formatdate(cached_at, usegmt=True)
+
+    # A recipe cached after the client's copy was made is new to it
+    _page_cache.clear()
+    with patch("app.main.pipeline.cached_at", return_value=time.time() + 60):
+        resp = client.get(
+            "/recipe",
+            params=params,
+            headers={"If-Modified-Since": formatdate(time.time(), usegmt=True)},
+        )
+    assert resp.status_code == 200
+
+
+# -- Static assets --
+
+
+def test_pages_link_fingerprinted_static_assets(client):
+    resp = client.get("/")
+    assert static_files.url_for("app.js") in resp.text
+    assert "?v=" in static_files.url_for("app.js")
+
+
+def test_fingerprinted_static_asset_is_immutable(client):
+    resp = client.get(static_files.url_for("style.css"))
+    assert resp.status_code == 200
+    assert "immutable" in resp.headers["Cache-Control"]
+
+
+def test_unversioned_static_asset_revalidates(client):
+    resp = client.get("/static/style.css", params={"v": "outdated"})
+    assert resp.headers["Cache-Control"] == "no-cache"
+    etag = resp.headers["ETag"]
+    resp = client.get("/static/style.css", headers={"If-None-Match": etag})
+    assert resp.status_code == 304
+
+
+# -- Recipe scaling --
+
+SCALABLE_RECIPE = Recipe(
+    title="Test Bread",
+    source_url="https://example.com/bread",
+    ingredients=["3/4 cup milk", "salt"],
+    parsed_ingredients=[
+        ParsedIngredient(raw="3/4 cup milk", amount=0.75, unit="cup", name="milk"),
+        ParsedIngredient(raw="salt", name="salt"),
+    ],
+    steps=["Mix."],
+)
+
+
+@patch("app.main.parse_recipe", new_callable=AsyncMock)
+def test_recipe_scale_renders_scaled_ingredients(mock_parse, client):
+    mock_parse.return_value = SCALABLE_RECIPE
+    resp = client.get(
+        "/recipe", params={"url": "https://example.com/bread", "scale": "0.5"}
+    )
+    assert resp.status_code == 200
+    assert 'data-tip-short="= ¼ cup + 2 tbsp"' in resp.text
+    assert "⅜ cup</span> milk" in resp.text
+    assert 'class="scale-btn active" data-scale="0.5"' in resp.text
+    assert 'id="scale-controls" hidden' not in resp.text
+
+
+@patch("app.main.parse_recipe", new_callable=AsyncMock)
+def test_recipe_embeds_precomputed_scaled_views(mock_parse, client):
+    mock_parse.return_value = SCALABLE_RECIPE
+    resp = client.get("/recipe", params={"url": "https://example.com/bread"})
+    data_json = resp.text.split('id="recipe-data" type="application/json">')[1]
+    data = json.loads(data_json.split("</script>")[0])
+    assert set(data["scaled"]) == {"0.5", "1", "2", "3"}
+    assert data["scaled"]["2"][0]["text"] == "1½ cups milk"
+    assert data["scaled"]["1"][0] == {"text": "3/4 cup milk"}
+
+
+@patch("app.main.parse_recipe", new_callable=AsyncMock)
+def test_recipe_page_cache_keyed_by_scale(mock_parse, client):
+    mock_parse.return_value = SCALABLE_RECIPE
+    params = {"url": "https://example.com/bread"}
+    default = client.get("/recipe", params=params)
+    doubled = client.get("/recipe", params={**params, "scale": "2"})
+    assert _page_key("https://example.com/bread", 2.0) in _page_cache
+    assert default.headers["ETag"] != doubled.headers["ETag"]
+
+
+# -- Deferred enrichment --
+
+
+@patch("app.main.DEFER_ENRICHMENT", True)
+@patch("app.main.parse_recipe", new_callable=AsyncMock)
+def test_recipe_deferred_enrichment_renders_without_data(mock_parse, client):
+    mock_parse.return_value = UNPARSED_RECIPE
+    resp = client.get("/recipe", params={"url": "https://example.com/soup"})
+    assert resp.status_code == 200
+    assert mock_parse.call_args.kwargs["enrich"] is False
+    assert 'id="recipe-data"' not in resp.text
+    assert (
+        'data-enrichment-url="/api/recipe/enrichment?'
+        'url=https%3A%2F%2Fexample.com%2Fsoup&amp;scale=1"'
+    ) in resp.text
+    assert 'id="highlight-toggle" hidden' in resp.text
+    assert resp.headers["Cache-Control"] == "no-store"
+    assert "ETag" not in resp.headers
+    assert not _page_cache
+
+
+@patch("app.main.DEFER_ENRICHMENT", True)
+@patch("app.main.parse_recipe", new_callable=AsyncMock)
+def test_recipe_deferred_mode_serves_enriched_recipe_normally(mock_parse, client):
+    mock_parse.return_value = SCALABLE_RECIPE
+    resp = client.get("/recipe", params={"url": "https://example.com/bread"})
+    assert 'id="recipe-data"' in resp.text
+    assert "data-enrichment-url" not in resp.text
+    assert _page_cache
+
+
+@patch("app.main.enriched_recipe", new_callable=AsyncMock)
+def test_recipe_enrichment_api(mock_enriched, client):
+    mock_enriched.return_value = SCALABLE_RECIPE
+    resp = client.get(
+        "/api/recipe/enrichment",
+        params={"url": "https://example.com/bread", "scale": "2"},
+    )
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["scalable"] is True
+    assert data["parsedIngredients"][0]["name"] == "milk"
+    assert data["scaled"]["2"][0]["text"] == "1½ cups milk"
+
+
+@patch("app.main.parse_recipe", new_callable=AsyncMock)
+@patch("app.main.enriched_recipe", new_callable=AsyncMock)
+def test_recipe_enrichment_api_reparses_unknown_url(mock_enriched, mock_parse, client):
+    mock_enriched.return_value = None
+    mock_parse.return_value = UNPARSED_RECIPE
+    resp = client.get(
+        "/api/recipe/enrichment", params={"url": "https://example.com/soup"}
+    )
+    mock_parse.assert_awaited_once()
+    # Parsing ran out of time again, so there's still nothing to send
+    assert resp.status_code == 504
+
+
+@pytest.mark.parametrize("path", ["/recipe", "/api/recipe"])
+def test_recipe_not_cached_when_deadline_skips_ingredient_parsing(path, client):
+    with (
+        patch(
+            "app.parser.pipeline.httpx.AsyncClient",
+            side_effect=origin_client(JSONLD_RECIPE_HTML),
+        ),
+        patch("app.parser.pipeline._ENRICH_SECONDS_PER_INGREDIENT", 3600),
+    ):
+        resp = client.get(path, params={"url": "https://example.com/cookies"})
+    assert resp.status_code == 200
+    assert "1 cup flour" in resp.text
+    assert resp.headers["Cache-Control"] == "no-store"
+    assert "ETag" not in resp.headers
+    assert not _page_cache
+
+
+@pytest.mark.parametrize("scale", ["0", "-1", "100", "nan"])
+def test_recipe_invalid_scale(client, scale):
+    resp = client.get(
+        "/recipe", params={"url": "https://example.com/bread", "scale": scale}
+    )
+    assert resp.status_code == 400
+
+
+@patch("app.main.parse_recipe", new_callable=AsyncMock)
+def test_recipe_api_returns_scaled_json(mock_parse, client):
+    mock_parse.return_value = SCALABLE_RECIPE
+    resp = client.get(
+        "/api/recipe", params={"url": "example.com/bread", "scale": "0.5"}
+    )
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["recipe"]["title"] == "Test Bread"
+    assert data["scale"] == 0.5
+    assert data["scaled_ingredients"][0] == {
+        "text": "⅜ cup milk",
+        "amount_text": "⅜ cup",
+        "rest_text": "milk",
+        "conversion": "¼ cup + 2 tbsp",
+    }
+    assert data["scaled_ingredients"][1] == {"text": "salt"}
+
+
+@patch("app.main.parse_recipe", new_callable=AsyncMock)
+def test_recipe_api_parse_error(mock_parse, client):
+    mock_parse.side_effect = ParseError("parse", "No recipe found on that page.")
+    resp = client.get("/api/recipe", params={"url": "https://example.com/blog"})
+    assert resp.status_code == 422
+    assert resp.json() == {
+        "error_type": "parse",
+        "message": "No recipe found on that page.",
+    }
+
+
+@patch("app.main.parse_recipe", new_callable=AsyncMock)
+def test_recipe_api_deadline_exceeded(mock_parse, client):
+    mock_parse.side_effect = DeadlineExceeded("download")
+    resp = client.get("/api/recipe", params={"url": "https://example.com/slow"})
+    assert resp.status_code == 504
+    assert resp.json()["error_type"] == "timeout"
+
+
+def test_recipe_api_missing_url(client):
+    assert client.get("/api/recipe").status_code == 400
+
+
 # -- Recipe route: parse errors --
 
 
@@ -78,6 +470,108 @@ def test_recipe_empty_url(client):
     assert "Please enter a URL" in resp.text
 
 
+# -- Health checks --
+
+
+def test_healthz(client):
+    resp = client.get("/healthz")
+    assert resp.status_code == 200
+    assert resp.json() == {"status": "ok"}
+
+
+def test_readyz_not_ready_until_warmed_up(client):
+    with patch("app.parser.pipeline._tiers_loaded", False):
+        resp = client.get("/readyz")
+    assert resp.status_code == 503
+    assert resp.json()["status"] == "warming_up"
+
+
+def test_readyz_reports_stats_when_ready(client):
+    with patch("app.parser.pipeline._tiers_loaded", True):
+        resp = client.get("/readyz")
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["status"] == "ready"
+    assert data["in_flight"] == 0
+    assert data["saturation"] == 0
+    assert data["recipe_cache"]["maxsize"] == 128
+    assert data["page_cache"]["size"] == 0
+    assert resp.headers["Cache-Control"] == "no-store"
+
+
+def test_readyz_saturated(client):
+    with (
+        patch("app.parser.pipeline._tiers_loaded", True),
+        patch("app.parser.pipeline._in_flight", 32),
+    ):
+        resp = client.get("/readyz")
+    assert resp.status_code == 503
+    assert resp.json()["status"] == "saturated"
+
+
+# -- Admin: captured profiles --
+
+
+@pytest.fixture()
+def profile_capture():
+    """One captured profile, of a parse that ran some code under cProfile."""
+
+    async def parse():
+        async with profiling.capture("https://example.com/slow"):
+            with profiling.stage("Tier 1 (structured data)"), profiling.profiled():
+                sorted(range(1000), key=str)
+
+    with patch.object(profiling, "PROFILE_SAMPLE_RATE", 1.0):
+        asyncio.run(parse())
+    [capture] = profiling.captures()
+    yield capture
+    profiling._captures.clear()
+
+
+def test_admin_routes_hidden_without_token(client, profile_capture):
+    with patch("app.main.ADMIN_TOKEN", ""):
+        assert client.get("/admin/profiles").status_code == 404
+        resp = client.get(
+            f"/admin/profiles/{profile_capture.id}",
+            headers={"Authorization": "Bearer "},
+        )
+        assert resp.status_code == 404
+
+
+def test_admin_routes_require_token(client, profile_capture):
+    with patch("app.main.ADMIN_TOKEN", "s3cret"):
+        resp = client.get("/admin/profiles", headers={"Authorization": "Bearer nope"})
+        assert resp.status_code == 401
+        assert resp.headers["WWW-Authenticate"] == "Bearer"
+        assert client.get(f"/admin/profiles/{profile_capture.id}").status_code == 401
+
+
+def test_admin_lists_and_downloads_profiles(client, profile_capture):
+    auth = {"Authorization": "Bearer s3cret"}
+    with patch("app.main.ADMIN_TOKEN", "s3cret"):
+        listing = client.get("/admin/profiles", headers=auth)
+        download = client.get(f"/admin/profiles/{profile_capture.id}", headers=auth)
+        text = client.get(
+            f"/admin/profiles/{profile_capture.id}",
+            params={"format": "text"},
+            headers=auth,
+        )
+        missing = client.get("/admin/profiles/nope", headers=auth)
+
+    assert listing.status_code == 200
+    assert listing.headers["Cache-Control"] == "no-store"
+    [entry] = listing.json()["captures"]
+    assert entry["url"] == "https://example.com/slow"
+    assert "Tier 1 (structured data)" in entry["stages"]
+
+    assert download.status_code == 200
+    assert f"{profile_capture.id}.prof" in download.headers["Content-Disposition"]
+    assert marshal.loads(download.content)
+    assert text.headers["Content-Type"].startswith("text/plain")
+    assert "sorted" in text.text
+    assert missing.status_code == 404
+
+
 # -- Security headers --
 
 
@@ -86,3 +580,73 @@ def test_security_headers(client):
     assert resp.headers["X-Content-Type-Options"] == "nosniff"
     assert resp.headers["X-Frame-Options"] == "DENY"
     assert resp.headers["Referrer-Policy"] == "strict-origin-when-cross-origin"
+
+
+def test_security_headers_on_static_and_not_modified(client):
+    resp = client.get("/static/style.css")
+    assert resp.headers["X-Frame-Options"] == "DENY"
+    resp = client.get(
+        "/static/style.css", headers={"If-None-Match": resp.headers["ETag"]}
+    )
+    assert resp.status_code == 304
+    assert resp.headers["X-Frame-Options"] == "DENY"
+
+
+def test_security_headers_streaming_response():
+    """Streamed chunks pass through unbuffered, with headers on the start message."""
+    stream_app = FastAPI()
+
+    @stream_app.get("/stream")
+    async def stream():
+        async def lines():
+            for i in range(3):
+                yield f'{{"line": {i}}}\n'
+
+        return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+    stream_app.add_middleware(SecurityHeadersMiddleware)
+    with TestClient(stream_app).stream("GET", "/stream") as resp:
+        assert resp.headers["X-Content-Type-Options"] == "nosniff"
+        assert list(resp.iter_lines()) == ['{"line": 0}', '{"line": 1}', '{"line": 2}']
+
+
+# -- Admin: reparse the page archive --
+
+
+def test_admin_reparse_refreshes_caches(client, tmp_path):
+    report = ReparseReport(
+        recipes={SAMPLE_RECIPE.source_url: SAMPLE_RECIPE},
+        tiers={SAMPLE_RECIPE.source_url: "Tier 1 (structured data)"},
+        failures={"https://example.com/blog": "No recipe found."},
+        body_hashes={SAMPLE_RECIPE.source_url: "abc"},
+    )
+    auth = {"Authorization": "Bearer s3cret"}
+    _page_cache[_page_key(SAMPLE_RECIPE.source_url)] = "stale"
+    with (
+        patch("app.main.ADMIN_TOKEN", "s3cret"),
+        patch("app.parser.archive.ARCHIVE_DIR", tmp_path),
+        patch("app.parser.reparse.reparse_archive", return_value=report) as run,
+    ):
+        assert client.post("/admin/reparse").status_code == 401
+        resp = client.post("/admin/reparse", headers=auth)
+
+    run.assert_called_once_with(tmp_path)
+    assert resp.json() == {
+        "recipes": 1,
+        "tiers": {"Tier 1 (structured data)": 1},
+        "failures": {"https://example.com/blog": "No recipe found."},
+    }
+    assert _recipe_cache[SAMPLE_RECIPE.source_url] is SAMPLE_RECIPE
+    assert _content_index["html:abc"] is SAMPLE_RECIPE
+    assert not _page_cache
+    _recipe_cache.clear()
+    _content_index.clear()
+
+
+def test_admin_reparse_needs_an_archive(client):
+    with (
+        patch("app.main.ADMIN_TOKEN", "s3cret"),
+        patch("app.parser.archive.ARCHIVE_DIR", None),
+    ):
+        resp = client.post("/admin/reparse", headers={"Authorization": "Bearer s3cret"})
+    assert resp.status_code == 404
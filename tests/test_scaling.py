@@ -0,0 +1,194 @@
+"""Tests for ingredient scaling and unit conversion."""
+
+import pytest
+
+from app.models import ParsedIngredient, Recipe
+from app.scaling import (
+    _scaled_cache,
+    convert,
+    format_fraction,
+    normalize_scale,
+    scale_ingredient,
+    scale_key,
+    scale_recipe,
+)
+
+
+def _ing(raw, amount=None, unit=None, name="flour", **kwargs):
+    return ParsedIngredient(raw=raw, amount=amount, unit=unit, name=name, **kwargs)
+
+
+# -- Fraction formatting --
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        (0, "0"),
+        (2, "2"),
+        (0.5, "½"),
+        (1.5, "1½"),
+        (1 / 3, "⅓"),
+        (2.75, "2¾"),
+        (0.0625, "1/16"),
+        (1.45, "1.45"),
+        (1.2, "1.2"),
+        (2.125, "2⅛"),
+    ],
+)
+def test_format_fraction(value, expected):
+    assert format_fraction(value) == expected
+
+
+# -- Unit conversion --
+
+
+def test_convert_awkward_cup_fraction():
+    assert convert(0.375, "cup") == "¼ cup + 2 tbsp"
+    assert convert(1.125, "cups") == "1 cup + 2 tbsp"
+    assert convert(2.875, "Cups.") == "2 cups + ¾ cup + 2 tbsp"
+
+
+def test_convert_standard_cup_fraction_has_no_tip():
+    assert convert(0.5, "cup") is None
+    assert convert(2, "cups") is None
+
+
+def test_convert_tbsp_to_cups():
+    assert convert(12, "tablespoons") == "¾ cup"
+    assert convert(16, "tbsp") == "1 cup"
+    assert convert(24, "Tbsp") == "1½ cups"
+    assert convert(2, "tbsp") is None
+    assert convert(6, "tbsp") is None
+
+
+def test_convert_tsp_to_tbsp():
+    assert convert(3, "tsp") == "1 tbsp"
+    assert convert(6, "teaspoons") == "2 tbsp"
+    assert convert(4, "tsp") is None
+    assert convert(1.5, "tsp") is None
+
+
+def test_convert_unknown_unit():
+    assert convert(0.375, "g") is None
+    assert convert(0.375, None) is None
+
+
+# -- Ingredient scaling --
+
+
+def test_scale_ingredient_at_1x_keeps_raw_text():
+    ing = _ing("2 cups flour, sifted", 2, "cups", preparation="sifted")
+    assert scale_ingredient(ing, 1).text == "2 cups flour, sifted"
+
+
+def test_scale_ingredient_without_amount_keeps_raw_text():
+    assert scale_ingredient(_ing("salt to taste", name="salt"), 2).text == (
+        "salt to taste"
+    )
+
+
+def test_scale_ingredient_doubles_amount():
+    scaled = scale_ingredient(_ing("1 cup flour", 1, "cup"), 2)
+    assert scaled.text == "2 cups flour"
+    assert scaled.amount_text == "2 cups"
+    assert scaled.rest_text == "flour"
+    assert scaled.conversion is None
+
+
+@pytest.mark.parametrize(
+    "raw, amount, unit, factor, expected",
+    [
+        ("2 cloves garlic", 2, "clove", 2, "4 cloves garlic"),
+        ("1 can garlic", 1, "can", 0.5, "½ can garlic"),
+        ("1 pinch garlic", 1, "pinch", 3, "3 pinches garlic"),
+        ("2 tbsp garlic", 2, "tbsp", 2, "4 tbsp garlic"),
+        ("1 handful garlic", 1, "handful", 2, "2 handful garlic"),
+    ],
+)
+def test_scale_ingredient_pluralizes_unit(raw, amount, unit, factor, expected):
+    scaled = scale_ingredient(_ing(raw, amount, unit, "garlic"), factor)
+    assert scaled.text == expected
+
+
+def test_scale_ingredient_range_and_conversion():
+    scaled = scale_ingredient(
+        _ing("¾-1 cup milk", 0.75, "cup", "milk", amount_max=1), 0.5
+    )
+    assert scaled.amount_text == "⅜-½ cup"
+    assert scaled.conversion == "¼ cup + 2 tbsp"
+
+
+def test_scale_ingredient_keeps_preparation_and_comment():
+    ing = _ing(
+        "1 onion, diced (optional)",
+        1,
+        name="onion",
+        preparation="diced",
+        comment="(optional)",
+    )
+    assert scale_ingredient(ing, 3).text == "3 onion , diced (optional)"
+
+
+# -- Recipe scaling --
+
+
+def _recipe():
+    return Recipe(
+        title="Cookies",
+        source_url="https://example.com/cookies",
+        ingredients=["1 cup flour", "1 egg"],
+        parsed_ingredients=[
+            _ing("1 cup flour", 1, "cup"),
+            _ing("1 egg", 1, name="egg"),
+        ],
+        steps=["Mix."],
+    )
+
+
+def test_scale_recipe():
+    scaled = scale_recipe(_recipe(), 0.5)
+    assert [s.text for s in scaled] == ["½ cup flour", "½ egg"]
+
+
+def test_scale_recipe_without_parsed_ingredients():
+    recipe = Recipe(title="T", source_url="u", ingredients=["x"], steps=["y"])
+    assert scale_recipe(recipe, 2) is None
+
+
+def test_scale_recipe_is_cached_per_recipe_and_factor():
+    recipe = _recipe()
+    assert scale_recipe(recipe, 2) is scale_recipe(recipe, 2)
+    assert scale_recipe(recipe, 2) is not scale_recipe(recipe, 3)
+    assert scale_recipe(_recipe(), 2) is not scale_recipe(recipe, 2)
+
+
+def test_copies_of_a_recipe_share_one_cache_entry():
+    recipe = _recipe()
+    scaled = scale_recipe(recipe, 2)
+    size = len(_scaled_cache)
+    for _ in range(3):
+        assert scale_recipe(recipe.model_copy(), 2) is scaled
+    assert len(_scaled_cache) == size
+    # Re-parsed ingredients replace the entry rather than adding one
+    reparsed = recipe.model_copy(
+        update={"parsed_ingredients": [_ing("2 eggs", 2, name="eggs")]}
+    )
+    assert scale_recipe(reparsed, 2)[0].text == "4 eggs"
+    assert len(_scaled_cache) == size
+
+
+# -- Scale factors --
+
+
+def test_normalize_scale():
+    assert normalize_scale(1.5) == 1.5
+    assert normalize_scale(1 / 3) == 0.333
+    assert normalize_scale(0) is None
+    assert normalize_scale(-1) is None
+    assert normalize_scale(100) is None
+    assert normalize_scale(float("nan")) is None
+
+
+def test_scale_key_matches_button_values():
+    assert [scale_key(f) for f in (0.5, 1.0, 2.0, 3.0)] == ["0.5", "1", "2", "3"]
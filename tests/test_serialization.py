@@ -0,0 +1,117 @@
+"""Tests for the binary Recipe codec."""
+
+import pytest
+
+from app.models import ParsedIngredient, Recipe
+from app.serialization import FORMAT_VERSION, decode_recipe, encode_recipe
+
+
+def _make_recipe(n_ingredients: int = 3, parsed: bool = True) -> Recipe:
+    ingredients = [f"{i + 1} cups flour #{i}" for i in range(n_ingredients)]
+    parsed_ingredients = None
+    if parsed:
+        parsed_ingredients = [
+            ParsedIngredient(
+                raw=raw,
+                amount=float(i + 1),
+                amount_max=float(i + 2) if i % 2 else None,
+                unit="cup",
+                name="flour",
+                preparation="sifted" if i % 3 == 0 else None,
+                comment=None,
+            )
+            for i, raw in enumerate(ingredients)
+        ]
+    return Recipe(
+        title="Crème Brûlée 🍮",
+        source_url="https://example.com/creme-brulee",
+        servings="4",
+        prep_time="15m",
+        cook_time=None,
+        image_url="https://example.com/brulee.jpg",
+        ingredients=ingredients,
+        parsed_ingredients=parsed_ingredients,
+        steps=["Preheat the oven to 325°F.", "Whisk the yolks.", "Bake."],
+    )
+
+
+def test_round_trip():
+    recipe = _make_recipe()
+    assert decode_recipe(encode_recipe(recipe)) == recipe
+
+
+def test_round_trip_uncompressed():
+    recipe = _make_recipe()
+    assert decode_recipe(encode_recipe(recipe, compress=False)) == recipe
+
+
+def test_round_trip_without_parsed_ingredients():
+    recipe = _make_recipe(parsed=False)
+    decoded = decode_recipe(encode_recipe(recipe))
+    assert decoded.parsed_ingredients is None
+    assert decoded == recipe
+
+
+def test_round_trip_empty_parsed_ingredients():
+    recipe = _make_recipe(n_ingredients=0)
+    decoded = decode_recipe(encode_recipe(recipe))
+    assert decoded.parsed_ingredients == []
+    assert decoded.ingredients == []
+
+
+def test_round_trip_empty_strings():
+    recipe = Recipe(
+        title="Blank",
+        source_url="https://example.com",
+        servings="",
+        ingredients=[""],
+        parsed_ingredients=[ParsedIngredient(raw="", name="")],
+        steps=["", "Stir."],
+    )
+    assert decode_recipe(encode_recipe(recipe)) == recipe
+
+
+def test_large_recipe_smaller_than_json():
+    recipe = _make_recipe(n_ingredients=40)
+    encoded = encode_recipe(recipe)
+    assert len(encoded) < len(recipe.model_dump_json()) / 2
+    assert decode_recipe(encoded) == recipe
+
+
+def test_header_carries_version():
+    encoded = encode_recipe(_make_recipe())
+    assert encoded[:4] == b"JSMR"
+    assert encoded[4] == FORMAT_VERSION
+
+
+def test_rejects_unknown_version():
+    encoded = bytearray(encode_recipe(_make_recipe()))
+    encoded[4] = FORMAT_VERSION + 1
+    with pytest.raises(ValueError, match="Unsupported recipe format version"):
+        decode_recipe(bytes(encoded))
+
+
+def test_rejects_garbage():
+    with pytest.raises(ValueError):
+        decode_recipe(b"not a recipe")
+    with pytest.raises(ValueError):
+        decode_recipe(b"")
+
+
+def test_rejects_truncated_payload():
+    encoded = encode_recipe(_make_recipe(), compress=False)
+    with pytest.raises(ValueError, match="Corrupt"):
+        decode_recipe(encoded[:12])
+
+
+def test_decode_does_not_unescape_twice():
+    recipe = Recipe(
+        title="Fish &amp;amp; Chips",
+        source_url="https://example.com",
+        ingredients=["1 &amp;lt; 2 cups"],
+        steps=["Fry."],
+    )
+    assert recipe.title == "Fish &amp; Chips"
+    decoded = decode_recipe(encode_recipe(recipe))
+    assert decoded.title == "Fish &amp; Chips"
+    assert decoded.ingredients == ["1 &lt; 2 cups"]
@@ -0,0 +1,62 @@
+"""Tests for the site-specific extractors."""
+
+import json
+
+from app.parser.pipeline import extract_recipe
+from app.parser.sites import handles
+from app.parser.tiers import SITE_TIER, STRUCTURED_TIER
+
+RECIPE = {
+    "@context": "https://schema.org",
+    "@type": "Recipe",
+    "name": "Weeknight Chili",
+    "recipeIngredient": ["1 lb beef", "1 can beans"],
+    "recipeInstructions": ["Brown the beef.", "Add the beans and simmer."],
+}
+
+
+def _page(*blocks: str) -> str:
+    scripts = "".join(
+        f'<script type="application/ld+json">{block}</script>' for block in blocks
+    )
+    return f"<html><head>{scripts}</head><body><p>Chili.</p></body></html>"
+
+
+ORGANIZATION = json.dumps({"@type": "Organization", "name": "Example"})
+# A trailing comma: strict JSON can't read it
+MALFORMED = '{"@type": "BreadcrumbList", "itemListElement": [],}'
+
+
+def test_handles_known_hosts():
+    assert handles("https://www.allrecipes.com/recipe/1/chili/")
+    assert handles("https://cooking.nytimes.com/recipes/1")
+    assert not handles("https://example.com/chili")
+
+
+def test_site_tier_skips_unreadable_blocks():
+    html = _page(ORGANIZATION, MALFORMED, json.dumps(RECIPE))
+    recipe, tier = extract_recipe(html, "https://www.allrecipes.com/r/1", enrich=False)
+    assert tier == SITE_TIER
+    assert recipe.title == "Weeknight Chili"
+    assert recipe.steps == RECIPE["recipeInstructions"]
+
+
+def test_site_tier_returns_recipes_from_every_block():
+    sauce = {**RECIPE, "name": "Chili Oil", "recipeIngredient": ["1 cup oil"]}
+    html = _page(json.dumps(RECIPE), MALFORMED, json.dumps(sauce), json.dumps(RECIPE))
+    recipe, tier = extract_recipe(html, "https://tasty.co/recipe/chili", enrich=False)
+    assert tier == SITE_TIER
+    assert recipe.page_recipes == ["Weeknight Chili", "Chili Oil"]
+
+
+def test_other_hosts_use_generic_tiers():
+    html = _page(ORGANIZATION, json.dumps(RECIPE))
+    _, tier = extract_recipe(html, "https://example.com/chili", enrich=False)
+    assert tier == STRUCTURED_TIER
+
+
+def test_incomplete_site_recipe_falls_back():
+    html = _page(json.dumps({**RECIPE, "recipeInstructions": []}))
+    recipe, tier = extract_recipe(html, "https://tasty.co/recipe/chili", enrich=False)
+    assert tier == STRUCTURED_TIER
+    assert recipe.ingredients == RECIPE["recipeIngredient"]
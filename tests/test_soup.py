@@ -0,0 +1,45 @@
+"""Tests for sharing parsed BeautifulSoup trees between tiers."""
+
+from bs4 import BeautifulSoup
+
+from app.parser.soup import is_parsed, parse_html, release, share_soup, shared_soup
+
+HTML = "<html><body><p>Hi</p></body></html>"
+
+
+def test_parse_html_reuses_tree_inside_block():
+    with shared_soup():
+        assert parse_html(HTML) is parse_html(HTML)
+        assert parse_html(HTML) is not parse_html("<p>Other</p>")
+
+
+def test_parse_html_parses_afresh_outside_block():
+    with shared_soup():
+        inside = parse_html(HTML)
+    assert parse_html(HTML) is not inside
+    assert parse_html(HTML) is not parse_html(HTML)
+
+
+def test_share_soup_offers_existing_tree():
+    soup = BeautifulSoup(HTML, "html.parser")
+    with shared_soup():
+        share_soup(HTML, soup)
+        assert parse_html(HTML) is soup
+    share_soup(HTML, soup)  # no-op outside a block
+    assert parse_html(HTML) is not soup
+
+
+def test_shared_trees_are_decomposed_on_exit():
+    with shared_soup():
+        soup = parse_html(HTML)
+    assert soup.decomposed
+
+
+def test_release_frees_shared_tree():
+    with shared_soup():
+        soup = parse_html(HTML)
+        release(HTML)
+        assert soup.decomposed
+        assert not is_parsed(HTML)
+        release(HTML)  # nothing left to free
+    release(HTML)  # no-op outside a block
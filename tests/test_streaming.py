@@ -0,0 +1,96 @@
+"""Tests for parsing pages while they download."""
+
+from unittest.mock import patch
+
+import pytest
+
+from app.parser.heuristic import extract_heuristic
+from app.parser.streaming import StreamingScan
+from app.parser.structured import extract_from_html
+from tests.fixtures import (
+    HEURISTIC_FULL_HTML,
+    HEURISTIC_LABEL_IN_P_HTML,
+    JSONLD_GRAPH_HTML,
+    JSONLD_RECIPE_HTML,
+)
+
+URL = "https://example.com/recipe"
+
+MICRODATA_HTML = """
+<html><body>
+<div itemscope itemtype="https://schema.org/Recipe">
+  <span itemprop="name">Microdata Muffins</span>
+  <span itemprop="recipeIngredient">2 cups flour</span>
+  <span itemprop="recipeInstructions">Bake.</span>
+</div>
+</body></html>
+"""
+
+COMMENTED_JSONLD_HTML = """
+<html><head><script type="application/ld+json">
+// added by a plugin
+{"@type": "Recipe", "name": "Commented", "recipeIngredient": ["1 egg"]}
+</script></head><body></body></html>
+"""
+
+
+def _scan(html: str, chunk_size: int = 5) -> tuple[StreamingScan, str]:
+    scan = StreamingScan()
+    body = html.encode()
+    for i in range(0, len(body), chunk_size):
+        scan.feed(body[i : i + chunk_size])
+    return scan, scan.close()
+
+
+@pytest.mark.parametrize("chunk_size", [1, 5, 4096])
+def test_chunks_reassemble_html(chunk_size):
+    html = "<html><body><p>Crème brûlée — ½ cup</p></body></html>"
+    assert _scan(html, chunk_size)[1] == html
+
+
+def test_collects_jsonld_scripts():
+    scan, _ = _scan(JSONLD_RECIPE_HTML + JSONLD_GRAPH_HTML)
+    assert len(scan.jsonld) == 2
+    assert not scan.microdata_recipe
+
+
+@pytest.mark.parametrize("html", [JSONLD_RECIPE_HTML, JSONLD_GRAPH_HTML])
+def test_structured_recipe_matches_extruct(html):
+    scan, html = _scan(html)
+    assert scan.structured_recipe(html, URL) == extract_from_html(html, URL)
+
+
+def test_microdata_recipe_uses_extruct():
+    scan, html = _scan(MICRODATA_HTML)
+    assert scan.microdata_recipe
+    with patch("app.parser.streaming.extract_all_from_html") as mock_extract:
+        scan.structured_recipe(html, URL)
+    mock_extract.assert_called_once_with(html, URL)
+
+
+def test_no_microdata_skips_extruct():
+    scan, html = _scan(HEURISTIC_FULL_HTML)
+    with patch("app.parser.streaming.extract_all_from_html") as mock_extract:
+        assert scan.structured_recipe(html, URL) is None
+    mock_extract.assert_not_called()
+
+
+def test_malformed_jsonld_falls_back_to_extruct():
+    scan, html = _scan(COMMENTED_JSONLD_HTML)
+    recipe = scan.structured_recipe(html, URL)
+    assert recipe is not None
+    assert recipe.title == "Commented"
+
+
+@pytest.mark.parametrize("html", [HEURISTIC_FULL_HTML, HEURISTIC_LABEL_IN_P_HTML])
+def test_heuristic_recipe_matches_non_streaming(html):
+    scan, html = _scan(html)
+    assert scan.heuristic_recipe(URL) == extract_heuristic(html, URL)
+
+
+def test_label_text_ignores_comments():
+    html = "<h2>Ingredients<!-- x --></h2><ul><li>a<!-- y -->b</li></ul>"
+    scan, _ = _scan(html)
+    recipe = scan.heuristic_recipe(URL)
+    assert recipe is not None
+    assert recipe.ingredients == ["ab"]
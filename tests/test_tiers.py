@@ -0,0 +1,173 @@
+"""Tests for the extraction tier registry."""
+
+import threading
+import time
+
+import pytest
+
+from app.models import DeadlineExceeded, Recipe
+from app.parser import tiers
+from app.parser.deadline import Deadline
+from app.parser.pipeline import _extract_recipes, _tier_cost, extract_recipe, stats
+from app.parser.soup import shared_soup
+from app.parser.tiers import HEURISTIC_TIER, SCRAPERS_TIER, Cost, Input, Page
+
+HTML = "<html><body><h1>Plain page</h1><p>Nothing to see.</p></body></html>"
+
+
+@pytest.fixture(autouse=True)
+def _restore_registry(monkeypatch):
+    monkeypatch.setattr(tiers, "_tiers", tiers.registered())
+    monkeypatch.setattr(tiers, "_timings", {})
+    monkeypatch.setattr(tiers, "_functions", {})
+
+
+def fast_tier(page: Page) -> Recipe | None:
+    if "fast.example" not in page.url:
+        return None
+    return Recipe(
+        title="Fast Toast", source_url=page.url, ingredients=["bread"], steps=["Toast."]
+    )
+
+
+def parsing_tier(page: Page) -> Recipe:
+    return Recipe(
+        title=threading.current_thread().name,
+        source_url=page.url,
+        ingredients=["x"],
+        steps=["y"],
+    )
+
+
+def slow_tier(page: Page) -> None:
+    time.sleep(0.5)
+
+
+async def async_tier(page: Page) -> list[Recipe]:
+    return [
+        Recipe(title=f"Async {i}", source_url=page.url, ingredients=["x"], steps=["y"])
+        for i in range(2)
+    ]
+
+
+def test_builtin_tiers_in_order():
+    assert [t.name for t in tiers.registered()] == [
+        tiers.SITE_TIER,
+        tiers.STRUCTURED_TIER,
+        SCRAPERS_TIER,
+        HEURISTIC_TIER,
+    ]
+
+
+def test_registered_tier_runs_before_named_tier():
+    tiers.register(
+        "Fast path",
+        "tests.test_tiers:fast_tier",
+        inputs={Input.HTML},
+        cost=Cost.CHEAP,
+        before=tiers.STRUCTURED_TIER,
+    )
+    recipe, tier = extract_recipe(HTML, "https://fast.example/toast", enrich=False)
+    assert (recipe.title, tier) == ("Fast Toast", "Fast path")
+    assert stats()["tiers"]["Fast path"]["hits"] == 1
+
+
+def test_async_tier_is_awaited():
+    tiers.register(
+        "Async",
+        "tests.test_tiers:async_tier",
+        inputs=set(),
+        cost=Cost.CHEAP,
+        is_async=True,
+    )
+    recipe, tier = extract_recipe(HTML, "https://e.com", enrich=False)
+    assert tier == "Async"
+    assert recipe.page_recipes == ["Async 0", "Async 1"]
+    # The built-in tiers ran first and found nothing
+    heuristic = stats()["tiers"][HEURISTIC_TIER]
+    assert (heuristic["runs"], heuristic["hits"]) == (1, 0)
+
+
+def test_is_async_must_match_function():
+    tier = tiers.register(
+        "Wrong", "tests.test_tiers:async_tier", inputs=set(), cost=Cost.CHEAP
+    )
+    with pytest.raises(TypeError):
+        tiers.resolve(tier)
+
+
+def test_duplicate_name_rejected():
+    with pytest.raises(ValueError):
+        tiers.register(
+            HEURISTIC_TIER, "tests.test_tiers:fast_tier", inputs=set(), cost=Cost.CHEAP
+        )
+
+
+def test_unknown_before_rejected():
+    with pytest.raises(ValueError, match="No tier named 'Tier 9'"):
+        tiers.register(
+            "Fast path",
+            "tests.test_tiers:fast_tier",
+            inputs=set(),
+            cost=Cost.CHEAP,
+            before="Tier 9",
+        )
+    assert "Fast path" not in [t.name for t in tiers.registered()]
+
+
+def test_tree_reading_tier_is_free_once_page_is_parsed(monkeypatch):
+    monkeypatch.setattr("app.parser.pipeline._SOUP_BYTES_PER_SECOND", 1)
+    [site, structured, scrapers, heuristic] = tiers.registered()
+    page = Page(HTML, "https://e.com")
+    with shared_soup():
+        assert _tier_cost(site, page) == 0
+        assert _tier_cost(structured, page) == 0
+        assert _tier_cost(heuristic, page) == len(HTML)
+        assert page.tree is not None
+        assert _tier_cost(heuristic, page) == 0
+        # recipe-scrapers builds its own tree
+        assert _tier_cost(scrapers, page) == len(HTML)
+
+
+def test_deadline_skips_only_unaffordable_tiers(monkeypatch):
+    monkeypatch.setattr("app.parser.pipeline._SOUP_BYTES_PER_SECOND", 1)
+    tiers.register(
+        "Fast path", "tests.test_tiers:fast_tier", inputs={Input.HTML}, cost=Cost.CHEAP
+    )
+    _, tier = extract_recipe(
+        HTML, "https://fast.example/toast", deadline=Deadline(60), enrich=False
+    )
+    assert tier == "Fast path"
+    assert SCRAPERS_TIER not in stats()["tiers"]
+
+
+def test_page_parsing_sync_tier_runs_off_the_calling_thread():
+    tiers.register(
+        "Parsing", "tests.test_tiers:parsing_tier", inputs=set(), cost=Cost.PARSES_PAGE
+    )
+    recipe, tier = extract_recipe(HTML, "https://e.com", enrich=False)
+    assert tier == "Parsing"
+    assert recipe.title != threading.current_thread().name
+
+
+@pytest.mark.anyio
+async def test_deadline_stops_a_running_sync_tier():
+    tiers.register(
+        "Slow",
+        "tests.test_tiers:slow_tier",
+        inputs=set(),
+        cost=Cost.PARSES_PAGE,
+        before=tiers.SITE_TIER,
+    )
+    start = time.perf_counter()
+    with pytest.raises(DeadlineExceeded) as exc_info:
+        await _extract_recipes(Page(HTML, "https://e.com"), Deadline(0.1))
+    assert exc_info.value.stage == "Slow"
+    assert time.perf_counter() - start < 0.4
+
+
+def test_only_jsonld_tiers_share_results_by_jsonld():
+    assert [t.name for t in tiers.registered() if t.jsonld_only] == [
+        tiers.SITE_TIER,
+        tiers.STRUCTURED_TIER,
+    ]
@@ -0,0 +1,57 @@
+"""Tests for the canonical unit table."""
+
+import pytest
+
+from app import units
+
+
+@pytest.mark.parametrize(
+    "spelling, name",
+    [
+        ("cups", "cup"),
+        ("Tbsps", "tbsp"),
+        ("tablespoon", "tbsp"),
+        ("TEASPOONS", "tsp"),
+        ("fluid_ounce", "fl oz"),
+        ("lbs.", "lb"),
+        ("grams", "g"),
+        ("millilitres", "ml"),
+        ("pinches", "pinch"),
+        ("leaves", "leaf"),
+    ],
+)
+def test_lookup_aliases(spelling, name):
+    assert units.lookup(spelling).name == name
+
+
+def test_lookup_unknown():
+    assert units.lookup("handful") is None
+    assert units.lookup("") is None
+    assert units.lookup(None) is None
+
+
+def test_dimension_and_base():
+    assert units.CUP.dimension is units.Dimension.VOLUME
+    assert units.lookup("kg").dimension is units.Dimension.MASS
+    assert units.lookup("kg").metric
+    assert round(units.CUP.base / units.TBSP.base) == 16
+    assert round(units.lookup("lb").base / units.lookup("oz").base) == 16
+
+
+def test_normalize_shares_one_string_per_unit():
+    # Sliced at runtime, so not the same objects as the table's strings
+    cups, other, again = "cups!"[:-1], "handful!"[:-1], "handful?"[:-1]
+    assert cups is not units.CUP.name
+    assert units.normalize(cups) is units.CUP.name
+    assert other is not again
+    assert units.normalize(other) is units.normalize(again)
+
+
+def test_spell_pluralizes_words_not_abbreviations():
+    assert units.spell("clove", 4) == "cloves"
+    assert units.spell("leaf", 2) == "leaves"
+    assert units.spell("cup", 1) == "cup"
+    assert units.spell("cup", 1.5) == "cups"
+    assert units.spell("fl oz", 2) == "fl oz"
+    assert units.spell("g", 200) == "g"
+    assert units.spell("handful", 2) == "handful"
@@ -1,5 +1,7 @@
 """Tests for URL validation and SSRF protection."""
 
+from unittest.mock import patch
+
 import pytest
 
 from app.models import ParseError
@@ -78,3 +80,13 @@ def test_accepts_http():
 
 def test_accepts_https():
     validate_url("https://www.allrecipes.com/recipe/12345")
+
+
+# -- Private hosts allowed for load testing --
+
+
+def test_accepts_allowed_private_host():
+    with patch("app.parser.pipeline.ALLOWED_PRIVATE_HOSTS", {"localhost"}):
+        validate_url("http://localhost:8001/page/jsonld")
+        with pytest.raises(ParseError, match="private or internal"):
+            validate_url("http://127.0.0.1:8001/page/jsonld")